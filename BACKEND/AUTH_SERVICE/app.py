@@ -1,23 +1,42 @@
+import time
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import (
     JWTManager, create_access_token,
-    jwt_required, get_jwt_identity
+    jwt_required, get_jwt, get_jwt_identity
 )
 
 import dao_client
+from common.circuit_breaker import register_upstream_error_handlers
+from common.compression import init_compression
+from common.health import register_dao_health
+from common.tracing import init_tracing
+from common import revocation
+from common.rate_limit import AdmissionControl, forwarded_for
 from config import Config
 from dao_client import (
     verify_credentials, register_client, reset_password,
     change_password, update_profile, deactivate_account,
-    delete_account, get_client_by_id
+    delete_account, get_client_by_id, get_clients_batch, revoke_token,
+    get_suppression
 )
 
 # --- INIT APP ---
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Request-ID", "Server-Timing"])
 app.config.from_object(Config)
 jwt = JWTManager(app)
+# DAO indisponible : 503 immédiat avec Retry-After (au lieu de bloquer le worker)
+register_upstream_error_handlers(app)
+# Corps JSON compressés (gzip/brotli) au-delà de COMPRESSION_MIN_SIZE
+init_compression(app)
+# X-Request-ID et Server-Timing (JWT, appels au DAO et étapes du DAO, sérialisation)
+init_tracing(app, "auth", jwt=jwt)
+# Jetons révoqués (comptes désactivés/supprimés, déconnexions) vérifiés en mémoire
+revocation.init_revocation(app, jwt, dao_client.dao)
+# Connexions et inscriptions en excès refusées (429) avant l'appel au DAO et le hachage bcrypt
+admission = AdmissionControl.from_config(Config)
 
 @app.route('/auth/me', methods=['GET'])
 @jwt_required()
@@ -27,7 +46,19 @@ def get_client_info():
     return jsonify(response.json()), response.status_code
 
 
+@app.route('/auth/clients/batch/get', methods=['POST'])
+@jwt_required()
+def get_clients_info_batch():
+    # Profils de plusieurs clients en un seul appel au DAO : réservé aux administrateurs
+    if get_jwt().get("role") != "admin":
+        return jsonify({"error": "Accès réservé aux administrateurs"}), 403
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    response = get_clients_batch(ids)
+    return jsonify(response.json()), response.status_code
+
+
 @app.route('/auth/login', methods=['POST'])
+@admission.limit("login")
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -36,7 +67,7 @@ def login():
     if not email or not mot_de_passe:
         return jsonify({"error": "Champs manquants"}), 400
 
-    result = verify_credentials(email, mot_de_passe)
+    result = verify_credentials(email, mot_de_passe, headers=forwarded_for(Config.RATE_LIMIT_TRUSTED_PROXIES))
 
     if result.status_code != 200:
         return jsonify(result.json()), result.status_code
@@ -50,9 +81,23 @@ def login():
 
     return jsonify({"access_token": access_token}), 200
 
+# --- LOGOUT ---
+
+@app.route('/auth/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    # Révoque le jeton courant : refusé ici tout de suite, par les autres gateways après leur synchronisation
+    claims = get_jwt()
+    response = revoke_token(claims["jti"], claims["exp"])
+    if response.status_code != 201:
+        return jsonify(response.json()), response.status_code
+    revocation.revocations.revoke_token(claims["jti"], claims["exp"])
+    return jsonify({"message": "Déconnexion réussie"}), 200
+
 # --- REGISTER ---
 
 @app.route('/auth/register', methods=['POST'])
+@admission.limit("register")
 def register():
     data = request.get_json()
     email = data.get("email")
@@ -63,7 +108,9 @@ def register():
     if not all([email, mot_de_passe, nom, prenom]):
         return jsonify({"error": "Champs requis manquants"}), 400
 
-    result = dao_client.register_client(email, mot_de_passe, nom, prenom)
+    result = dao_client.register_client(
+        email, mot_de_passe, nom, prenom, headers=forwarded_for(Config.RATE_LIMIT_TRUSTED_PROXIES)
+    )
     return jsonify(result.json()), result.status_code
 
 
@@ -105,6 +152,9 @@ def update_profile_route():
 def deactivate_account_route():
     client_id = get_jwt_identity()
     response = deactivate_account(client_id)
+    if response.status_code == 200:
+        # Jetons du client refusés tout de suite dans ce processus (le DAO publie la révocation aux autres)
+        revocation.revocations.revoke_client(client_id, time.time() + Config.JWT_ACCESS_TOKEN_EXPIRES.total_seconds())
     return jsonify(response.json()), response.status_code
 
 
@@ -113,9 +163,27 @@ def deactivate_account_route():
 def delete_account_route():
     client_id = get_jwt_identity()
     response = delete_account(client_id)
+    # 202 : compte marqué supprimé, données supprimées en arrière-plan par le DAO
+    if response.status_code == 202:
+        # Jetons du client refusés tout de suite dans ce processus (le DAO publie la révocation aux autres)
+        revocation.revocations.revoke_client(client_id, time.time() + Config.JWT_ACCESS_TOKEN_EXPIRES.total_seconds())
     return jsonify(response.json()), response.status_code
 
 
+@app.route('/auth/suppressions/<suppression_id>', methods=['GET'])
+@jwt_required()
+def get_suppression_route(suppression_id):
+    # Progression d'une suppression de compte : réservé aux administrateurs (les jetons du client sont révoqués)
+    if get_jwt().get("role") != "admin":
+        return jsonify({"error": "Accès réservé aux administrateurs"}), 403
+    response = get_suppression(suppression_id)
+    return jsonify(response.json()), response.status_code
+
+
+# État des appels vers DAO_SERVICE (voir common/health.py), avec les refus des limiteurs
+register_dao_health(app, dao_client.dao, "auth", extra={"admission": admission.stats})
+
+
 # --- RUN ---
 if __name__ == "__main__":
     app.run(debug=True, port=Config.AUTH_SERVICE_PORT)
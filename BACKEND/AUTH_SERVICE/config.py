@@ -1,12 +1,30 @@
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import timedelta
 
 load_dotenv()
 
-class Config:
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.settings import GatewayConfig
+
+class Config(GatewayConfig):
+    # Accès à DAO_SERVICE, disjoncteur, compression, traçage, révocations : voir common/settings.py
     DAO_URL=os.getenv('DAO_URL')
     JWT_SECRET_KEY=os.getenv('JWT_SECRET_KEY')
     JWT_ALGORITHM=os.getenv('JWT_ALGORITHM')
     JWT_ACCESS_TOKEN_EXPIRES=timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES',86400)))
     AUTH_SERVICE_PORT=os.getenv('AUTH_SERVICE_PORT')
+
+    # Contrôle d'admission de /auth/login et /auth/register (voir common/rate_limit.py)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", 20))
+    RATE_LIMIT_IP_PER_MIN = float(os.getenv("RATE_LIMIT_IP_PER_MIN", 30))
+    RATE_LIMIT_EMAIL_BURST = int(os.getenv("RATE_LIMIT_EMAIL_BURST", 5))
+    RATE_LIMIT_EMAIL_PER_MIN = float(os.getenv("RATE_LIMIT_EMAIL_PER_MIN", 5))
+    RATE_LIMIT_IP_WINDOW_MAX = int(os.getenv("RATE_LIMIT_IP_WINDOW_MAX", 300))  # demandes par adresse...
+    RATE_LIMIT_IP_WINDOW_S = float(os.getenv("RATE_LIMIT_IP_WINDOW_S", 3600))   # ...sur cette fenêtre glissante
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))  # clés suivies par limiteur (LRU)
+    # Mandataires de confiance devant AUTH_SERVICE (0 : adresse de la connexion TCP)
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", 0))
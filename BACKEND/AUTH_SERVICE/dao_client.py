@@ -1,39 +1,60 @@
-import requests
+# config ajoute le dossier BACKEND (paquet common partagé par les services) à sys.path
 from config import Config
+from common.http_client import create_dao_client
 
-DAO_URL = Config.DAO_URL
+# Session keep-alive, délais et nouvelles tentatives : voir common/http_client.py
+# (DAO_MODE=embedded : DAO_SERVICE appelé dans le processus, voir common/embedded.py)
+dao = create_dao_client(Config)
 
 
 def get_client_by_id(client_id):
-    return requests.get(f"{DAO_URL}/auth/client/{client_id}")
+    return dao.get(f"/auth/client/{client_id}")
 
 
-def verify_credentials(email, mot_de_passe):
-    return requests.post(
-        f"{DAO_URL}/auth/login",
-        json={'email': email, 'mot_de_passe': mot_de_passe}
+def get_clients_batch(ids):
+    # Lecture groupée des profils : une seule requête côté DAO (id = ANY(...))
+    return dao.post("/auth/client/batch/get", json={"ids": ids})
+
+
+def get_suppression(suppression_id):
+    # Progression d'une suppression de compte exécutée en arrière-plan par le DAO
+    return dao.get(f"/auth/suppression/{suppression_id}")
+
+
+def revoke_token(jti, exp):
+    # Publie la révocation d'un jeton (déconnexion) aux autres gateways
+    return dao.post("/auth/revoke-token", json={"jti": jti, "exp": exp})
+
+
+def verify_credentials(email, mot_de_passe, headers=None):
+    # headers : X-Forwarded-For, pour que le DAO limite les tentatives par adresse du client
+    return dao.post(
+        "/auth/login",
+        json={'email': email, 'mot_de_passe': mot_de_passe},
+        headers=headers
     )
 
-def register_client(email, mot_de_passe, nom, prenom):
-    return requests.post(
-        f"{DAO_URL}/auth/register",
+def register_client(email, mot_de_passe, nom, prenom, headers=None):
+    return dao.post(
+        "/auth/register",
         json={
             'email': email,
             'mot_de_passe': mot_de_passe,
             'nom': nom,
             'prenom': prenom
-        }
+        },
+        headers=headers
     )
 
 def reset_password(email, new_password):
-    return requests.post(
-        f"{DAO_URL}/auth/reset-password",
+    return dao.post(
+        "/auth/reset-password",
         json={'email': email, 'new_password': new_password}
     )
 
 def change_password(client_id, current_password, new_password):
-    return requests.patch(
-        f"{DAO_URL}/auth/change-password",
+    return dao.patch(
+        "/auth/change-password",
         json={
             'id': client_id,
             'current_password': current_password,
@@ -42,8 +63,8 @@ def change_password(client_id, current_password, new_password):
     )
 
 def update_profile(client_id, nom=None, prenom=None, email=None):
-    return requests.patch(
-        f"{DAO_URL}/auth/update-profile",
+    return dao.patch(
+        "/auth/update-profile",
         json={
             'id': client_id,
             'nom': nom,
@@ -53,13 +74,13 @@ def update_profile(client_id, nom=None, prenom=None, email=None):
     )
 
 def deactivate_account(client_id):
-    return requests.post(
-        f"{DAO_URL}/auth/deactivate",
+    return dao.post(
+        "/auth/deactivate",
         json={'id': client_id}
     )
 
 def delete_account(client_id):
-    return requests.delete(
-        f"{DAO_URL}/auth/delete-account",
+    return dao.delete(
+        "/auth/delete-account",
         json={'id': client_id}
     )
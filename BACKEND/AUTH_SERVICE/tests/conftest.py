@@ -33,8 +33,8 @@ def token():
 @pytest.fixture
 def mock_requests(monkeypatch):
     """
-    Intercepte tous les appels requests.get/post/patch/delete effectués
-    par dao_client afin d'éviter tout accès réseau.
+    Intercepte tous les appels effectués par dao_client (requests.Session,
+    voir common/http_client.py) afin d'éviter tout accès réseau.
 
     Utilisation dans un test :
         def test_xxx(mock_requests):
@@ -45,9 +45,8 @@ def mock_requests(monkeypatch):
         fake_resp.status_code = status_code
         fake_resp.json.return_value = json_data or {}
 
-        # remplace chaque méthode HTTP de requests par un lambda
-        for method in ("get", "post", "patch", "delete"):
-            monkeypatch.setattr(f"requests.{method}", lambda *a, **kw: fake_resp)
+        # toutes les méthodes HTTP passent par Session.request
+        monkeypatch.setattr("requests.Session.request", lambda *a, **kw: fake_resp)
 
         return fake_resp
 
@@ -13,7 +13,7 @@ def test_verify_credentials_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "login ok"}
 
-    monkeypatch.setattr("requests.post", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = verify_credentials("user@test.com", "1234")
 
     assert resp.status_code == 200
@@ -27,7 +27,7 @@ def test_register_client_duplicate(monkeypatch):
         status_code = 400
         def json(self): return {"error": "duplicate"}
 
-    monkeypatch.setattr("requests.post", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = register_client("dup@test.com", "1234", "Dup", "User")
 
     assert resp.status_code == 400
@@ -41,7 +41,7 @@ def test_reset_password_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "reset ok"}
 
-    monkeypatch.setattr("requests.post", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = reset_password("user@test.com", "newpass123")
 
     assert resp.status_code == 200
@@ -55,7 +55,7 @@ def test_change_password_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "changed"}
 
-    monkeypatch.setattr("requests.patch", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = change_password("12345", "oldpass", "newpass")
 
     assert resp.status_code == 200
@@ -69,7 +69,7 @@ def test_update_profile_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "updated"}
 
-    monkeypatch.setattr("requests.patch", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = update_profile("12345", nom="New", prenom="Name", email="new@test.com")
 
     assert resp.status_code == 200
@@ -83,7 +83,7 @@ def test_deactivate_account_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "deactivated"}
 
-    monkeypatch.setattr("requests.post", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = deactivate_account("12345")
 
     assert resp.status_code == 200
@@ -97,7 +97,7 @@ def test_delete_account_success(monkeypatch):
         status_code = 200
         def json(self): return {"message": "deleted"}
 
-    monkeypatch.setattr("requests.delete", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = delete_account("12345")
 
     assert resp.status_code == 200
@@ -111,7 +111,7 @@ def test_get_client_by_id_success(monkeypatch):
         status_code = 200
         def json(self): return {"email": "test@abc.com"}
 
-    monkeypatch.setattr("requests.get", lambda *a, **k: FakeResp())
+    monkeypatch.setattr("requests.Session.request", lambda *a, **k: FakeResp())
     resp = get_client_by_id("12345")
 
     assert resp.status_code == 200
@@ -0,0 +1,127 @@
+# account_deletion.py
+"""
+Suppression des comptes en arrière-plan.
+
+AuthDAO.delete_account marque le client supprimé (invisible, jetons révoqués)
+et crée une suppression en attente dans la même transaction ; la route répond
+202 aussitôt. Un thread du DAO supprime ensuite les lignes dépendantes par lots
+de ACCOUNT_DELETE_CHUNK_SIZE (DELETE ensemblistes, dans l'ordre des clés
+étrangères, voir dao/suppression_dao.py), avec une courte pause entre deux
+lots pour laisser passer le trafic : ni transaction longue, ni worker HTTP
+occupé, ni lignes chargées en mémoire par l'ORM.
+
+Chaque suppression est réservée par un seul processus (SuppressionDAO.reserver,
+FOR UPDATE SKIP LOCKED) : plusieurs workers du DAO peuvent tourner sans
+exécuter deux fois la même. Une suppression dont la progression est restée
+figée plus de ACCOUNT_DELETE_LEASE_S secondes (processus arrêté) est reprise,
+au démarrage ou toutes les ACCOUNT_DELETE_POLL_S secondes, à partir de sa
+dernière étape. Une suppression en échec est relancée depuis la première étape
+ACCOUNT_DELETE_RETRY_S secondes plus tard.
+
+Les écritures du DAO refusent un client marqué supprimé (voir
+verrouiller_client_actif). Si une ligne a tout de même été créée après le
+passage de son étape, la suppression du client échoue sur la clé étrangère :
+les étapes sont alors reprises une fois depuis le début.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from config import Config
+from database import db
+from dao.suppression_dao import ETAPES, TERMINEE, SuppressionDAO
+
+logger = logging.getLogger(__name__)
+
+
+class AccountDeletionWorker:
+    """Thread dédié qui réserve et exécute les suppressions une à une."""
+
+    def __init__(self, chunk_size, pause, lease, poll, retry):
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.lease = lease
+        self.poll = poll
+        self.retry = retry
+        self.app = None
+        self._wake = threading.Event()
+        self._thread = None
+        self.en_cours = None
+        self.terminees = 0
+        self.echecs = 0
+
+    def init_app(self, app):
+        # Démarre le thread ; il reprend d'abord les suppressions en attente ou abandonnées
+        self.app = app
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="account-deletion", daemon=True)
+        self._thread.start()
+
+    def submit(self, suppression_id):
+        # Réveille le thread ; la suppression (déjà enregistrée en attente) est réservée par le premier
+        # processus libre. Sans init_app (scripts, tests), elle attend le prochain worker démarré
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    suppression_id = SuppressionDAO.reserver(self.lease, self.retry)
+                    while suppression_id is not None:
+                        self.run(suppression_id)
+                        suppression_id = SuppressionDAO.reserver(self.lease, self.retry)
+            except Exception:
+                logger.warning("Réservation des suppressions de compte impossible", exc_info=True)
+            self._wake.wait(self.poll)
+            self._wake.clear()
+
+    def run(self, suppression_id):
+        # Exécute (ou reprend) une suppression réservée jusqu'à son terme ; l'échec est enregistré sur la suppression
+        suppression = SuppressionDAO.get(suppression_id)
+        if suppression is None or suppression.statut == TERMINEE:
+            return
+        self.en_cours = suppression_id
+        noms = [nom for nom, _ in ETAPES]
+        debut = noms.index(suppression.etape) if suppression.etape in noms else 0
+        try:
+            try:
+                self._etapes(suppression, noms[debut:])
+            except IntegrityError:
+                # Ligne créée après le passage de son étape (écriture commencée avant la marque) : reprise complète
+                db.session.rollback()
+                logger.warning("Suppression de compte %s : lignes dépendantes restantes, reprise des étapes",
+                               suppression_id)
+                self._etapes(suppression, noms)
+            SuppressionDAO.finish(suppression)
+            self.terminees += 1
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Suppression de compte %s interrompue", suppression_id)
+            SuppressionDAO.finish(suppression, erreur=str(e)[:500])
+            self.echecs += 1
+        finally:
+            self.en_cours = None
+
+    def _etapes(self, suppression, noms):
+        for etape in noms:
+            while SuppressionDAO.delete_chunk(suppression, etape, self.chunk_size) >= self.chunk_size:
+                time.sleep(self.pause)
+
+    def stats(self):
+        return {
+            "en_cours": str(self.en_cours) if self.en_cours else None,
+            "terminees": self.terminees,
+            "echecs": self.echecs,
+            "taille_lot": self.chunk_size,
+            "bail_s": self.lease,
+            "relance_s": self.retry,
+        }
+
+
+account_deletions = AccountDeletionWorker(
+    Config.ACCOUNT_DELETE_CHUNK_SIZE, Config.ACCOUNT_DELETE_PAUSE_S,
+    Config.ACCOUNT_DELETE_LEASE_S, Config.ACCOUNT_DELETE_POLL_S, Config.ACCOUNT_DELETE_RETRY_S,
+)
@@ -1,5 +1,11 @@
+import os
+import sys
+
 from flask import jsonify
 
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import Config
 from database import init_app, db
 from models.tache import Tache
@@ -9,6 +15,13 @@ from routes.auth_routes import auth_bp
 from routes.seance_routes import seance_bp
 from routes.tache_route import tache_bp
 from routes.statistique_routes import statistique_bp
+from routes.health_routes import health_bp
+from pool import warm_up
+from last_login import last_logins
+from account_deletion import account_deletions
+from common.compression import init_compression
+from common.wire import init_wire
+from common.tracing import init_tracing
 
 app = init_app()
 
@@ -17,6 +30,31 @@ app.register_blueprint(auth_bp, url_prefix='/auth')
 app.register_blueprint(seance_bp, url_prefix='/seance')
 app.register_blueprint(tache_bp, url_prefix='/tache')
 app.register_blueprint(statistique_bp)
+app.register_blueprint(health_bp, url_prefix='/health')
+
+# Réponses et corps de requête en MessagePack pour les dao_client qui le demandent
+init_wire(app)
+
+# Listes et statistiques compressées (gzip/brotli) au-delà de COMPRESSION_MIN_SIZE, streaming compris
+init_compression(app)
+
+# X-Request-ID du gateway repris ; Server-Timing : requêtes SQL, attente du pool, sérialisation
+init_tracing(app, "dao")
+
+# Dernières connexions écrites par lots en arrière-plan, et à l'arrêt du processus
+last_logins.init_app(app)
+
+# Suppressions de compte réservées et exécutées par lots en arrière-plan (abandonnées : reprises)
+account_deletions.init_app(app)
+
+# Préchauffage optionnel : les premières requêtes après un déploiement ne paient pas la connexion
+if Config.DB_POOL_WARMUP:
+    with app.app_context():
+        try:
+            ouvertes = warm_up(db.engine, min(Config.DB_POOL_WARMUP, Config.DB_POOL_SIZE))
+            print(f"Pool préchauffé : {ouvertes} connexion(s)", flush=True)
+        except Exception as e:
+            print(f"Préchauffage du pool impossible : {e}", flush=True)
 
 @app.route("/ping")
 def ping():
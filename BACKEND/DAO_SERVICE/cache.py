@@ -0,0 +1,131 @@
+# cache.py
+"""
+Cache mémoire borné (LRU) avec expiration (TTL), utilisé pour les profils clients.
+
+Le cache est propre à chaque processus : les écritures du DAO l'invalident
+explicitement, le TTL borne la durée pendant laquelle un autre processus
+peut encore servir une valeur périmée.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from config import Config
+
+
+class TTLCache:
+    """Dictionnaire LRU thread-safe dont les entrées expirent après ttl secondes."""
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # clé -> (expiration, valeur)
+        self._generation = 0         # incrémentée à chaque invalidation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, generation=None):
+        # generation : valeur lue avant le chargement ; si une invalidation a eu lieu depuis, on n'écrit pas
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        # Lecture à travers le cache ; les résultats None (introuvable) ne sont pas mis en cache
+        if not self.enabled:
+            return loader()
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            generation = self._generation
+        value = loader()
+        if value is not None:
+            self.put(key, value, generation)
+        return value
+
+    def get_many_or_load(self, keys, loader):
+        # Lecture groupée : les clés absentes du cache sont chargées en un seul appel loader(clés) -> {clé: valeur}
+        if not self.enabled:
+            return loader(list(keys))
+        trouves, manquantes = {}, []
+        for key in keys:
+            value = self.get(key)
+            if value is None:
+                manquantes.append(key)
+            else:
+                trouves[key] = value
+        if manquantes:
+            with self._lock:
+                generation = self._generation
+            charges = loader(manquantes)
+            for key, value in charges.items():
+                if value is not None:
+                    self.put(key, value, generation)
+            trouves.update(charges)
+        return trouves
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            lectures = self.hits + self.misses
+            return {
+                "active": self.enabled,
+                "taille": len(self._data),
+                "taille_max": self.maxsize,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taux_hit": round(self.hits / lectures, 3) if lectures else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def client_key(client_id):
+    # Clé normalisée d'un client : un même UUID peut arriver en majuscules, sans tirets, etc.
+    try:
+        return str(uuid.UUID(str(client_id)))
+    except ValueError:
+        return str(client_id)
+
+
+profile_cache = TTLCache(Config.PROFILE_CACHE_SIZE, Config.PROFILE_CACHE_TTL)
@@ -1,15 +1,80 @@
 import os
+import sys
 import dotenv
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class Config:
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.settings import CompressionConfig, TracingConfig
+
+class Config(CompressionConfig, TracingConfig):
+    # Compression et traçage : voir common/settings.py
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Pool de connexions (voir pool.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))  # 0 = pas de limite
+    DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", 0))  # connexions ouvertes au démarrage
     ENV = os.getenv("FLASK_ENV", "production")
 
     FLASK_PORT = int(os.getenv("FLASK_PORT", 5001))
     FLASK_DEBUG = os.getenv("FLASK_DEBUG", "false").lower() == "true"
     FLASK_USE_RELOADER = os.getenv("FLASK_USE_RELOADER", "false").lower() == "true"
 
+    # Pagination par curseur des listes (tâches, séances)
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+    # Listes complètes envoyées en streaming (voir streaming.py)
+    STREAM_LIST_RESPONSES = os.getenv("STREAM_LIST_RESPONSES", "true").lower() == "true"
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 500))
+
+    # Nombre maximal d'éléments acceptés par les routes de traitement par lot
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 1000))
+
+    # Cache des profils clients (voir cache.py) ; 0 désactive le cache
+    PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 1024))
+    PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", 60))
+
+    # Hachage bcrypt des mots de passe dans un pool dédié (voir hashing.py)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+    BCRYPT_QUEUE_MAX = int(os.getenv("BCRYPT_QUEUE_MAX", 64))  # hachages en attente au-delà des workers
+
+    # Révocation des JWT publiée aux gateways (voir dao/revocation_dao.py)
+    JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES", 86400))  # durée de vie des jetons d'AUTH_SERVICE
+    REVOCATION_DELTA_MAX = int(os.getenv("REVOCATION_DELTA_MAX", 5000))  # entrées par réponse de synchronisation
+
+    # Dernière connexion des clients écrite par lots (voir last_login.py) ; 0 désactive l'écriture
+    LAST_LOGIN_FLUSH_S = float(os.getenv("LAST_LOGIN_FLUSH_S", 5))
+    LAST_LOGIN_FLUSH_SIZE = int(os.getenv("LAST_LOGIN_FLUSH_SIZE", 500))  # clients en attente déclenchant l'écriture
+
+    # Contrôle d'admission de /auth/login et /auth/register (voir common/rate_limit.py)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", 20))
+    RATE_LIMIT_IP_PER_MIN = float(os.getenv("RATE_LIMIT_IP_PER_MIN", 30))
+    RATE_LIMIT_EMAIL_BURST = int(os.getenv("RATE_LIMIT_EMAIL_BURST", 5))
+    RATE_LIMIT_EMAIL_PER_MIN = float(os.getenv("RATE_LIMIT_EMAIL_PER_MIN", 5))
+    RATE_LIMIT_IP_WINDOW_MAX = int(os.getenv("RATE_LIMIT_IP_WINDOW_MAX", 300))  # demandes par adresse...
+    RATE_LIMIT_IP_WINDOW_S = float(os.getenv("RATE_LIMIT_IP_WINDOW_S", 3600))   # ...sur cette fenêtre glissante
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))  # clés suivies par limiteur (LRU)
+    # AUTH_SERVICE transmet l'adresse du client dans X-Forwarded-For
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", 1))
+
+    # Suppression des comptes en arrière-plan (voir account_deletion.py)
+    ACCOUNT_DELETE_CHUNK_SIZE = int(os.getenv("ACCOUNT_DELETE_CHUNK_SIZE", 1000))  # lignes par transaction
+    ACCOUNT_DELETE_PAUSE_S = float(os.getenv("ACCOUNT_DELETE_PAUSE_S", 0.05))  # pause entre deux lots
+    # Suppression en cours sans progression depuis ce délai : processus arrêté, reprise par un autre
+    ACCOUNT_DELETE_LEASE_S = float(os.getenv("ACCOUNT_DELETE_LEASE_S", 300))
+    ACCOUNT_DELETE_POLL_S = float(os.getenv("ACCOUNT_DELETE_POLL_S", 60))  # recherche des suppressions à reprendre
+    ACCOUNT_DELETE_RETRY_S = float(os.getenv("ACCOUNT_DELETE_RETRY_S", 300))  # délai avant relance d'une suppression en échec
+
+    # Format MessagePack proposé aux dao_client des gateways (voir common/wire.py)
+    MSGPACK_ENABLED = os.getenv("MSGPACK_ENABLED", "true").lower() == "true"
@@ -1,26 +1,85 @@
+import uuid
+from datetime import datetime
+
 from flask import jsonify
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
 
 from database import db
 from models.client import Client
-import bcrypt
+from cache import profile_cache, client_key
+from dao.lots import id_parmi
+from dao.revocation_dao import RevocationDAO
+from dao.suppression_dao import SuppressionDAO
+from account_deletion import account_deletions
+from hashing import HashPoolSature, password_hasher
+from last_login import last_logins
+
+INDEX_EMAIL = "ux_client_email_lower"
+
+
+class EmailDejaUtilise(ValueError):
+    """L'email demandé appartient déjà à un autre client (index ux_client_email_lower)."""
+
+
+def _conflit_email(erreur):
+    # IntegrityError levée par l'index d'unicité de l'email (et non par une autre contrainte)
+    diag = getattr(erreur.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == INDEX_EMAIL
+
 
 class AuthDAO:
     @staticmethod
     def get_by_email(email):
-        # Récupère un client en fonction de son email
-        return db.session.query(Client).filter_by(email=email).first()
+        # Récupère un client en fonction de son email (insensible à la casse, index ux_client_email_lower)
+        return db.session.query(Client).filter(func.lower(Client.email) == email.lower()).first()
 
     @staticmethod
     def verify_password(stored_hash, plain_password):
-        # Vérifie si le mot de passe correspond au hash enregistré
-        return bcrypt.checkpw(plain_password.encode(), stored_hash.encode())
+        # Vérifie si le mot de passe correspond au hash enregistré (pool de hachage, voir hashing.py)
+        return password_hasher.verify(stored_hash, plain_password)
+
+    @staticmethod
+    def _rehash_if_needed(client_id, stored_hash, plain_password):
+        # Recalcule un hash stocké avec un autre coût que BCRYPT_ROUNDS (sans effet si le pool est saturé)
+        if not password_hasher.needs_rehash(stored_hash):
+            return
+        try:
+            nouveau = password_hasher.hash(plain_password)
+        except HashPoolSature:
+            return
+        db.session.execute(update(Client).where(Client.id == client_id).values(mot_de_passe=nouveau))
+        db.session.commit()
+        password_hasher.count_rehash()
 
     @staticmethod
     def get_client_info(client_id):
-        # Récupère les infos publiques d’un client par ID
+        # Récupère les infos publiques d’un client par ID (lecture à travers le cache des profils)
+        return profile_cache.get_or_load(client_key(client_id), lambda: AuthDAO._load_client_info(client_id))
+
+    @staticmethod
+    def _load_client_info(client_id):
+        # Lit les infos publiques d’un client en base (compte en cours de suppression : introuvable)
         client = db.session.get(Client, client_id)
-        if not client:
+        if not client or client.supprime_le is not None:
             return None
+        return AuthDAO._client_info(client)
+
+    @staticmethod
+    def get_clients_info(client_ids):
+        # Infos publiques de plusieurs clients (UUID) : cache d'abord, une seule requête id = ANY(...) pour les autres
+        infos = profile_cache.get_many_or_load([client_key(i) for i in client_ids], AuthDAO._load_clients_info)
+        return {uuid.UUID(cle): info for cle, info in infos.items()}
+
+    @staticmethod
+    def _load_clients_info(cles):
+        clients = db.session.query(Client).filter(
+            id_parmi(Client.id, [uuid.UUID(c) for c in cles]), Client.supprime_le.is_(None)
+        ).all()
+        return {str(client.id): AuthDAO._client_info(client) for client in clients}
+
+    @staticmethod
+    def _client_info(client):
         return {
             "id": str(client.id),
             "nom": client.nom,
@@ -33,11 +92,8 @@ class AuthDAO:
 
     @staticmethod
     def register(email, mot_de_passe, nom, prenom, role="client", actif=False):
-        # Enregistre un nouveau client après vérification de l'email
-        if AuthDAO.get_by_email(email):
-            return None
-
-        hashed_password = bcrypt.hashpw(mot_de_passe.encode(), bcrypt.gensalt()).decode()
+        # Enregistre un nouveau client ; l'unicité de l'email est garantie par l'index ux_client_email_lower
+        hashed_password = password_hasher.hash(mot_de_passe)
 
         client = Client(
             email=email,
@@ -49,13 +105,23 @@ class AuthDAO:
         )
 
         db.session.add(client)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not _conflit_email(e):
+                raise
+            # Email déjà utilisé
+            return None
         return client
 
     @staticmethod
     def login(email, mot_de_passe):
-        # Authentifie un client avec email et mot de passe
-        client = AuthDAO.get_by_email(email)
+        # Authentifie un client avec email et mot de passe (seules les colonnes utiles sont lues)
+        client = db.session.execute(
+            select(Client.id, Client.role, Client.email, Client.actif, Client.mot_de_passe)
+            .where(func.lower(Client.email) == email.lower())
+        ).first()
         if not client:
             print("Email non trouve")
             return "no email"
@@ -65,6 +131,9 @@ class AuthDAO:
             return "bloque"
 
         if AuthDAO.verify_password(client.mot_de_passe, mot_de_passe):
+            AuthDAO._rehash_if_needed(client.id, client.mot_de_passe, mot_de_passe)
+            # Dernière connexion écrite plus tard, par lots (voir last_login.py)
+            last_logins.record(client.id)
             return {
                 "id": str(client.id),
                 "role": client.role,
@@ -79,7 +148,7 @@ class AuthDAO:
         client = AuthDAO.get_by_email(email)
         if not client:
             return None
-        client.mot_de_passe = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
+        client.mot_de_passe = password_hasher.hash(new_password)
         db.session.commit()
         return True
 
@@ -89,38 +158,54 @@ class AuthDAO:
         client = db.session.get(Client, client_id)
         if not client or not AuthDAO.verify_password(client.mot_de_passe, current_password):
             return False
-        client.mot_de_passe = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
+        client.mot_de_passe = password_hasher.hash(new_password)
         db.session.commit()
         return True
 
     @staticmethod
     def update_profile(client_id, nom=None, prenom=None, email=None):
-        # Met à jour les informations du profil client
+        # Met à jour les informations du profil client ; EmailDejaUtilise si l'email est pris
         client = db.session.get(Client, client_id)
         if not client:
             return None
         if nom: client.nom = nom
         if prenom: client.prenom = prenom
         if email: client.email = email
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if _conflit_email(e):
+                raise EmailDejaUtilise(email) from e
+            raise
+        profile_cache.invalidate(client_key(client_id))
         return client
 
     @staticmethod
     def deactivate_account(client_id):
-        # Désactive le compte client (actif = False)
+        # Désactive le compte client (actif = False) et révoque ses jetons dans la même transaction
         client = db.session.get(Client, client_id)
         if not client:
             return False
         client.actif = False
+        RevocationDAO.revoke_client(client.id)
         db.session.commit()
+        profile_cache.invalidate(client_key(client_id))
         return True
 
     @staticmethod
     def delete_account(client_id):
-        # Supprime définitivement un compte client
+        # Marque le compte supprimé et révoque ses jetons tout de suite ; les données sont
+        # supprimées en arrière-plan, par lots (voir account_deletion.py). Retourne la suppression.
         client = db.session.get(Client, client_id)
-        if not client:
-            return False
-        db.session.delete(client)
+        if not client or client.supprime_le is not None:
+            return None
+        client.supprime_le = datetime.utcnow()
+        client.actif = False
+        client.email = None  # email libéré pour une nouvelle inscription (index ux_client_email_lower)
+        RevocationDAO.revoke_client(client.id)
+        suppression = SuppressionDAO.create(client.id)
         db.session.commit()
-        return True
+        profile_cache.invalidate(client_key(client_id))
+        account_deletions.submit(suppression.id)
+        return suppression
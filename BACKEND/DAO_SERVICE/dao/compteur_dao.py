@@ -0,0 +1,207 @@
+# dao/compteur_dao.py
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, text, func
+from sqlalchemy.dialects.postgresql import insert
+
+from database import db
+from dao.statistique_dao import StatistiqueDAO
+from models.statistique_compteur import StatistiqueCompteur
+from models.tache import Tache
+
+# Séances et jours actifs d'un client, complément des agrégats SQL pour reconstruire les compteurs
+SEANCES_SQL = text("""
+SELECT
+    count(*) AS nbre_seances,
+    count(*) FILTER (WHERE est_complete IS TRUE) AS nbre_seances_completees,
+    coalesce(array_agg(DISTINCT date_debut::date) FILTER (WHERE date_debut IS NOT NULL), '{}') AS jours_actifs
+FROM seance_etude
+WHERE client_id = :client_id
+""")
+
+
+def _cle_statut(statut):
+    # Même regroupement que les agrégats : statut en minuscules, "Autre" si vide
+    return statut.lower() if statut else "Autre"
+
+
+def _serie(jours):
+    # Nombre de jours consécutifs à partir du jour actif le plus récent
+    jours = sorted(jours, reverse=True)
+    serie = 1 if jours else 0
+    for precedent, jour in zip(jours, jours[1:]):
+        if (precedent - jour).days != 1:
+            break
+        serie += 1
+    return serie
+
+
+def etat_tache(tache):
+    # Valeurs d'une tâche utiles aux compteurs (avant ou après une écriture)
+    return {
+        "est_terminee": bool(tache.est_terminee),
+        "statut": _cle_statut(tache.statut),
+        "date_creation": tache.date_creation,
+    }
+
+
+def etat_seance(seance):
+    # Valeurs d'une séance utiles aux compteurs (avant ou après une écriture)
+    return {
+        "est_complete": bool(seance.est_complete),
+        "nbre_pomodoro_effectues": seance.nbre_pomodoro_effectues or 0,
+        "date_debut": seance.date_debut,
+    }
+
+
+class CompteurDAO:
+    """
+    Maintient la table statistique_compteur dans la transaction de l'écriture.
+
+    Les méthodes sont appelées après le flush de l'écriture et avant le commit.
+    La ligne du client est verrouillée (FOR UPDATE) pour sérialiser les mises à
+    jour concurrentes. Si elle n'existe pas encore, elle est reconstruite depuis
+    les tables (écriture courante comprise) et le delta n'est pas réappliqué.
+    """
+
+    @staticmethod
+    def _verrouiller(client_id):
+        # Retourne (compteur verrouillé, True si la ligne vient d'être reconstruite)
+        client_id = uuid.UUID(str(client_id))
+        compteur = db.session.execute(
+            select(StatistiqueCompteur)
+            .where(StatistiqueCompteur.client_id == client_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+        if compteur is not None:
+            return compteur, False
+
+        valeurs = CompteurDAO.calculer(client_id)
+        cree = db.session.execute(
+            insert(StatistiqueCompteur).values(**valeurs)
+            .on_conflict_do_nothing(index_elements=["client_id"])
+            .returning(StatistiqueCompteur.client_id)
+        ).first()
+        compteur = db.session.execute(
+            select(StatistiqueCompteur)
+            .where(StatistiqueCompteur.client_id == client_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalar_one()
+        # Ligne créée par une transaction concurrente : elle ne contient pas notre écriture
+        return compteur, cree is not None
+
+    @staticmethod
+    def calculer(client_id):
+        # Valeurs exactes des compteurs d'un client, recalculées depuis les tables
+        aggregats = StatistiqueDAO.aggregats_sql(client_id)
+        seances = db.session.execute(SEANCES_SQL, {"client_id": client_id}).mappings().one()
+        jours = sorted(seances["jours_actifs"])
+        return {
+            "client_id": client_id,
+            "nbre_taches_total": aggregats["total_taches"],
+            "nbre_taches_completees": aggregats["taches_completees"],
+            "taches_par_statut": dict(aggregats["taches_par_statut"]),
+            "premiere_date_tache": aggregats["premiere_date_tache"],
+            "nbre_seances": seances["nbre_seances"],
+            "nbre_seances_completees": seances["nbre_seances_completees"],
+            "nbre_pomodoros": int(aggregats["total_pomodoros"]),
+            "jours_actifs": jours,
+            "serie_jours_actifs": _serie(jours),
+            "derniere_date_active": aggregats["derniere_date_active"],
+            "seances_par_jour_semaine": {str(k): v for k, v in aggregats["seances_par_jour_semaine"].items()},
+            "date_mise_a_jour": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def reconstruire(client_id):
+        # Recalcule et remplace les compteurs d'un client (réparation / rattrapage) ; le commit revient à l'appelant
+        valeurs = CompteurDAO.calculer(uuid.UUID(str(client_id)))
+        stmt = insert(StatistiqueCompteur).values(**valeurs)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=["client_id"],
+            set_={k: stmt.excluded[k] for k in valeurs if k != "client_id"}
+        ))
+        return valeurs
+
+    # --- Tâches ---
+
+    @staticmethod
+    def taches_modifiees(changements):
+        """
+        changements : liste de (client_id, avant, apres) où avant/apres sont des
+        etat_tache() ou None (création / suppression).
+        """
+        par_client = {}
+        for client_id, avant, apres in changements:
+            if client_id is None:
+                continue
+            par_client.setdefault(uuid.UUID(str(client_id)), []).append((avant, apres))
+
+        # Ordre fixe des verrous pour éviter les interblocages entre lots
+        for client_id in sorted(par_client):
+            compteur, reconstruit = CompteurDAO._verrouiller(client_id)
+            if reconstruit:
+                continue
+            statuts = dict(compteur.taches_par_statut or {})
+            recalculer_premiere_date = False
+
+            for avant, apres in par_client[client_id]:
+                for etat, signe in ((avant, -1), (apres, 1)):
+                    if etat is None:
+                        continue
+                    compteur.nbre_taches_total += signe
+                    compteur.nbre_taches_completees += signe if etat["est_terminee"] else 0
+                    statuts[etat["statut"]] = statuts.get(etat["statut"], 0) + signe
+                if apres is None and avant is not None and avant["date_creation"] == compteur.premiere_date_tache:
+                    recalculer_premiere_date = True
+                elif apres is not None and avant is None and apres["date_creation"] is not None:
+                    if compteur.premiere_date_tache is None or apres["date_creation"] < compteur.premiere_date_tache:
+                        compteur.premiere_date_tache = apres["date_creation"]
+
+            compteur.taches_par_statut = {k: v for k, v in statuts.items() if v > 0}
+            if recalculer_premiere_date:
+                # Tâche la plus ancienne supprimée : relecture via l'index (client_id, date_creation)
+                compteur.premiere_date_tache = db.session.scalar(
+                    select(func.min(Tache.date_creation)).where(Tache.client_id == client_id)
+                )
+            compteur.date_mise_a_jour = datetime.utcnow()
+
+    @staticmethod
+    def tache_modifiee(client_id, avant, apres):
+        CompteurDAO.taches_modifiees([(client_id, avant, apres)])
+
+    # --- Séances ---
+
+    @staticmethod
+    def seance_modifiee(client_id, avant, apres):
+        # avant/apres : etat_seance() ou None (création)
+        compteur, reconstruit = CompteurDAO._verrouiller(client_id)
+        if reconstruit:
+            return
+
+        for etat, signe in ((avant, -1), (apres, 1)):
+            if etat is None:
+                continue
+            compteur.nbre_seances += signe
+            compteur.nbre_seances_completees += signe if etat["est_complete"] else 0
+            compteur.nbre_pomodoros += signe * etat["nbre_pomodoro_effectues"]
+
+        if avant is None and apres is not None and apres["date_debut"] is not None:
+            date_debut = apres["date_debut"]
+            jours = set(compteur.jours_actifs or [])
+            jours.add(date_debut.date())
+            compteur.jours_actifs = sorted(jours)
+            compteur.serie_jours_actifs = _serie(jours)
+
+            par_jour = dict(compteur.seances_par_jour_semaine or {})
+            cle = str(date_debut.isoweekday())
+            par_jour[cle] = par_jour.get(cle, 0) + 1
+            compteur.seances_par_jour_semaine = par_jour
+
+            if compteur.derniere_date_active is None or date_debut > compteur.derniere_date_active:
+                compteur.derniere_date_active = date_debut
+
+        compteur.date_mise_a_jour = datetime.utcnow()
@@ -0,0 +1,48 @@
+# dao/lots.py
+"""
+Lecture groupée par liste d'identifiants : une seule requête WHERE id = ANY(...)
+au lieu d'un aller-retour par entité.
+"""
+import uuid
+
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+
+class LotTropGrand(ValueError):
+    """Plus d'identifiants que la taille de lot autorisée."""
+
+
+def ids_demandes(data, max_size):
+    """
+    Identifiants d'une demande {"ids": [...]} : (UUID valides, sans doublon, dans
+    l'ordre de la demande ; valeurs invalides). ValueError si la liste est absente
+    ou vide, LotTropGrand au-delà de max_size.
+    """
+    valeurs = data.get("ids") if isinstance(data, dict) else None
+    if not isinstance(valeurs, list) or not valeurs:
+        raise ValueError("une liste 'ids' non vide est requise")
+    if len(valeurs) > max_size:
+        raise LotTropGrand(f"Lot limité à {max_size} éléments")
+
+    valides, invalides = {}, []
+    for valeur in valeurs:
+        try:
+            valides.setdefault(uuid.UUID(str(valeur)), None)
+        except ValueError:
+            invalides.append(valeur)
+    return list(valides), invalides
+
+
+def id_parmi(colonne, ids):
+    # colonne = ANY(:ids) : un seul paramètre tableau, quel que soit le nombre d'identifiants
+    return colonne == any_(literal(list(ids), ARRAY(UUID(as_uuid=True))))
+
+
+def reponse_lot(cle, ids, trouves, invalides, serialize):
+    """Corps de réponse d'une lecture groupée : entités dans l'ordre demandé, puis les manquantes."""
+    return {
+        cle: [serialize(trouves[i]) for i in ids if i in trouves],
+        "introuvables": [str(i) for i in ids if i not in trouves],
+        "invalides": invalides,
+    }
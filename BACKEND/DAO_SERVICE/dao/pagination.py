@@ -0,0 +1,77 @@
+# dao/pagination.py
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from config import Config
+
+
+def encode_cursor(date_value, row_id):
+    # Encode la position (date, id) de la dernière ligne d'une page en curseur opaque (date None : lignes sans date)
+    date_str = date_value.isoformat() if date_value is not None else None
+    payload = json.dumps([date_str, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    # Décode un curseur opaque en (date ou None, id) ; lève ValueError si le curseur est invalide
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(date_str) if date_str is not None else None), uuid.UUID(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Curseur invalide") from e
+
+
+def parse_page_size(value):
+    # Valide la taille de page demandée, bornée par PAGE_SIZE_MAX
+    if value in (None, ""):
+        return Config.PAGE_SIZE_DEFAULT
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit doit être un entier")
+    if size < 1:
+        raise ValueError("limit doit être positif")
+    return min(size, Config.PAGE_SIZE_MAX)
+
+
+def keyset_page(query, date_column, id_column, cursor=None, limit=None):
+    """
+    Retourne une page (lignes, next_cursor) triée par (date, id) décroissants,
+    les lignes sans date en dernier (NULLS LAST).
+
+    Pagination par clé : la page suivante démarre strictement après la dernière
+    ligne vue (WHERE (date, id) < curseur) au lieu d'un OFFSET, le coût d'une
+    page ne dépend donc pas de sa position dans l'historique.
+
+    Deux phases, chacune servie par l'index (client, date DESC, id DESC) : les
+    lignes datées, puis celles sans date (WHERE date IS NULL AND id < curseur).
+    Un curseur de date None désigne la seconde phase.
+    """
+    limit = limit or Config.PAGE_SIZE_DEFAULT
+    last_date, last_id = decode_cursor(cursor) if cursor else (None, None)
+
+    # On lit une ligne de plus pour savoir s'il existe une page suivante
+    rows = []
+    if not cursor or last_date is not None:
+        datees = query.filter(date_column.is_not(None))
+        if cursor:
+            datees = datees.filter(tuple_(date_column, id_column) < tuple_(last_date, last_id))
+        rows = datees.order_by(date_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        sans_date = query.filter(date_column.is_(None))
+        if last_date is None and last_id is not None:
+            sans_date = sans_date.filter(id_column < last_id)
+        rows += sans_date.order_by(id_column.desc()).limit(limit + 1 - len(rows)).all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, date_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -0,0 +1,72 @@
+# dao/revocation_dao.py
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+from config import Config
+from database import db
+from models.revocation import Revocation
+
+CLIENT = "client"
+JETON = "jeton"
+
+
+class RevocationDAO:
+    """
+    Liste des révocations publiée aux gateways (voir common/revocation.py).
+
+    Les gateways ne la consultent pas à chaque requête : ils récupèrent
+    périodiquement les entrées postérieures à leur dernier seq (delta) et
+    vérifient les JWT en mémoire. Une entrée n'est utile que tant qu'un jeton
+    concerné peut encore être valide : elle est purgée après expire_le.
+    """
+
+    @staticmethod
+    def revoke_client(client_id):
+        # Tous les jetons du client émis jusqu'à maintenant ; à appeler dans la transaction de l'écriture
+        now = datetime.now(timezone.utc)
+        db.session.add(Revocation(
+            type=CLIENT,
+            valeur=str(client_id),
+            revoque_le=now,
+            expire_le=now + timedelta(seconds=Config.JWT_ACCESS_TOKEN_EXPIRES),
+        ))
+
+    @staticmethod
+    def revoke_token(jti, exp):
+        # Un seul jeton (déconnexion), jusqu'à son expiration (exp : timestamp du JWT)
+        db.session.add(Revocation(
+            type=JETON,
+            valeur=jti,
+            expire_le=datetime.fromtimestamp(exp, timezone.utc),
+        ))
+        RevocationDAO.purge_expired()
+        db.session.commit()
+
+    @staticmethod
+    def purge_expired():
+        db.session.execute(delete(Revocation).where(Revocation.expire_le < func.now()))
+
+    @staticmethod
+    def since(seq, limit):
+        # Révocations encore utiles postérieures à seq, par seq croissant (au plus limit)
+        return db.session.scalars(
+            select(Revocation)
+            .where(Revocation.seq > seq, Revocation.expire_le > func.now())
+            .order_by(Revocation.seq)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def last_seq():
+        return db.session.scalar(select(func.max(Revocation.seq))) or 0
+
+    @staticmethod
+    def serialize(revocation):
+        return {
+            "seq": revocation.seq,
+            "type": revocation.type,
+            "valeur": revocation.valeur,
+            "revoque_le": revocation.revoque_le.timestamp(),
+            "expire_le": revocation.expire_le.timestamp(),
+        }
@@ -9,6 +9,11 @@ from models.tache import Tache
 from models.journal_etude import JournalEtude
 from models.note_etude import NoteEtude
 from database import db
+from dao.pagination import keyset_page
+from dao.compteur_dao import CompteurDAO, etat_seance
+from dao.version_dao import VersionDAO, SEANCE
+from dao.lots import id_parmi
+from dao.suppression_dao import verrouiller_client_actif
 from datetime import datetime
 import uuid
 
@@ -22,6 +27,9 @@ class SeanceDAO:
             if field not in data:
                 raise ValueError(f"Missing required field: {field}")
 
+        # Client verrouillé jusqu'au commit : aucune séance créée pour un compte en cours de suppression
+        verrouiller_client_actif(data["client_id"])
+
         # Crée les paramètres Pomodoro s’ils sont fournis
         pomodoro_data = data.get("pomodoro")
         if pomodoro_data:
@@ -65,6 +73,9 @@ class SeanceDAO:
 
         # Enregistre la séance dans la base de données
         db.session.add(seance)
+        db.session.flush()
+        CompteurDAO.seance_modifiee(seance.client_id, None, etat_seance(seance))
+        VersionDAO.bump([seance.client_id], SEANCE)
         db.session.commit()
 
         # Retourne la séance créée
@@ -87,33 +98,69 @@ class SeanceDAO:
 
     @staticmethod
     def changer_statut(seance_id, statut):
-        # Change le statut d'une séance (ex. : terminée)
-        seance = SeanceEtude.query.get(seance_id)
+        # Change le statut d'une séance (ex. : terminée) ; ligne verrouillée, l'état lu sert au delta des compteurs
+        seance = db.session.get(SeanceEtude, seance_id, with_for_update=True, populate_existing=True)
         if seance:
+            avant = etat_seance(seance)
             seance.statut = statut
             if statut == "terminee":
                 seance.date_fin = datetime.utcnow()
                 seance.est_complete = True
+            apres = etat_seance(seance)
+            if apres != avant:
+                db.session.flush()
+                CompteurDAO.seance_modifiee(seance.client_id, avant, apres)
+            VersionDAO.bump([seance.client_id], SEANCE)
             db.session.commit()
         return seance
 
     @staticmethod
     def get_seances_by_user(client_id):
         # Récupère toutes les séances d’un utilisateur
-        return SeanceEtude.query.filter_by(client_id=uuid.UUID(client_id)).all()
+        return SeanceDAO.seances_query(client_id).all()
+
+    @staticmethod
+    def seances_query(client_id):
+        # Requête (non exécutée) des séances d'un utilisateur, pour les réponses en streaming
+        return SeanceEtude.query.filter_by(client_id=uuid.UUID(client_id))
+
+    @staticmethod
+    def get_many_for_user(ids, client_id):
+        # Charge en une seule requête les séances de la liste appartenant au client : {id: SeanceEtude}
+        if not ids:
+            return {}
+        seances = SeanceEtude.query.filter(
+            id_parmi(SeanceEtude.id, ids), SeanceEtude.client_id == uuid.UUID(client_id)
+        ).all()
+        return {s.id: s for s in seances}
+
+    @staticmethod
+    def get_seances_page(client_id, cursor=None, limit=None):
+        # Retourne une page de séances (plus récentes d'abord) et le curseur de la page suivante
+        return keyset_page(
+            SeanceEtude.query.filter_by(client_id=uuid.UUID(client_id)),
+            SeanceEtude.date_debut, SeanceEtude.id,
+            cursor=cursor, limit=limit
+        )
 
     @staticmethod
     def terminer_seance(seance_id, data):
-        # Marque une séance comme terminée avec les données finales
-        seance = SeanceEtude.query.get(seance_id)
+        # Marque une séance comme terminée avec les données finales (ligne verrouillée jusqu'au commit)
+        seance = db.session.get(SeanceEtude, seance_id, with_for_update=True, populate_existing=True)
         if not seance:
             return None
 
+        avant = etat_seance(seance)
         seance.date_fin = datetime.utcnow()
         seance.est_complete = data.get("est_complete", True)
         seance.interruptions = data.get("interruptions", seance.interruptions)
         seance.nbre_pomodoro_effectues = data.get("nbre_pomodoro_effectues", seance.nbre_pomodoro_effectues)
         seance.statut = "terminee"
 
+        apres = etat_seance(seance)
+        if apres != avant:
+            db.session.flush()
+            CompteurDAO.seance_modifiee(seance.client_id, avant, apres)
+        VersionDAO.bump([seance.client_id], SEANCE)
         db.session.commit()
         return seance
@@ -1,12 +1,70 @@
 import uuid
 from datetime import datetime
+from sqlalchemy import text, select, func
 from models.statistique import StatistiqueSnapshot
+from models.statistique_compteur import StatistiqueCompteur
+from models.tache import Tache
 from database import db
+from dao.version_dao import VersionDAO, STATISTIQUE
+from dao.suppression_dao import verrouiller_client_actif
+
+# Agrégats bruts d'un client, calculés en une seule requête par PostgreSQL.
+# La série de jours actifs consécutifs (à partir du jour actif le plus récent) est
+# obtenue par la méthode des « îlots » : jour + rang décroissant est constant sur une série.
+AGGREGATS_SQL = text("""
+WITH taches AS (
+    SELECT
+        count(*) AS total_taches,
+        count(*) FILTER (WHERE est_terminee IS TRUE) AS taches_completees,
+        count(*) FILTER (WHERE est_terminee IS NOT TRUE AND date_fin < :maintenant) AS taches_retard,
+        min(date_creation) AS premiere_date_tache
+    FROM tache
+    WHERE client_id = :client_id
+), statuts AS (
+    SELECT coalesce(lower(nullif(statut, '')), 'Autre') AS statut, count(*) AS n
+    FROM tache
+    WHERE client_id = :client_id
+    GROUP BY 1
+), seances AS (
+    SELECT
+        coalesce(sum(nbre_pomodoro_effectues), 0) AS total_pomodoros,
+        max(date_debut) AS derniere_date_active
+    FROM seance_etude
+    WHERE client_id = :client_id
+), jours_semaine AS (
+    SELECT extract(isodow FROM date_debut)::int AS jour_semaine, count(*) AS n
+    FROM seance_etude
+    WHERE client_id = :client_id AND date_debut IS NOT NULL
+    GROUP BY 1
+), jours AS (
+    SELECT DISTINCT date_debut::date AS jour
+    FROM seance_etude
+    WHERE client_id = :client_id AND date_debut IS NOT NULL
+), series AS (
+    SELECT jour, jour + (row_number() OVER (ORDER BY jour DESC))::int AS groupe
+    FROM jours
+)
+SELECT
+    taches.total_taches,
+    taches.taches_completees,
+    taches.taches_retard,
+    taches.premiere_date_tache,
+    (SELECT coalesce(json_object_agg(statut, n), '{}') FROM statuts) AS taches_par_statut,
+    seances.total_pomodoros,
+    seances.derniere_date_active,
+    (SELECT count(*) FROM jours) AS jours_actifs,
+    (SELECT count(*) FROM series
+     WHERE groupe = (SELECT groupe FROM series ORDER BY jour DESC LIMIT 1)) AS serie_jours_actifs,
+    (SELECT coalesce(json_object_agg(jour_semaine, n), '{}') FROM jours_semaine) AS seances_par_jour_semaine
+FROM taches, seances
+""")
 
 class StatistiqueDAO:
     @staticmethod
     def creer_snapshot(data):
         # Crée et enregistre un snapshot statistique dans la base de données
+        # (client verrouillé jusqu'au commit : refusé pour un compte en cours de suppression)
+        verrouiller_client_actif(data["client_id"])
         snapshot = StatistiqueSnapshot(
             id=uuid.uuid4(),
             client_id=uuid.UUID(data["client_id"]),
@@ -21,16 +79,81 @@ class StatistiqueDAO:
             activite_par_jour_semaine=data.get("activite_par_jour_semaine")
         )
         db.session.add(snapshot)
+        VersionDAO.bump([snapshot.client_id], STATISTIQUE)
         db.session.commit()
         return snapshot
 
     @staticmethod
     def get_recent_snapshots(client_id, limit=7):
         # Récupère les X derniers snapshots d’un utilisateur (par défaut : 7)
+        return StatistiqueDAO.recent_snapshots_query(client_id, limit).all()
+
+    @staticmethod
+    def recent_snapshots_query(client_id, limit=7):
+        # Requête (non exécutée) des derniers snapshots, pour les réponses en streaming
         return (
             StatistiqueSnapshot.query
             .filter_by(client_id=uuid.UUID(client_id))
             .order_by(StatistiqueSnapshot.date_capture.desc())
             .limit(limit)
-            .all()
         )
+
+    @staticmethod
+    def get_aggregats(client_id):
+        """
+        Agrégats nécessaires aux statistiques d'un client.
+
+        Lus dans statistique_compteur (une ligne par clé primaire) quand les
+        compteurs du client existent ; sinon calculés en SQL sur les tables.
+        Le nombre de tâches en retard dépend de l'heure courante : il reste
+        compté à la lecture, via l'index partiel ix_tache_client_date_fin_ouverte.
+        """
+        client_uuid = uuid.UUID(client_id)
+        compteur = db.session.get(StatistiqueCompteur, client_uuid)
+        if compteur is None:
+            return StatistiqueDAO.format_aggregats(StatistiqueDAO.aggregats_sql(client_uuid))
+
+        taches_retard = db.session.scalar(
+            select(func.count()).select_from(Tache).where(
+                Tache.client_id == client_uuid,
+                Tache.est_terminee.is_not(True),
+                Tache.date_fin < datetime.utcnow()
+            )
+        )
+        return StatistiqueDAO.format_aggregats({
+            "total_taches": compteur.nbre_taches_total,
+            "taches_completees": compteur.nbre_taches_completees,
+            "taches_retard": taches_retard,
+            "premiere_date_tache": compteur.premiere_date_tache,
+            "taches_par_statut": compteur.taches_par_statut,
+            "total_pomodoros": compteur.nbre_pomodoros,
+            "derniere_date_active": compteur.derniere_date_active,
+            "jours_actifs": len(compteur.jours_actifs),
+            "serie_jours_actifs": compteur.serie_jours_actifs,
+            "seances_par_jour_semaine": compteur.seances_par_jour_semaine,
+        })
+
+    @staticmethod
+    def aggregats_sql(client_uuid):
+        # Calcule en SQL les agrégats d'un client à partir des tables (une ligne renvoyée)
+        return db.session.execute(AGGREGATS_SQL, {
+            "client_id": client_uuid,
+            "maintenant": datetime.utcnow()
+        }).mappings().one()
+
+    @staticmethod
+    def format_aggregats(row):
+        # Mise en forme JSON commune aux deux sources d'agrégats
+        return {
+            "total_taches": row["total_taches"],
+            "taches_completees": row["taches_completees"],
+            "taches_retard": row["taches_retard"],
+            "premiere_date_tache": row["premiere_date_tache"].isoformat() if row["premiere_date_tache"] else None,
+            "taches_par_statut": dict(row["taches_par_statut"]),
+            "total_pomodoros": int(row["total_pomodoros"]),
+            "derniere_date_active": row["derniere_date_active"].isoformat() if row["derniere_date_active"] else None,
+            "jours_actifs": row["jours_actifs"],
+            "serie_jours_actifs": row["serie_jours_actifs"],
+            # Clés ISO : "1" = lundi ... "7" = dimanche
+            "seances_par_jour_semaine": {str(k): v for k, v in row["seances_par_jour_semaine"].items()},
+        }
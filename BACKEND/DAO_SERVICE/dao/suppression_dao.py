@@ -0,0 +1,210 @@
+# dao/suppression_dao.py
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, delete, exists, null, or_, select, update
+
+from database import db
+from models.client import Client
+from models.journal_etude import JournalEtude
+from models.note_etude import NoteEtude
+from models.notification import Notification
+from models.pomodoro_parametre import PomodoroParametre
+from models.preference import Preference
+from models.seance_etude import SeanceEtude
+from models.statistique import StatistiqueSnapshot
+from models.suppression_compte import SuppressionCompte
+from models.tache import Tache
+from dao.version_dao import VersionDAO, TACHE
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINEE = "terminee"
+ECHEC = "echec"
+
+
+class ClientSupprime(LookupError):
+    """Écriture refusée : le client n'existe pas ou son compte est en cours de suppression."""
+
+
+def verrouiller_client_actif(client_id):
+    """
+    À appeler dans la transaction d'une écriture qui crée des lignes d'un client.
+    Verrouille en partage (FOR SHARE) la ligne du client jusqu'au commit, ou lève
+    ClientSupprime s'il est marqué supprimé : AuthDAO.delete_account attend la fin
+    de l'écriture, ou l'écriture voit la marque. Aucune ligne n'est donc créée
+    après le passage de l'étape de suppression qui la concerne.
+    """
+    trouve = db.session.scalar(
+        select(Client.id)
+        .where(Client.id == uuid.UUID(str(client_id)), Client.supprime_le.is_(None))
+        .with_for_update(read=True)
+    )
+    if trouve is None:
+        raise ClientSupprime("Client introuvable")
+
+
+def _lot(model, condition, taille):
+    # DELETE ... WHERE id IN (SELECT id ... LIMIT n) : au plus `taille` lignes par transaction
+    return db.session.execute(
+        delete(model)
+        .where(model.id.in_(select(model.id).where(condition).limit(taille).scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def _notes(client_id, taille):
+    journaux = select(JournalEtude.id).where(JournalEtude.client_id == client_id)
+    return _lot(NoteEtude, NoteEtude.journal_etude_id.in_(journaux), taille)
+
+
+def _seances(client_id, taille):
+    # Séances du client, puis leurs paramètres Pomodoro devenus orphelins
+    ids = db.session.scalars(select(SeanceEtude.id).where(SeanceEtude.client_id == client_id).limit(taille)).all()
+    if not ids:
+        return 0
+    # Tâches d'autres clients rattachées à ces séances : détachées plutôt que bloquer la suppression,
+    # et version de leurs listes incrémentée dans la même transaction (ETag)
+    detachees = db.session.scalars(
+        update(Tache).where(Tache.seance_etude_id.in_(ids)).values(seance_etude_id=None)
+        .returning(Tache.client_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    VersionDAO.bump(detachees, TACHE)
+    pomodoros = db.session.scalars(
+        delete(SeanceEtude).where(SeanceEtude.id.in_(ids)).returning(SeanceEtude.pomodoro_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    pomodoros = [p for p in pomodoros if p is not None]
+    if pomodoros:
+        db.session.execute(
+            delete(PomodoroParametre)
+            .where(PomodoroParametre.id.in_(pomodoros))
+            .where(~exists().where(SeanceEtude.pomodoro_id == PomodoroParametre.id))
+            .execution_options(synchronize_session=False)
+        )
+    return len(ids)
+
+
+def _client(client_id, taille):
+    # statistique_compteur et donnees_version suivent par ON DELETE CASCADE (une ligne par domaine)
+    return db.session.execute(
+        delete(Client).where(Client.id == client_id).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+# Ordre des clés étrangères : une table est vidée avant celles qu'elle référence
+ETAPES = [
+    ("note_etude", _notes),
+    ("journal_etude", lambda c, n: _lot(JournalEtude, JournalEtude.client_id == c, n)),
+    ("tache", lambda c, n: _lot(Tache, Tache.client_id == c, n)),
+    ("seance_etude", _seances),
+    ("notification", lambda c, n: _lot(Notification, Notification.client_id == c, n)),
+    ("preference", lambda c, n: _lot(Preference, Preference.client_id == c, n)),
+    ("statistique_snapshot", lambda c, n: _lot(StatistiqueSnapshot, StatistiqueSnapshot.client_id == c, n)),
+    ("client", _client),
+]
+
+
+class SuppressionDAO:
+    """
+    Suivi des suppressions de compte exécutées en arrière-plan (voir account_deletion.py).
+
+    Chaque lot supprime au plus `taille` lignes d'une étape et met à jour la
+    progression dans la même transaction : une suppression interrompue reprend
+    là où elle s'était arrêtée, sans transaction longue.
+    """
+
+    @staticmethod
+    def create(client_id):
+        # Nouvelle suppression en attente ; à valider avec la marque du client
+        maintenant = datetime.utcnow()
+        suppression = SuppressionCompte(
+            client_id=client_id,
+            statut=EN_ATTENTE,
+            lignes_supprimees=0,
+            cree_le=maintenant,
+            mis_a_jour_le=maintenant,
+        )
+        db.session.add(suppression)
+        return suppression
+
+    @staticmethod
+    def get(suppression_id):
+        return db.session.get(SuppressionCompte, suppression_id)
+
+    @staticmethod
+    def reserver(bail, relance):
+        """
+        Réserve la plus ancienne suppression à exécuter et retourne son id (None s'il n'y en a pas).
+        Une suppression en cours dont la progression n'a pas bougé depuis `bail` secondes
+        (processus arrêté) est reprise ; une suppression en échec est relancée `relance`
+        secondes après son échec, depuis la première étape. Le UPDATE ... WHERE id =
+        (SELECT ... FOR UPDATE SKIP LOCKED) garantit qu'un seul processus l'obtient.
+        """
+        maintenant = datetime.utcnow()
+        candidate = (
+            select(SuppressionCompte.id)
+            .where(or_(
+                SuppressionCompte.statut == EN_ATTENTE,
+                and_(
+                    SuppressionCompte.statut == EN_COURS,
+                    SuppressionCompte.mis_a_jour_le < maintenant - timedelta(seconds=bail),
+                ),
+                and_(
+                    SuppressionCompte.statut == ECHEC,
+                    SuppressionCompte.mis_a_jour_le < maintenant - timedelta(seconds=relance),
+                ),
+            ))
+            .order_by(SuppressionCompte.cree_le)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        suppression_id = db.session.scalar(
+            update(SuppressionCompte)
+            .where(SuppressionCompte.id == candidate)
+            .values(
+                statut=EN_COURS,
+                mis_a_jour_le=maintenant,
+                etape=case((SuppressionCompte.statut == ECHEC, null()), else_=SuppressionCompte.etape),
+            )
+            .returning(SuppressionCompte.id)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return suppression_id
+
+    @staticmethod
+    def delete_chunk(suppression, etape, taille):
+        # Supprime un lot de l'étape et enregistre la progression (une transaction, prolonge la réservation) ;
+        # retourne le nombre de lignes
+        supprimees = dict(ETAPES)[etape](suppression.client_id, taille)
+        suppression.statut = EN_COURS
+        suppression.etape = etape
+        suppression.lignes_supprimees += supprimees
+        suppression.mis_a_jour_le = datetime.utcnow()
+        db.session.commit()
+        return supprimees
+
+    @staticmethod
+    def finish(suppression, erreur=None):
+        suppression.statut = ECHEC if erreur else TERMINEE
+        suppression.erreur = erreur
+        suppression.mis_a_jour_le = datetime.utcnow()
+        suppression.termine_le = None if erreur else suppression.mis_a_jour_le
+        db.session.commit()
+
+    @staticmethod
+    def serialize(suppression):
+        return {
+            "id": str(suppression.id),
+            "client_id": str(suppression.client_id),
+            "statut": suppression.statut,
+            "etape": suppression.etape,
+            "lignes_supprimees": suppression.lignes_supprimees,
+            "erreur": suppression.erreur,
+            "cree_le": suppression.cree_le.isoformat(),
+            "mis_a_jour_le": suppression.mis_a_jour_le.isoformat(),
+            "termine_le": suppression.termine_le.isoformat() if suppression.termine_le else None,
+        }
@@ -1,25 +1,211 @@
 # dao/tache_dao.py
+import uuid
 from flask import jsonify
+from sqlalchemy import or_, select, insert, update, delete, any_, cast, column, literal, values
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from models.tache import Tache
+from models.seance_etude import SeanceEtude
 from database import db
+from dao.pagination import keyset_page
+from dao.compteur_dao import CompteurDAO, etat_tache
+from dao.version_dao import VersionDAO, TACHE
+from dao.lots import id_parmi
+from dao.suppression_dao import ClientSupprime, verrouiller_client_actif
 from datetime import datetime
 
+# Champs modifiables d'une tâche (update unitaire et par lot)
+CHAMPS_MODIFIABLES = (
+    "titre", "description", "statut", "importance", "priorite", "est_terminee",
+    "duree_estimee", "duree_reelle", "date_fin", "seance_etude_id",
+)
+CHAMPS_ENTIERS = ("importance", "duree_estimee", "duree_reelle")
+CHAMPS_TEXTE = ("titre", "description", "statut", "priorite")
+ENTIER_MAX = 2 ** 31 - 1  # colonnes Integer (int4)
+
+
+def _parse_date_fin(value):
+    # Convertit une date ISO (avec 'Z' éventuel) en datetime ; ValueError si invalide
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _entier(value):
+    # int, float entier ou chaîne numérique ("3") ; ValueError sinon (booléens compris)
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError
+        value = int(value)
+    value = int(value)
+    if not -ENTIER_MAX - 1 <= value <= ENTIER_MAX:
+        raise ValueError
+    return value
+
+
+def _booleen(value):
+    # bool, 0/1 ou "true"/"false"/"1"/"0" (comme le filtre est_terminee) ; ValueError sinon
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in ("true", "false", "1", "0"):
+        return value.lower() in ("true", "1")
+    raise ValueError
+
+
+def _convertir_champs(ligne):
+    """
+    Convertit en place les champs typés présents dans ligne (None accepté).
+    Retourne le nom du premier champ invalide, ou None : l'élément est refusé
+    seul (400) au lieu d'une DataError qui annulerait tout le lot.
+    """
+    for champ in CHAMPS_ENTIERS + ("est_terminee",) + CHAMPS_TEXTE:
+        valeur = ligne.get(champ)
+        if valeur is None:
+            continue
+        try:
+            if champ in CHAMPS_ENTIERS:
+                ligne[champ] = _entier(valeur)
+            elif champ == "est_terminee":
+                ligne[champ] = _booleen(valeur)
+            elif not isinstance(valeur, str):
+                raise ValueError
+        except ValueError:
+            return champ
+    return None
+
+
+def _owned_by(user_id):
+    # Condition SQL : la tâche appartient à l'utilisateur ou se trouve dans une de ses séances
+    return or_(
+        Tache.client_id == user_id,
+        Tache.seance_etude_id.in_(select(SeanceEtude.id).where(SeanceEtude.client_id == user_id))
+    )
+
+
+def _seances_acceptees(user_id, demandes, resultats):
+    """
+    Contrôle les seance_etude_id d'un lot ({index: valeur demandée}) en une seule
+    requête : UUID valide et séance appartenant à user_id, verrouillée en partage
+    jusqu'au commit. Les refus sont inscrits dans resultats (400 ou 404) ;
+    retourne {index: UUID ou None} des éléments acceptés.
+    """
+    ids = {}
+    for index, valeur in demandes.items():
+        if valeur is None:
+            ids[index] = None
+            continue
+        try:
+            ids[index] = uuid.UUID(str(valeur))
+        except ValueError:
+            resultats[index] = {"index": index, "status": 400, "error": "seance_etude_id invalide"}
+
+    a_verifier = {i for i in ids.values() if i is not None}
+    trouvees = set()
+    if a_verifier:
+        trouvees = set(db.session.scalars(
+            select(SeanceEtude.id)
+            .where(id_parmi(SeanceEtude.id, a_verifier), SeanceEtude.client_id == user_id)
+            .with_for_update(read=True)
+        ))
+
+    acceptees = {}
+    for index, seance_id in ids.items():
+        if seance_id is not None and seance_id not in trouvees:
+            resultats[index] = {"index": index, "status": 404, "error": "Séance d'étude introuvable ou accès refusé"}
+        else:
+            acceptees[index] = seance_id
+    return acceptees
+
+
 class TacheDAO:
+    @staticmethod
+    def search_query(client_id, seance_etude_id=None, statuts=None, est_terminee=None,
+                     priorites=None, date_fin_min=None, date_fin_max=None):
+        # Construit la requête de recherche des tâches d'un client, filtres appliqués en SQL
+        query = Tache.query.filter(Tache.client_id == client_id)
+
+        if seance_etude_id is not None:
+            query = query.filter(Tache.seance_etude_id == seance_etude_id)
+        if statuts:
+            query = query.filter(Tache.statut.in_(statuts))
+        if est_terminee is True:
+            query = query.filter(Tache.est_terminee.is_(True))
+        elif est_terminee is False:
+            # Une tâche sans valeur est considérée comme non terminée
+            query = query.filter(Tache.est_terminee.is_not(True))
+        if priorites:
+            query = query.filter(Tache.priorite.in_(priorites))
+        if date_fin_min is not None:
+            query = query.filter(Tache.date_fin >= date_fin_min)
+        if date_fin_max is not None:
+            query = query.filter(Tache.date_fin <= date_fin_max)
+
+        return query
+
+    @staticmethod
+    def search(client_id, **filters):
+        # Recherche toutes les tâches d'un client correspondant aux filtres
+        return [t.to_dict() for t in TacheDAO.search_query(client_id, **filters).all()]
+
+    @staticmethod
+    def search_page(client_id, cursor=None, limit=None, **filters):
+        # Retourne une page de tâches (plus récentes d'abord) et le curseur de la page suivante
+        taches, next_cursor = keyset_page(
+            TacheDAO.search_query(client_id, **filters),
+            Tache.date_creation, Tache.id,
+            cursor=cursor, limit=limit
+        )
+        return [t.to_dict() for t in taches], next_cursor
+
     @staticmethod
     def get_by_seance_id(seance_etude_id):
         # Récupère toutes les tâches liées à une séance donnée
-        taches = Tache.query.filter_by(seance_etude_id=seance_etude_id).all()
+        taches = TacheDAO.seance_query(seance_etude_id).all()
         return [t.to_dict() for t in taches]
 
+    @staticmethod
+    def seance_query(seance_etude_id):
+        # Requête (non exécutée) des tâches d'une séance, pour les réponses en streaming
+        return Tache.query.filter_by(seance_etude_id=seance_etude_id)
+
     @staticmethod
     def get_by_id(tache_id):
         # Récupère une tâche par son ID
         tache = Tache.query.get(tache_id)
         return tache.to_dict() if tache else None
 
+    @staticmethod
+    def get_for_user(tache_id, user_id, for_update=False):
+        # Charge la tâche si l'utilisateur en est propriétaire ou possède sa séance, en une seule requête.
+        # for_update : ligne verrouillée jusqu'au commit (écritures), l'état lu sert au delta des compteurs
+        query = (
+            Tache.query
+            .outerjoin(SeanceEtude, SeanceEtude.id == Tache.seance_etude_id)
+            .filter(
+                Tache.id == tache_id,
+                or_(Tache.client_id == user_id, SeanceEtude.client_id == user_id)
+            )
+        )
+        if for_update:
+            query = query.with_for_update(of=Tache).populate_existing()
+        return query.first()
+
+    @staticmethod
+    def get_many_for_user(ids, user_id):
+        # Charge en une seule requête les tâches de la liste accessibles à user_id : {id: Tache}
+        if not ids:
+            return {}
+        taches = Tache.query.filter(id_parmi(Tache.id, ids), _owned_by(user_id)).all()
+        return {t.id: t for t in taches}
+
     @staticmethod
     def add(data):
         try:
+            # Client verrouillé jusqu'au commit : aucune tâche créée pour un compte en cours de suppression
+            verrouiller_client_actif(data['client_id'])
             # Crée et ajoute une nouvelle tâche à la base de données
             nouvelle_tache = Tache(
                 client_id=data['client_id'],
@@ -36,18 +222,31 @@ class TacheDAO:
                 priorite=data.get('priorite'),
             )
             db.session.add(nouvelle_tache)
+            db.session.flush()
+            CompteurDAO.tache_modifiee(nouvelle_tache.client_id, None, etat_tache(nouvelle_tache))
+            VersionDAO.bump([nouvelle_tache.client_id], TACHE)
+            result = nouvelle_tache.to_dict()
             db.session.commit()
-            return nouvelle_tache.to_dict()
+            return result
+        except ClientSupprime:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()  # Annule en cas d’erreur
             return {"error": str(e)}
 
     @staticmethod
     def update(tache_id, data):
-        # Met à jour une tâche existante avec les données fournies
-        tache = Tache.query.get(tache_id)
+        # Met à jour une tâche existante avec les données fournies (ligne verrouillée jusqu'au commit)
+        tache = db.session.get(Tache, tache_id, with_for_update=True, populate_existing=True)
         if not tache:
             return None
+        return TacheDAO.update_entity(tache, data)
+
+    @staticmethod
+    def update_entity(tache, data):
+        # Met à jour une tâche déjà chargée et verrouillée (get_for_user(..., for_update=True)) sans la relire
+        avant = etat_tache(tache)
 
         # Met à jour uniquement les champs présents dans les données
         tache.titre = data.get("titre", tache.titre)
@@ -68,22 +267,248 @@ class TacheDAO:
                     tache.date_fin = datetime.fromisoformat(
                         data["date_fin"].replace('Z', '+00:00'))
                 except ValueError:
-                    print(f"Warning: Invalid date_fin format for task {tache_id}: {data['date_fin']}")
+                    print(f"Warning: Invalid date_fin format for task {tache.id}: {data['date_fin']}")
                     pass
 
         # Met à jour ou supprime le lien avec une séance
         if "seance_etude_id" in data:
             tache.seance_etude_id = data.get("seance_etude_id")
 
+        # Sérialise avant le commit : après, l'objet expiré serait relu en base
+        db.session.flush()
+        apres = etat_tache(tache)
+        if apres != avant:
+            CompteurDAO.tache_modifiee(tache.client_id, avant, apres)
+        VersionDAO.bump([tache.client_id], TACHE)
+        result = tache.to_dict()
         db.session.commit()
-        return tache.to_dict()
+        return result
 
     @staticmethod
     def delete(tache_id):
-        # Supprime une tâche à partir de son ID
-        tache = Tache.query.get(tache_id)
+        # Supprime une tâche à partir de son ID (ligne verrouillée jusqu'au commit)
+        tache = db.session.get(Tache, tache_id, with_for_update=True, populate_existing=True)
         if not tache:
             return False
+        return TacheDAO.delete_entity(tache)
+
+    @staticmethod
+    def delete_entity(tache):
+        # Supprime une tâche déjà chargée et verrouillée (get_for_user(..., for_update=True)) sans la relire
+        client_id, avant = tache.client_id, etat_tache(tache)
         db.session.delete(tache)
+        db.session.flush()
+        CompteurDAO.tache_modifiee(client_id, avant, None)
+        VersionDAO.bump([client_id], TACHE)
         db.session.commit()
         return True
+
+    # --- Opérations par lot : une transaction, quelques requêtes ensemblistes ---
+
+    @staticmethod
+    def add_many(user_id, items):
+        """
+        Crée plusieurs tâches pour user_id avec un INSERT multi-lignes ... RETURNING.
+        Retourne un résultat par élément, dans l'ordre reçu.
+        """
+        resultats = [None] * len(items)
+        candidats = {}
+        maintenant = datetime.utcnow()
+
+        for index, data in enumerate(items):
+            if not isinstance(data, dict) or not data.get("titre"):
+                resultats[index] = {"index": index, "status": 400, "error": "titre est requis"}
+                continue
+            try:
+                date_fin = _parse_date_fin(data.get("date_fin"))
+            except (AttributeError, ValueError):
+                resultats[index] = {"index": index, "status": 400, "error": "date_fin invalide"}
+                continue
+            candidat = {
+                "id": uuid.uuid4(),
+                "client_id": user_id,
+                "seance_etude_id": data.get("seance_etude_id"),
+                "titre": data.get("titre"),
+                "description": data.get("description"),
+                "statut": data.get("statut"),
+                "importance": data.get("importance"),
+                "date_creation": maintenant,
+                "date_fin": date_fin,
+                "est_terminee": data.get("est_terminee", False),
+                "duree_estimee": data.get("duree_estimee"),
+                "duree_reelle": data.get("duree_reelle"),
+                "priorite": data.get("priorite"),
+            }
+            invalide = _convertir_champs(candidat)
+            if invalide:
+                resultats[index] = {"index": index, "status": 400, "error": f"{invalide} invalide"}
+                continue
+            candidats[index] = candidat
+
+        if not candidats:
+            return resultats
+
+        try:
+            verrouiller_client_actif(user_id)
+            # Séances invalides ou d'un autre client : refusées élément par élément, avant l'INSERT
+            seances = _seances_acceptees(
+                user_id, {i: c["seance_etude_id"] for i, c in candidats.items()}, resultats
+            )
+            positions = sorted(seances)
+            lignes = [dict(candidats[i], seance_etude_id=seances[i]) for i in positions]
+            resultats_crees = []
+            if lignes:
+                taches = db.session.scalars(
+                    insert(Tache).returning(Tache, sort_by_parameter_order=True),
+                    lignes
+                ).all()
+                resultats_crees = [t.to_dict() for t in taches]
+                CompteurDAO.taches_modifiees([(t.client_id, None, etat_tache(t)) for t in taches])
+                VersionDAO.bump([t.client_id for t in taches], TACHE)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        for index, tache in zip(positions, resultats_crees):
+            resultats[index] = {"index": index, "status": 201, "tache": tache}
+
+        return resultats
+
+    @staticmethod
+    def update_many(user_id, items):
+        """
+        Met à jour plusieurs tâches accessibles à user_id.
+        Les éléments modifiant les mêmes champs sont regroupés en un seul
+        UPDATE ... FROM (VALUES ...) ... RETURNING.
+        """
+        resultats = [None] * len(items)
+        candidats = {}
+        ids_vus = set()
+
+        for index, data in enumerate(items):
+            try:
+                tache_id = uuid.UUID(str(data.get("id")))
+            except (AttributeError, ValueError):
+                resultats[index] = {"index": index, "status": 400, "error": "id invalide"}
+                continue
+            if tache_id in ids_vus:
+                resultats[index] = {"index": index, "status": 400, "error": "id en double dans le lot"}
+                continue
+            champs = tuple(c for c in CHAMPS_MODIFIABLES if c in data)
+            if not champs:
+                resultats[index] = {"index": index, "status": 400, "error": "Aucun champ à modifier"}
+                continue
+            ligne = dict((c, data[c]) for c in champs)
+            if "date_fin" in ligne:
+                try:
+                    ligne["date_fin"] = _parse_date_fin(ligne["date_fin"])
+                except (AttributeError, ValueError):
+                    resultats[index] = {"index": index, "status": 400, "error": "date_fin invalide"}
+                    continue
+            invalide = _convertir_champs(ligne)
+            if invalide:
+                resultats[index] = {"index": index, "status": 400, "error": f"{invalide} invalide"}
+                continue
+            ids_vus.add(tache_id)
+            ligne["id"] = tache_id
+            candidats[index] = (champs, ligne)
+
+        if not candidats:
+            return resultats
+
+        try:
+            # Séances invalides ou d'un autre client : refusées élément par élément, avant l'UPDATE
+            demandes = {i: l["seance_etude_id"] for i, (_, l) in candidats.items() if "seance_etude_id" in l}
+            seances = _seances_acceptees(user_id, demandes, resultats)
+            groupes = {}
+            for index, (champs, ligne) in candidats.items():
+                if index in demandes:
+                    if index not in seances:
+                        ids_vus.discard(ligne["id"])
+                        continue
+                    ligne["seance_etude_id"] = seances[index]
+                groupes.setdefault(champs, []).append((index, ligne))
+
+            # Valeurs avant modification, nécessaires aux compteurs si statut/est_terminee changent
+            avant = {}
+            if any({"statut", "est_terminee"} & set(champs) for champs in groupes):
+                avant = {t.id: t for t in db.session.execute(
+                    select(Tache.id, Tache.client_id, Tache.statut, Tache.est_terminee, Tache.date_creation)
+                    .where(Tache.id == any_(literal(list(ids_vus), ARRAY(UUID(as_uuid=True)))), _owned_by(user_id))
+                    .with_for_update()
+                )}
+            changements = []
+            clients_modifies = set()
+
+            for champs, membres in groupes.items():
+                colonnes = [column("id", UUID(as_uuid=True))] + [
+                    column(c, Tache.__table__.c[c].type) for c in champs
+                ]
+                v = values(*colonnes, name="v").data(
+                    [tuple(ligne[c.name] for c in colonnes) for _, ligne in membres]
+                )
+                # CAST : PostgreSQL type une colonne VALUES d'après ses littéraux (NULL seul = text)
+                stmt = (
+                    update(Tache)
+                    .where(Tache.id == v.c.id, _owned_by(user_id))
+                    .values({c: cast(v.c[c], Tache.__table__.c[c].type) for c in champs})
+                    .returning(Tache)
+                    .execution_options(synchronize_session=False)
+                )
+                modifiees = {}
+                for t in db.session.scalars(stmt):
+                    modifiees[t.id] = t.to_dict()
+                    clients_modifies.add(t.client_id)
+                    if t.id in avant:
+                        changements.append((t.client_id, etat_tache(avant[t.id]), etat_tache(t)))
+                for index, ligne in membres:
+                    tache = modifiees.get(ligne["id"])
+                    if tache:
+                        resultats[index] = {"index": index, "status": 200, "tache": tache}
+                    else:
+                        resultats[index] = {"index": index, "status": 404, "error": "Tâche introuvable ou accès refusé"}
+            CompteurDAO.taches_modifiees([c for c in changements if c[1] != c[2]])
+            VersionDAO.bump(clients_modifies, TACHE)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return resultats
+
+    @staticmethod
+    def delete_many(user_id, ids):
+        # Supprime en un seul DELETE ... WHERE id = ANY(...) RETURNING les tâches accessibles à user_id
+        resultats = [None] * len(ids)
+        valides = {}
+
+        for index, valeur in enumerate(ids):
+            try:
+                valides[index] = uuid.UUID(str(valeur))
+            except ValueError:
+                resultats[index] = {"index": index, "status": 400, "error": "id invalide"}
+
+        if valides:
+            try:
+                stmt = (
+                    delete(Tache)
+                    .where(Tache.id == any_(literal(list(set(valides.values())), ARRAY(UUID(as_uuid=True)))),
+                           _owned_by(user_id))
+                    .returning(Tache.id, Tache.client_id, Tache.statut, Tache.est_terminee, Tache.date_creation)
+                    .execution_options(synchronize_session=False)
+                )
+                lignes = db.session.execute(stmt).all()
+                supprimees = {t.id for t in lignes}
+                CompteurDAO.taches_modifiees([(t.client_id, etat_tache(t), None) for t in lignes])
+                VersionDAO.bump([t.client_id for t in lignes], TACHE)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            for index, tache_id in valides.items():
+                if tache_id in supprimees:
+                    resultats[index] = {"index": index, "status": 200, "id": str(tache_id)}
+                else:
+                    resultats[index] = {"index": index, "status": 404, "error": "Tâche introuvable ou accès refusé"}
+
+        return resultats
@@ -0,0 +1,58 @@
+# dao/version_dao.py
+import hashlib
+import time
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from database import db
+from models.donnees_version import DonneesVersion
+
+TACHE = "tache"
+SEANCE = "seance"
+STATISTIQUE = "statistique"
+
+
+class VersionDAO:
+    """
+    Versions des données par (client, domaine), base des ETag des listes.
+
+    bump() est appelé dans la transaction de l'écriture, avant le commit : la
+    nouvelle version devient visible en même temps que les données. Une ligne
+    créée part de l'horloge (microsecondes) plutôt que de 1, pour ne jamais
+    réutiliser une version déjà servie si la ligne a été perdue.
+    """
+
+    @staticmethod
+    def bump(client_ids, domaine):
+        # Incrémente la version de chaque client (ordre fixe des verrous entre transactions)
+        ids = sorted({uuid.UUID(str(c)) for c in client_ids if c is not None})
+        if not ids:
+            return
+        stmt = insert(DonneesVersion).values([
+            {"client_id": client_id, "domaine": domaine, "version": time.time_ns() // 1000}
+            for client_id in ids
+        ])
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=["client_id", "domaine"],
+            set_={"version": DonneesVersion.version + 1}
+        ))
+
+    @staticmethod
+    def get(client_id, domaine):
+        # Version courante (0 si aucune écriture n'a encore été enregistrée) : une lecture par clé primaire
+        version = db.session.scalar(
+            select(DonneesVersion.version).where(
+                DonneesVersion.client_id == uuid.UUID(str(client_id)),
+                DonneesVersion.domaine == domaine
+            )
+        )
+        return version or 0
+
+    @staticmethod
+    def etag(client_id, domaine, variante=""):
+        # ETag fort : client, domaine, version et variante de la représentation (filtres, page...)
+        version = VersionDAO.get(client_id, domaine)
+        cle = f"{domaine}:{uuid.UUID(str(client_id))}:{version}:{variante}"
+        return hashlib.sha1(cle.encode()).hexdigest()
@@ -1,11 +1,19 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from config import Config
+from pool import engine_options, instrument_engine
+from common.tracing import instrument_sqlalchemy
 
 db = SQLAlchemy()
 
 def init_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(Config)
     db.init_app(app)
+
+    # Le moteur est créé ici (sans ouvrir de connexion) pour y attacher les écouteurs du pool
+    with app.app_context():
+        instrument_engine(db.engine, Config)
+        instrument_sqlalchemy(db.engine)
     return app
@@ -0,0 +1,120 @@
+# hashing.py
+"""
+Hachage bcrypt des mots de passe dans un pool de threads dédié et borné.
+
+bcrypt est volontairement coûteux en CPU : exécuté directement sur les threads
+des requêtes, un afflux de connexions (fin de cours) occupait tous les workers
+du DAO et les lectures de tâches et de séances attendaient derrière. Ici :
+
+- au plus BCRYPT_WORKERS hachages simultanés, le reste du CPU reste aux requêtes
+  de données (bcrypt libère le GIL pendant le calcul)
+- au plus BCRYPT_QUEUE_MAX hachages en attente ; au-delà HashPoolSature
+  (503 côté routes) au lieu d'une file qui grandit sans fin
+- BCRYPT_ROUNDS fixe le coût des nouveaux hashes ; un hash stocké avec un autre
+  coût est recalculé à la connexion suivante réussie (needs_rehash)
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from common.tracing import span
+from config import Config
+
+
+class HashPoolSature(RuntimeError):
+    """File d'attente du pool de hachage pleine."""
+
+
+def hash_rounds(stored_hash):
+    # "$2b$12$..." -> 12 ; None si le format n'est pas reconnu
+    parts = stored_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """Pool de hachage : hash / verify exécutés sur des threads dédiés (thread-safe)."""
+
+    def __init__(self, workers, rounds, queue_max):
+        self.workers = workers
+        self.rounds = rounds
+        self.queue_max = queue_max
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._places = threading.BoundedSemaphore(workers + queue_max)
+        self._lock = threading.Lock()
+        self.en_attente = 0
+        self.en_cours = 0
+        self.max_en_attente = 0
+        self.termines = 0
+        self.rejets = 0
+        self.rehash = 0
+        self.attente_ms = 0.0
+        self.calcul_ms = 0.0
+
+    def _run(self, fn):
+        # Exécute fn() sur le pool et attend son résultat (le thread de la requête ne calcule pas)
+        if not self._places.acquire(blocking=False):
+            with self._lock:
+                self.rejets += 1
+            raise HashPoolSature("Trop de hachages de mots de passe en attente")
+        soumis = time.perf_counter()
+        with self._lock:
+            self.en_attente += 1
+            self.max_en_attente = max(self.max_en_attente, self.en_attente)
+
+        def task():
+            debut = time.perf_counter()
+            with self._lock:
+                self.en_attente -= 1
+                self.en_cours += 1
+                self.attente_ms += (debut - soumis) * 1000
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self.en_cours -= 1
+                    self.termines += 1
+                    self.calcul_ms += (time.perf_counter() - debut) * 1000
+                self._places.release()
+
+        with span("bcrypt"):
+            return self._executor.submit(task).result()
+
+    def hash(self, password):
+        # Nouveau hash au coût BCRYPT_ROUNDS
+        return self._run(
+            lambda: bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=self.rounds)).decode()
+        )
+
+    def verify(self, stored_hash, password):
+        # Vérifie si le mot de passe correspond au hash enregistré
+        return self._run(lambda: bcrypt.checkpw(password.encode(), stored_hash.encode()))
+
+    def needs_rehash(self, stored_hash):
+        return hash_rounds(stored_hash) != self.rounds
+
+    def count_rehash(self):
+        with self._lock:
+            self.rehash += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "queue_max": self.queue_max,
+                "en_attente": self.en_attente,
+                "en_cours": self.en_cours,
+                "max_en_attente": self.max_en_attente,
+                "termines": self.termines,
+                "rejets": self.rejets,
+                "rehash": self.rehash,
+                "attente_moyenne_ms": round(self.attente_ms / self.termines, 3) if self.termines else 0.0,
+                "calcul_moyen_ms": round(self.calcul_ms / self.termines, 3) if self.termines else 0.0,
+            }
+
+
+password_hasher = PasswordHasher(Config.BCRYPT_WORKERS, Config.BCRYPT_ROUNDS, Config.BCRYPT_QUEUE_MAX)
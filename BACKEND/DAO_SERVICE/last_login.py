@@ -0,0 +1,133 @@
+# last_login.py
+"""
+Enregistrement différé (write-behind) de la dernière connexion des clients.
+
+Mettre à jour client.derniere_connexion dans AuthDAO.login ajouterait une
+transaction d'écriture à chaque connexion. Les connexions réussies sont
+notées en mémoire (la plus récente par client) et écrites par lots : un seul
+UPDATE ... FROM (VALUES ...) toutes les LAST_LOGIN_FLUSH_S secondes, ou dès
+LAST_LOGIN_FLUSH_SIZE clients en attente, et une dernière fois à l'arrêt du
+processus. En cas d'échec, le lot est remis en attente pour l'écriture suivante.
+
+Un arrêt brutal (kill -9) perd au plus les connexions de l'intervalle en cours :
+la donnée est informative, pas une piste d'audit.
+"""
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import DateTime, column, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from cache import client_key, profile_cache
+from config import Config
+from database import db
+from models.client import Client
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginRecorder:
+    """Tampon {client_id: dernière connexion} vidé par lots dans la table client (thread-safe)."""
+
+    def __init__(self, interval, max_pending):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.app = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self.enregistrees = 0
+        self.ecrites = 0
+        self.lots = 0
+        self.erreurs = 0
+
+    def init_app(self, app):
+        # Démarre l'écriture périodique et la dernière écriture à l'arrêt (intervalle 0 : désactivé)
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self.app = app
+        self._thread = threading.Thread(target=self._run, name="last-login", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def record(self, client_id, moment=None):
+        # Note une connexion réussie (aucun accès à la base) ; sans init_app, rien n'est noté
+        if self.app is None:
+            return
+        moment = moment or datetime.utcnow()
+        with self._lock:
+            courant = self._pending.get(client_id)
+            if courant is None or courant < moment:
+                self._pending[client_id] = moment
+            self.enregistrees += 1
+            plein = len(self._pending) >= self.max_pending
+        if plein:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        # Écrit les connexions en attente en un seul UPDATE ; retourne le nombre de clients écrits
+        if self.app is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                lot, self._pending = self._pending, {}
+            if not lot:
+                return 0
+            try:
+                with self.app.app_context():
+                    self._write(lot)
+            except Exception:
+                logger.warning("Écriture des dernières connexions impossible", exc_info=True)
+                with self._lock:
+                    self.erreurs += 1
+                    for client_id, moment in lot.items():
+                        courant = self._pending.get(client_id)
+                        if courant is None or courant < moment:
+                            self._pending[client_id] = moment
+                return 0
+            for client_id in lot:
+                profile_cache.invalidate(client_key(client_id))
+            with self._lock:
+                self.ecrites += len(lot)
+                self.lots += 1
+            return len(lot)
+
+    @staticmethod
+    def _write(lot):
+        # UPDATE client SET derniere_connexion = v.moment FROM (VALUES ...) v WHERE client.id = v.id
+        # (une date plus ancienne, écrite par un autre processus dans le désordre, ne remplace pas la plus récente)
+        lignes = values(
+            column("id", UUID(as_uuid=True)), column("moment", DateTime()), name="v"
+        ).data(sorted(lot.items(), key=lambda item: str(item[0])))
+        db.session.execute(
+            update(Client)
+            .where(Client.id == lignes.c.id)
+            .where((Client.derniere_connexion.is_(None)) | (Client.derniere_connexion < lignes.c.moment))
+            .values(derniere_connexion=lignes.c.moment)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "en_attente": len(self._pending),
+                "enregistrees": self.enregistrees,
+                "ecrites": self.ecrites,
+                "lots": self.lots,
+                "erreurs": self.erreurs,
+                "intervalle_s": self.interval,
+            }
+
+
+last_logins = LastLoginRecorder(Config.LAST_LOGIN_FLUSH_S, Config.LAST_LOGIN_FLUSH_SIZE)
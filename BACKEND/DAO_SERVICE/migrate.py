@@ -0,0 +1,38 @@
+import sys
+
+from database import init_app, db
+import migrations
+
+USAGE = "Usage : python migrate.py [upgrade [version] | downgrade <version> | status]"
+
+
+def main(argv):
+    command = argv[0] if argv else "upgrade"
+    app = init_app()
+
+    with app.app_context():
+        engine = db.engine
+
+        if command == "upgrade":
+            target = int(argv[1]) if len(argv) > 1 else None
+            applied = migrations.upgrade(engine, target)
+            for m in applied:
+                print(f"APPLIQUEE : {m.version:04d} {m.description}")
+            if not applied:
+                print("Schéma déjà à jour")
+        elif command == "downgrade" and len(argv) > 1:
+            for m in migrations.downgrade(engine, int(argv[1])):
+                print(f"ANNULEE : {m.version:04d} {m.description}")
+        elif command == "status":
+            done = migrations.applied_versions(engine)
+            for m in migrations.discover():
+                etat = "x" if m.version in done else " "
+                print(f"[{etat}] {m.version:04d} {m.description}")
+        else:
+            print(USAGE)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
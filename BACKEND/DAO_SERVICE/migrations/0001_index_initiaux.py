@@ -0,0 +1,30 @@
+# migrations/0001_index_initiaux.py
+from migrations import create_index_concurrently, drop_index_concurrently
+
+DESCRIPTION = "Index des recherches par client, séance, échéance et email"
+TRANSACTIONAL = False
+
+INDEXES = [
+    # Liste paginée des tâches d'un client : WHERE client_id = ? ORDER BY date_creation DESC, id DESC
+    ("ix_tache_client_date_creation", "ON tache (client_id, date_creation DESC, id DESC)", False),
+    # Tâches d'une séance ; la majorité des tâches n'ont pas de séance
+    ("ix_tache_seance_etude", "ON tache (seance_etude_id) WHERE seance_etude_id IS NOT NULL", False),
+    # Tâches ouvertes par échéance (filtres date_fin, tâches en retard)
+    ("ix_tache_client_date_fin_ouverte", "ON tache (client_id, date_fin) WHERE est_terminee IS NOT TRUE", False),
+    # Historique paginé des séances d'un client
+    ("ix_seance_etude_client_date_debut", "ON seance_etude (client_id, date_debut DESC, id DESC)", False),
+    # Derniers snapshots statistiques d'un client
+    ("ix_statistique_snapshot_client_date", "ON statistique_snapshot (client_id, date_capture DESC)", False),
+    # Unicité de l'email sans tenir compte de la casse (remplace le SELECT préalable à l'inscription)
+    ("ux_client_email_lower", "ON client (lower(email))", True),
+]
+
+
+def upgrade(conn):
+    for name, ddl, unique in INDEXES:
+        create_index_concurrently(conn, name, ddl, unique=unique)
+
+
+def downgrade(conn):
+    for name, _, _ in reversed(INDEXES):
+        drop_index_concurrently(conn, name)
@@ -0,0 +1,28 @@
+# migrations/0002_statistique_compteur.py
+from sqlalchemy import text
+
+DESCRIPTION = "Table des compteurs statistiques par client"
+
+
+def upgrade(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS statistique_compteur (
+            client_id UUID PRIMARY KEY REFERENCES client (id) ON DELETE CASCADE,
+            nbre_taches_total INTEGER NOT NULL DEFAULT 0,
+            nbre_taches_completees INTEGER NOT NULL DEFAULT 0,
+            taches_par_statut JSONB NOT NULL DEFAULT '{}',
+            premiere_date_tache TIMESTAMP,
+            nbre_seances INTEGER NOT NULL DEFAULT 0,
+            nbre_seances_completees INTEGER NOT NULL DEFAULT 0,
+            nbre_pomodoros INTEGER NOT NULL DEFAULT 0,
+            jours_actifs DATE[] NOT NULL DEFAULT '{}',
+            serie_jours_actifs INTEGER NOT NULL DEFAULT 0,
+            derniere_date_active TIMESTAMP,
+            seances_par_jour_semaine JSONB NOT NULL DEFAULT '{}',
+            date_mise_a_jour TIMESTAMP
+        )
+    """))
+
+
+def downgrade(conn):
+    conn.execute(text("DROP TABLE IF EXISTS statistique_compteur"))
@@ -0,0 +1,19 @@
+# migrations/0003_donnees_version.py
+from sqlalchemy import text
+
+DESCRIPTION = "Version des données par client et domaine (ETag des listes)"
+
+
+def upgrade(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS donnees_version (
+            client_id UUID NOT NULL REFERENCES client (id) ON DELETE CASCADE,
+            domaine TEXT NOT NULL,
+            version BIGINT NOT NULL,
+            PRIMARY KEY (client_id, domaine)
+        )
+    """))
+
+
+def downgrade(conn):
+    conn.execute(text("DROP TABLE IF EXISTS donnees_version"))
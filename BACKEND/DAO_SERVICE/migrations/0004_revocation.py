@@ -0,0 +1,22 @@
+# migrations/0004_revocation.py
+from sqlalchemy import text
+
+DESCRIPTION = "Révocations des jetons JWT (comptes désactivés ou supprimés, déconnexions)"
+
+
+def upgrade(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS revocation (
+            seq BIGSERIAL PRIMARY KEY,
+            type TEXT NOT NULL,
+            valeur TEXT NOT NULL,
+            revoque_le TIMESTAMPTZ NOT NULL DEFAULT now(),
+            expire_le TIMESTAMPTZ NOT NULL
+        )
+    """))
+    # Purge des révocations dont tous les jetons concernés ont expiré
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_revocation_expire_le ON revocation (expire_le)"))
+
+
+def downgrade(conn):
+    conn.execute(text("DROP TABLE IF EXISTS revocation"))
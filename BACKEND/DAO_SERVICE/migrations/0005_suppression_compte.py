@@ -0,0 +1,31 @@
+# migrations/0005_suppression_compte.py
+from sqlalchemy import text
+
+DESCRIPTION = "Suppression de compte en arrière-plan (marque client.supprime_le, suivi des suppressions)"
+
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE client ADD COLUMN IF NOT EXISTS supprime_le TIMESTAMP"))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS suppression_compte (
+            id UUID PRIMARY KEY,
+            client_id UUID NOT NULL,
+            statut TEXT NOT NULL,
+            etape TEXT,
+            lignes_supprimees BIGINT NOT NULL DEFAULT 0,
+            erreur TEXT,
+            cree_le TIMESTAMP NOT NULL,
+            mis_a_jour_le TIMESTAMP NOT NULL,
+            termine_le TIMESTAMP
+        )
+    """))
+    # Suppressions à reprendre au démarrage du DAO
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_suppression_compte_a_reprendre ON suppression_compte (cree_le)"
+        " WHERE statut IN ('en_attente', 'en_cours')"
+    ))
+
+
+def downgrade(conn):
+    conn.execute(text("DROP TABLE IF EXISTS suppression_compte"))
+    conn.execute(text("ALTER TABLE client DROP COLUMN IF EXISTS supprime_le"))
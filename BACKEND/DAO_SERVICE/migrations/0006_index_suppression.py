@@ -0,0 +1,25 @@
+# migrations/0006_index_suppression.py
+from migrations import create_index_concurrently, drop_index_concurrently
+
+DESCRIPTION = "Index des lignes dépendantes d'un client (suppression de compte par lots)"
+TRANSACTIONAL = False
+
+INDEXES = [
+    # Chaque lot de la suppression d'un compte : SELECT id ... WHERE client_id = ? LIMIT n
+    ("ix_journal_etude_client", "ON journal_etude (client_id)", False),
+    ("ix_note_etude_journal", "ON note_etude (journal_etude_id)", False),
+    ("ix_notification_client", "ON notification (client_id)", False),
+    ("ix_preference_client", "ON preference (client_id)", False),
+    # Paramètres Pomodoro encore utilisés par une autre séance
+    ("ix_seance_etude_pomodoro", "ON seance_etude (pomodoro_id) WHERE pomodoro_id IS NOT NULL", False),
+]
+
+
+def upgrade(conn):
+    for name, ddl, unique in INDEXES:
+        create_index_concurrently(conn, name, ddl, unique=unique)
+
+
+def downgrade(conn):
+    for name, _, _ in reversed(INDEXES):
+        drop_index_concurrently(conn, name)
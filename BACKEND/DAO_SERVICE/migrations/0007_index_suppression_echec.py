@@ -0,0 +1,25 @@
+# migrations/0007_index_suppression_echec.py
+from migrations import create_index_concurrently, drop_index_concurrently
+
+DESCRIPTION = "Suppressions de compte en échec relancées : index des suppressions à réserver"
+TRANSACTIONAL = False
+
+# SuppressionDAO.reserver : suppressions en attente, en cours (bail expiré) ou en échec (à relancer)
+A_RESERVER = (
+    "ix_suppression_compte_a_reserver",
+    "ON suppression_compte (cree_le) WHERE statut IN ('en_attente', 'en_cours', 'echec')",
+)
+A_REPRENDRE = (
+    "ix_suppression_compte_a_reprendre",
+    "ON suppression_compte (cree_le) WHERE statut IN ('en_attente', 'en_cours')",
+)
+
+
+def upgrade(conn):
+    create_index_concurrently(conn, *A_RESERVER)
+    drop_index_concurrently(conn, A_REPRENDRE[0])
+
+
+def downgrade(conn):
+    create_index_concurrently(conn, *A_REPRENDRE)
+    drop_index_concurrently(conn, A_RESERVER[0])
@@ -0,0 +1,127 @@
+# migrations/__init__.py
+"""
+Migrations versionnées du schéma du DAO_SERVICE.
+
+Chaque migration est un module ``NNNN_description.py`` de ce paquet qui définit
+``upgrade(conn)`` et ``downgrade(conn)``. Les versions appliquées sont
+enregistrées dans la table ``schema_version``. Une migration qui crée des index
+avec ``CONCURRENTLY`` déclare ``TRANSACTIONAL = False`` : elle est alors exécutée
+en autocommit (PostgreSQL refuse ``CREATE INDEX CONCURRENTLY`` dans une transaction).
+"""
+import importlib
+import pkgutil
+import re
+from datetime import datetime
+
+from sqlalchemy import text
+
+SCHEMA_TABLE = "schema_version"
+_MODULE_PATTERN = re.compile(r"^(\d{4})_\w+$")
+
+
+class Migration:
+    def __init__(self, version, name, module):
+        self.version = version
+        self.name = name
+        self.module = module
+
+    @property
+    def transactional(self):
+        return getattr(self.module, "TRANSACTIONAL", True)
+
+    @property
+    def description(self):
+        return getattr(self.module, "DESCRIPTION", self.name)
+
+
+def discover():
+    # Retourne toutes les migrations du paquet, triées par version
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_PATTERN.match(info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            migrations.append(Migration(int(match.group(1)), info.name, module))
+    migrations.sort(key=lambda m: m.version)
+    return migrations
+
+
+def _ensure_schema_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} ("
+            " version INTEGER PRIMARY KEY,"
+            " nom TEXT NOT NULL,"
+            " applique_le TIMESTAMP NOT NULL)"
+        ))
+
+
+def applied_versions(engine):
+    # Versions déjà appliquées sur la base
+    _ensure_schema_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text(f"SELECT version FROM {SCHEMA_TABLE}"))}
+
+
+def _run(engine, migration, direction):
+    step = getattr(migration.module, direction)
+    if direction == "upgrade":
+        record = text(f"INSERT INTO {SCHEMA_TABLE} (version, nom, applique_le) VALUES (:v, :n, :d)")
+        params = {"v": migration.version, "n": migration.name, "d": datetime.utcnow()}
+    else:
+        record = text(f"DELETE FROM {SCHEMA_TABLE} WHERE version = :v")
+        params = {"v": migration.version}
+
+    if migration.transactional:
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(record, params)
+    else:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            step(conn)
+            conn.execute(record, params)
+
+
+def upgrade(engine, target=None):
+    # Applique dans l'ordre les migrations manquantes jusqu'à target (incluse)
+    done = applied_versions(engine)
+    applied = []
+    for migration in discover():
+        if target is not None and migration.version > target:
+            break
+        if migration.version not in done:
+            _run(engine, migration, "upgrade")
+            applied.append(migration)
+    return applied
+
+
+def downgrade(engine, target):
+    # Annule, de la plus récente à la plus ancienne, les migrations dont la version est > target
+    done = applied_versions(engine)
+    reverted = []
+    for migration in reversed(discover()):
+        if migration.version > target and migration.version in done:
+            _run(engine, migration, "downgrade")
+            reverted.append(migration)
+    return reverted
+
+
+def create_index_concurrently(conn, name, ddl, unique=False):
+    """
+    Crée un index avec CONCURRENTLY (ddl = le reste de l'instruction après le nom).
+
+    Un CREATE INDEX CONCURRENTLY interrompu laisse un index INVALID que
+    IF NOT EXISTS ignorerait ; il est supprimé avant d'être recréé.
+    """
+    invalid = conn.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} {ddl}"))
+
+
+def drop_index_concurrently(conn, name):
+    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
@@ -1,6 +1,6 @@
 from database import db
 from sqlalchemy.dialects.postgresql import UUID #unique ids
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, func
 import uuid
 
 class Client(db.Model):
@@ -12,4 +12,11 @@ class Client(db.Model):
     mot_de_passe = db.Column(db.Text)
     role = db.Column(db.Text)
     actif = db.Column(db.Boolean)
-    derniere_connexion = db.Column(DateTime)
\ No newline at end of file
+    derniere_connexion = db.Column(DateTime)
+    # Compte en cours de suppression (migrations/0005_suppression_compte.py) : invisible aux lectures
+    supprime_le = db.Column(DateTime)
+
+    # Email unique sans tenir compte de la casse (migrations/0001_index_initiaux.py)
+    __table_args__ = (
+        db.Index("ux_client_email_lower", func.lower(email), unique=True),
+    )
@@ -0,0 +1,11 @@
+from database import db
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class DonneesVersion(db.Model):
+    """Version des données d'un client pour un domaine (tache, seance, statistique), incrémentée à chaque écriture."""
+    __tablename__ = "donnees_version"
+
+    client_id = db.Column(UUID(as_uuid=True), db.ForeignKey("client.id", ondelete="CASCADE"), primary_key=True)
+    domaine = db.Column(db.Text, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
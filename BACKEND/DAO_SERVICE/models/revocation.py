@@ -0,0 +1,16 @@
+from database import db
+from sqlalchemy import DateTime, func
+
+
+class Revocation(db.Model):
+    """
+    Révocation publiée aux gateways : type "client" (jetons émis avant revoque_le
+    pour ce client) ou "jeton" (un jti). seq croissant sert à la synchronisation par delta.
+    """
+    __tablename__ = "revocation"
+
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    type = db.Column(db.Text, nullable=False)
+    valeur = db.Column(db.Text, nullable=False)
+    revoque_le = db.Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expire_le = db.Column(DateTime(timezone=True), nullable=False, index=True)
@@ -20,4 +20,39 @@ class SeanceEtude(db.Model):
 
     pomodoro = db.relationship("PomodoroParametre", backref="seances", uselist=False)
 
+    # Index créé par migrations/0001_index_initiaux.py
+    __table_args__ = (
+        db.Index("ix_seance_etude_client_date_debut", client_id, date_debut.desc(), id.desc()),
+    )
 
+    def to_dict(self):
+        """Converts the SeanceEtude object to a dictionary."""
+        return {
+            "id": str(self.id),
+            "client_id": str(self.client_id),
+            "type_seance": self.type_seance,
+            "nom": self.nom,
+            "date_debut": self.date_debut.isoformat() if self.date_debut else None,
+            "date_fin": self.date_fin.isoformat() if self.date_fin else None,
+            "statut": self.statut,
+            "est_complete": self.est_complete,
+            "interruptions": self.interruptions,
+            "nbre_pomodoro_effectues": self.nbre_pomodoro_effectues,
+            "pomodoro_id": str(self.pomodoro_id) if self.pomodoro_id else None
+        }
+
+    def to_json_row(self):
+        """Same fields as to_dict(), but UUID/datetime values are left to the JSON encoder (see streaming.py)."""
+        return {
+            "id": self.id,
+            "client_id": self.client_id,
+            "type_seance": self.type_seance,
+            "nom": self.nom,
+            "date_debut": self.date_debut,
+            "date_fin": self.date_fin,
+            "statut": self.statut,
+            "est_complete": self.est_complete,
+            "interruptions": self.interruptions,
+            "nbre_pomodoro_effectues": self.nbre_pomodoro_effectues,
+            "pomodoro_id": self.pomodoro_id
+        }
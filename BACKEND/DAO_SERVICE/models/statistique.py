@@ -17,3 +17,21 @@ class StatistiqueSnapshot(db.Model):
     focus_score = db.Column(db.Float)
     meilleur_jour = db.Column(db.Text)
     activite_par_jour_semaine = db.Column(JSONB)
+
+    def to_json_row(self):
+        """Fields returned by the snapshot history, datetime left to the JSON encoder (see streaming.py)."""
+        return {
+            "date_capture": self.date_capture,
+            "taux_completion_taches": self.taux_completion_taches,
+            "focus_score": self.focus_score,
+            "meilleur_jour": self.meilleur_jour,
+            "nbre_taches_completees": self.nbre_taches_completees,
+            "nbre_jours_consecutifs_actifs": self.nbre_jours_consecutifs_actifs,
+            "nbre_taches_retard": self.nbre_taches_retard,
+            "activite_par_jour_semaine": self.activite_par_jour_semaine
+        }
+
+    # Index créé par migrations/0001_index_initiaux.py
+    __table_args__ = (
+        db.Index("ix_statistique_snapshot_client_date", client_id, date_capture.desc()),
+    )
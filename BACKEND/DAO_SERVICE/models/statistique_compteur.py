@@ -0,0 +1,24 @@
+from database import db
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+
+
+class StatistiqueCompteur(db.Model):
+    """Compteurs statistiques d'un client, tenus à jour à chaque écriture de tâche ou de séance."""
+    __tablename__ = "statistique_compteur"
+
+    client_id = db.Column(UUID(as_uuid=True), db.ForeignKey("client.id", ondelete="CASCADE"), primary_key=True)
+
+    nbre_taches_total = db.Column(db.Integer, nullable=False, default=0)
+    nbre_taches_completees = db.Column(db.Integer, nullable=False, default=0)
+    taches_par_statut = db.Column(JSONB, nullable=False, default=dict)
+    premiere_date_tache = db.Column(db.DateTime)
+
+    nbre_seances = db.Column(db.Integer, nullable=False, default=0)
+    nbre_seances_completees = db.Column(db.Integer, nullable=False, default=0)
+    nbre_pomodoros = db.Column(db.Integer, nullable=False, default=0)
+    jours_actifs = db.Column(ARRAY(db.Date), nullable=False, default=list)
+    serie_jours_actifs = db.Column(db.Integer, nullable=False, default=0)
+    derniere_date_active = db.Column(db.DateTime)
+    seances_par_jour_semaine = db.Column(JSONB, nullable=False, default=dict)
+
+    date_mise_a_jour = db.Column(db.DateTime)
@@ -0,0 +1,18 @@
+from database import db
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+
+class SuppressionCompte(db.Model):
+    """Suppression d'un compte en arrière-plan : étape en cours et lignes déjà supprimées."""
+    __tablename__ = "suppression_compte"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    client_id = db.Column(UUID(as_uuid=True), nullable=False)
+    statut = db.Column(db.Text, nullable=False)
+    etape = db.Column(db.Text)
+    lignes_supprimees = db.Column(db.BigInteger, nullable=False, default=0)
+    erreur = db.Column(db.Text)
+    cree_le = db.Column(db.DateTime, nullable=False)
+    mis_a_jour_le = db.Column(db.DateTime, nullable=False)
+    termine_le = db.Column(db.DateTime)
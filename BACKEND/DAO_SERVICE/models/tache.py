@@ -19,6 +19,15 @@ class Tache(db.Model):
     duree_reelle = db.Column(db.Integer)
     priorite = db.Column(db.Text)
 
+    # Index créés par migrations/0001_index_initiaux.py (déclarés ici pour garder le modèle à jour)
+    __table_args__ = (
+        db.Index("ix_tache_client_date_creation", client_id, date_creation.desc(), id.desc()),
+        db.Index("ix_tache_seance_etude", seance_etude_id,
+                 postgresql_where=seance_etude_id.isnot(None)),
+        db.Index("ix_tache_client_date_fin_ouverte", client_id, date_fin,
+                 postgresql_where=est_terminee.isnot(True)),
+    )
+
     def to_dict(self):
         """Converts the Tache object to a dictionary."""
         return {
@@ -35,3 +44,21 @@ class Tache(db.Model):
             'duree_reelle': self.duree_reelle,
             'priorite': self.priorite
         }
+
+    def to_json_row(self):
+        """Same fields as to_dict(), but UUID/datetime values are left to the JSON encoder (see streaming.py)."""
+        return {
+            'id': self.id,
+            # to_dict() renvoie str(None) == "None" pour une tâche sans séance : rendu conservé
+            'seance_etude_id': self.seance_etude_id if self.seance_etude_id is not None else "None",
+            'titre': self.titre,
+            'description': self.description,
+            'statut': self.statut,
+            'importance': self.importance,
+            'date_creation': self.date_creation,
+            'date_fin': self.date_fin,
+            'est_terminee': self.est_terminee,
+            'duree_estimee': self.duree_estimee,
+            'duree_reelle': self.duree_reelle,
+            'priorite': self.priorite
+        }
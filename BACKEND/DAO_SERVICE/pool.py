@@ -0,0 +1,140 @@
+# pool.py
+"""
+Pool de connexions PostgreSQL : options du moteur lues dans Config,
+statistiques d'utilisation et préchauffage au démarrage.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from common.tracing import record_span
+
+
+class PoolStats:
+    """Compteurs cumulés du pool (attente des connexions, créations, expirations)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0              # checkouts ayant attendu plus de wait_threshold_ms
+            self.timeouts = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.connects = 0
+            self.invalidations = 0
+
+    def record_checkout(self, wait_ms, threshold_ms):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if wait_ms > threshold_ms:
+                self.waits += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "attentes": self.waits,
+                "timeouts": self.timeouts,
+                "attente_moyenne_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "attente_max_ms": round(self.max_wait_ms, 3),
+                "connexions_ouvertes": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool qui mesure le temps passé à obtenir une connexion."""
+
+    wait_threshold_ms = 1.0
+
+    def _do_get(self):
+        debut = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record_timeout()
+            raise
+        finally:
+            attente_ms = (time.perf_counter() - debut) * 1000
+            pool_stats.record_checkout(attente_ms, self.wait_threshold_ms)
+            record_span("db-pool", attente_ms)
+
+
+def engine_options(config):
+    # Options de create_engine (SQLALCHEMY_ENGINE_OPTIONS) à partir de Config
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine, config):
+    # Compte les connexions et applique le statement_timeout à chaque nouvelle connexion
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_stats.record_connect()
+        if config.DB_STATEMENT_TIMEOUT_MS:
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET statement_timeout = {int(config.DB_STATEMENT_TIMEOUT_MS)}")
+            cursor.close()
+            # SET hors transaction explicite : on valide pour ne pas laisser la connexion en transaction
+            dbapi_connection.commit()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.record_invalidation()
+
+
+def warm_up(engine, count):
+    # Ouvre `count` connexions en même temps puis les rend au pool
+    connexions = []
+    try:
+        for _ in range(count):
+            connexions.append(engine.connect())
+    finally:
+        for connexion in connexions:
+            connexion.close()
+    return len(connexions)
+
+
+def pool_status(engine):
+    # État courant du pool et compteurs cumulés
+    pool = engine.pool
+    etat = {
+        "taille": pool.size(),
+        "disponibles": pool.checkedin(),
+        "utilisees": pool.checkedout(),
+        "debordement": max(0, pool.overflow()),
+        "debordement_max": getattr(pool, "_max_overflow", None),
+        "timeout_s": getattr(pool, "_timeout", None),
+    }
+    etat.update(pool_stats.snapshot())
+    return etat
@@ -0,0 +1,28 @@
+import sys
+
+from database import init_app, db
+from dao.compteur_dao import CompteurDAO
+from models.client import Client
+
+USAGE = "Usage : python rebuild_compteurs.py [client_id ...]  (tous les clients si aucun id)"
+
+
+def main(argv):
+    # Recalcule les compteurs statistiques depuis les tables (initialisation ou réparation)
+    if argv and argv[0] in ("-h", "--help"):
+        print(USAGE)
+        return 0
+    app = init_app()
+
+    with app.app_context():
+        client_ids = argv or [str(c) for c in db.session.scalars(db.select(Client.id))]
+        for client_id in client_ids:
+            # Un commit par client : les verrous ne sont pas gardés pendant tout le traitement
+            valeurs = CompteurDAO.reconstruire(client_id)
+            db.session.commit()
+            print(f"RECONSTRUIT : {client_id} ({valeurs['nbre_taches_total']} tâches, {valeurs['nbre_seances']} séances)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,26 @@
+import uuid
+
 from flask import Blueprint, request, jsonify
-from dao.auth_dao import AuthDAO
+from config import Config
+from dao.auth_dao import AuthDAO, EmailDejaUtilise
+from dao.lots import LotTropGrand, ids_demandes, reponse_lot
+from dao.revocation_dao import RevocationDAO
+from dao.suppression_dao import SuppressionDAO
+from hashing import HashPoolSature
+from common.rate_limit import AdmissionControl
 
 auth_bp = Blueprint('auth', __name__)
 
+# Connexions et inscriptions en excès refusées (429) avant toute lecture en base ou tout hachage
+admission = AdmissionControl.from_config(Config)
+
+@auth_bp.errorhandler(HashPoolSature)
+def hash_pool_sature(e):
+    # Pool de hachage saturé : le client réessaie plus tard, les autres requêtes ne sont pas bloquées
+    response = jsonify({"error": "Service d'authentification surchargé, réessayez"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 @auth_bp.route('/client/<client_id>', methods=['GET'])
 def get_client_by_id(client_id):
     client_data = AuthDAO.get_client_info(client_id)
@@ -10,7 +28,21 @@ def get_client_by_id(client_id):
         return jsonify(client_data), 200
     return jsonify({"error": "Client introuvable"}), 404
 
+@auth_bp.route('/client/batch/get', methods=['POST'])
+def get_clients_batch():
+    # Infos publiques de plusieurs clients en une seule requête (profils en cache réutilisés)
+    try:
+        ids, invalides = ids_demandes(request.get_json(silent=True), Config.BATCH_MAX_SIZE)
+    except LotTropGrand as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    clients = AuthDAO.get_clients_info(ids)
+    return jsonify(reponse_lot("clients", ids, clients, invalides, lambda info: info)), 200
+
 @auth_bp.route('/register', methods=['POST'])
+@admission.limit("register")
 def register():
     data = request.get_json()
     email = data.get('email')
@@ -38,6 +70,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@admission.limit("login")
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -102,7 +135,10 @@ def update_profile():
     prenom = data.get('prenom')
     email = data.get('email')
 
-    updated = AuthDAO.update_profile(client_id, nom, prenom, email)
+    try:
+        updated = AuthDAO.update_profile(client_id, nom, prenom, email)
+    except EmailDejaUtilise:
+        return jsonify({"error": "Email déjà utilisé"}), 400
     if updated:
         return jsonify({"message": "Profil mis à jour"}), 200
     return jsonify({"error": "Client introuvable"}), 404
@@ -131,11 +167,52 @@ def delete_account():
     if not client_id:
         return jsonify({"error": "ID requis"}), 400
 
-    success = AuthDAO.delete_account(client_id)
+    suppression = AuthDAO.delete_account(client_id)
 
-    if success is True:
-        return jsonify({"message": "Compte supprimé"}), 200
-    elif success is False:
+    if suppression is None:
         return jsonify({"error": "Client introuvable"}), 404
-    else:
-        return jsonify({"error": "Erreur interne"}), 500
\ No newline at end of file
+    # Compte désactivé tout de suite ; la progression se suit sur /auth/suppression/<id>
+    response = jsonify({
+        "message": "Suppression du compte en cours",
+        "suppression": SuppressionDAO.serialize(suppression)
+    })
+    response.headers["Location"] = f"/auth/suppression/{suppression.id}"
+    return response, 202
+
+
+@auth_bp.route('/suppression/<suppression_id>', methods=['GET'])
+def get_suppression(suppression_id):
+    # Progression d'une suppression de compte (étape, lignes supprimées, statut)
+    try:
+        suppression = SuppressionDAO.get(uuid.UUID(suppression_id))
+    except ValueError:
+        suppression = None
+    if suppression is None:
+        return jsonify({"error": "Suppression introuvable"}), 404
+    return jsonify(SuppressionDAO.serialize(suppression)), 200
+
+
+@auth_bp.route('/revocations', methods=['GET'])
+def get_revocations():
+    # Delta de la liste des révocations pour la synchronisation des gateways (?depuis=<dernier seq connu>)
+    depuis = request.args.get('depuis', 0, type=int)
+    revocations = RevocationDAO.since(depuis, Config.REVOCATION_DELTA_MAX)
+    return jsonify({
+        "revocations": [RevocationDAO.serialize(r) for r in revocations],
+        "seq": revocations[-1].seq if revocations else max(depuis, RevocationDAO.last_seq()),
+        "suite": len(revocations) == Config.REVOCATION_DELTA_MAX,
+    }), 200
+
+
+@auth_bp.route('/revoke-token', methods=['POST'])
+def revoke_token():
+    # Révoque un jeton (déconnexion) jusqu'à son expiration
+    data = request.get_json(silent=True) or {}
+    jti = data.get('jti')
+    exp = data.get('exp')
+
+    if not jti or not isinstance(exp, (int, float)):
+        return jsonify({"error": "jti et exp requis"}), 400
+
+    RevocationDAO.revoke_token(jti, exp)
+    return jsonify({"message": "Jeton révoqué"}), 201
@@ -0,0 +1,46 @@
+from flask import Blueprint, jsonify
+from database import db
+from pool import pool_status
+from cache import profile_cache
+from hashing import password_hasher
+from last_login import last_logins
+from routes.auth_routes import admission
+from account_deletion import account_deletions
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.route('/pool', methods=['GET'])
+def pool():
+    # Connexions utilisées/disponibles, débordement et temps d'attente du pool
+    return jsonify(pool_status(db.engine)), 200
+
+
+@health_bp.route('/cache', methods=['GET'])
+def cache():
+    # Taille, hits/misses et invalidations du cache des profils clients
+    return jsonify(profile_cache.stats()), 200
+
+
+@health_bp.route('/hashing', methods=['GET'])
+def hashing():
+    # File d'attente, temps de calcul et rejets du pool de hachage bcrypt
+    return jsonify(password_hasher.stats()), 200
+
+
+@health_bp.route('/last-login', methods=['GET'])
+def last_login():
+    # Connexions en attente d'écriture, lots écrits et erreurs de l'enregistrement différé
+    return jsonify(last_logins.stats()), 200
+
+
+@health_bp.route('/admission', methods=['GET'])
+def admission_stats():
+    # Clés suivies, évictions et refus des limiteurs de /auth/login et /auth/register
+    return jsonify(admission.stats()), 200
+
+
+@health_bp.route('/suppressions', methods=['GET'])
+def suppressions():
+    # Suppression de compte en cours dans ce processus, terminées et en échec depuis le démarrage
+    return jsonify(account_deletions.stats()), 200
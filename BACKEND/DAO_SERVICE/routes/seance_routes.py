@@ -1,5 +1,15 @@
+import uuid
+
 from flask import Blueprint, request, jsonify
+from config import Config
 from dao.seance_dao import SeanceDAO
+from dao.suppression_dao import ClientSupprime
+from dao.pagination import parse_page_size
+from dao.lots import LotTropGrand, ids_demandes, reponse_lot
+from models.seance_etude import SeanceEtude
+from streaming import json_list_response
+from dao.version_dao import VersionDAO, SEANCE
+from common.conditional import conditional, query_variant
 
 seance_bp = Blueprint('seance', __name__)
 dao = SeanceDAO()
@@ -9,19 +19,9 @@ def creer_seance():
     try:
         seance = dao.creer_seance(request.json) # TOOK THAT REQUEST AND SENT IT TO METHOD CALLED CREER SEANCE IN TACHE_DAO AND WILL STORE RESPONSE IN VARIABLE 'SEANCE'
 
-        return jsonify({
-            "id": str(seance.id),
-            "client_id": str(seance.client_id),
-            "type_seance": seance.type_seance,
-            "nom": seance.nom,
-            "date_debut": seance.date_debut.isoformat(),
-            "date_fin": seance.date_fin.isoformat() if seance.date_fin else None,
-            "statut": seance.statut,
-            "est_complete": seance.est_complete,
-            "interruptions": seance.interruptions,
-            "nbre_pomodoro_effectues": seance.nbre_pomodoro_effectues,
-            "pomodoro_id": str(seance.pomodoro_id) if seance.pomodoro_id else None
-        }), 201
+        return jsonify(seance.to_dict()), 201
+    except ClientSupprime as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -58,23 +58,29 @@ def changer_statut(seance_id):
 @seance_bp.route('/seance/utilisateur/<client_id>', methods=['GET'])
 def get_seances_by_user(client_id):
     try:
-        seances = dao.get_seances_by_user(client_id)
-        result = []
-        for seance in seances:
-            result.append({
-                "id": str(seance.id),
-                "client_id": str(seance.client_id),
-                "type_seance": seance.type_seance,
-                "nom": seance.nom,
-                "date_debut": seance.date_debut.isoformat(),
-                "date_fin": seance.date_fin.isoformat() if seance.date_fin else None,
-                "statut": seance.statut,
-                "est_complete": seance.est_complete,
-                "interruptions": seance.interruptions,
-                "nbre_pomodoro_effectues": seance.nbre_pomodoro_effectues,
-                "pomodoro_id": str(seance.pomodoro_id) if seance.pomodoro_id else None
-            })
-        return jsonify(result), 200
+        # ETag issu de la version des séances du client : 304 sans lire les séances si rien n'a changé
+        etag = VersionDAO.etag(client_id, SEANCE, query_variant())
+
+        # Pagination par curseur si limit ou cursor est fourni, sinon liste complète
+        if "limit" in request.args or "cursor" in request.args:
+            try:
+                limit = parse_page_size(request.args.get("limit"))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            def page():
+                seances, next_cursor = dao.get_seances_page(client_id, request.args.get("cursor"), limit)
+                response = jsonify([seance.to_dict() for seance in seances])
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
+                return response
+
+            try:
+                return conditional(etag, page)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+        return conditional(etag, lambda: json_list_response(dao.seances_query(client_id), SeanceEtude.to_json_row))
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -101,4 +107,22 @@ def terminer_seance(seance_id):
             "nbre_pomodoro_effectues": updated_seance.nbre_pomodoro_effectues
         }), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
\ No newline at end of file
+        return jsonify({"error": str(e)}), 400
+
+
+# Plusieurs séances par id en une seule requête ; les séances d'autrui sont « introuvables »
+@seance_bp.route('/seance/batch/get', methods=['POST'])
+def get_seances_batch():
+    client_id = request.headers.get("user-id")
+    if not client_id:
+        return jsonify({"error": "user-id (header) est requis"}), 400
+    try:
+        ids, invalides = ids_demandes(request.get_json(silent=True), Config.BATCH_MAX_SIZE)
+        uuid.UUID(client_id)
+    except LotTropGrand as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    seances = dao.get_many_for_user(ids, client_id)
+    return jsonify(reponse_lot("seances", ids, seances, invalides, SeanceEtude.to_dict)), 200
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, jsonify
 from dao.statistique_dao import StatistiqueDAO
+from dao.suppression_dao import ClientSupprime
+from models.statistique import StatistiqueSnapshot
+from streaming import json_list_response
+from dao.version_dao import VersionDAO, STATISTIQUE
+from common.conditional import conditional, query_variant
 
 statistique_bp = Blueprint("statistique", __name__)
 dao = StatistiqueDAO()
@@ -9,25 +14,25 @@ def creer_snapshot():
     try:
         snapshot = dao.creer_snapshot(request.json)
         return jsonify({"message": "Snapshot enregistré", "id": str(snapshot.id)}), 201
+    except ClientSupprime as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 @statistique_bp.route("/statistique/history/<client_id>", methods=["GET"])
 def historique_snapshots(client_id):
     try:
-        snapshots = dao.get_recent_snapshots(client_id)
-        result = []
-        for s in snapshots:
-            result.append({
-                "date_capture": s.date_capture.isoformat(),
-                "taux_completion_taches": s.taux_completion_taches,
-                "focus_score": s.focus_score,
-                "meilleur_jour": s.meilleur_jour,
-                "nbre_taches_completees": s.nbre_taches_completees,
-                "nbre_jours_consecutifs_actifs": s.nbre_jours_consecutifs_actifs,
-                "nbre_taches_retard": s.nbre_taches_retard,
-                "activite_par_jour_semaine": s.activite_par_jour_semaine
-            })
-        return jsonify(result), 200
+        # ETag issu de la version des snapshots du client : 304 sans relire l'historique
+        etag = VersionDAO.etag(client_id, STATISTIQUE, query_variant())
+        return conditional(etag, lambda: json_list_response(dao.recent_snapshots_query(client_id), StatistiqueSnapshot.to_json_row))
     except Exception as e:
         return jsonify({"error": str(e)}), 400
+
+
+@statistique_bp.route("/statistique/aggregats/<client_id>", methods=["GET"])
+def aggregats(client_id):
+    # Agrégats calculés par PostgreSQL : seuls les nombres finaux transitent vers STATISTIQUE_SERVICE
+    try:
+        return jsonify(dao.get_aggregats(client_id)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
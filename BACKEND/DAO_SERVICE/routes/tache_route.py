@@ -1,9 +1,19 @@
 # routes/tache_routes.py
 
+import uuid
+from datetime import datetime
+
 from flask import Blueprint, request, jsonify
+from config import Config
 from dao.tache_dao import TacheDAO
+from dao.suppression_dao import ClientSupprime
+from dao.pagination import parse_page_size
+from dao.lots import LotTropGrand, ids_demandes, reponse_lot
 from models.seance_etude import SeanceEtude
 from models.tache import Tache
+from streaming import json_list_response
+from dao.version_dao import VersionDAO, TACHE
+from common.conditional import conditional, query_variant
 
 tache_bp = Blueprint('tache', __name__)
 
@@ -20,21 +30,40 @@ def debug_task_owner(tache_id):
 
 
 # --- Helper pour l'autorisation ---
-def authorize_user_for_tache(tache_id, user_id):
-    tache = Tache.query.get(tache_id)
-    if not tache:
-        return None
+def authorize_user_for_tache(tache_id, user_id, for_update=False):
+    # Retourne la tâche chargée si l'utilisateur y a accès (propriétaire ou propriétaire de la séance) ;
+    # for_update : verrouillée pour la mise à jour ou la suppression qui suit
+    return TacheDAO.get_for_user(tache_id, user_id, for_update=for_update)
+
+
+
+# --- Helper pour les filtres de recherche ---
+def parse_tache_filters(args):
+    """Convertit les paramètres de requête en filtres pour TacheDAO.search (ValueError si invalide)."""
+    filters = {}
+
+    if args.get("seance_etude_id"):
+        filters["seance_etude_id"] = uuid.UUID(args["seance_etude_id"])
+
+    statuts = [s for s in args.getlist("statut") if s]
+    if statuts:
+        filters["statuts"] = statuts
 
-    if str(tache.client_id) == user_id:
-        return tache
+    priorites = [p for p in args.getlist("priorite") if p]
+    if priorites:
+        filters["priorites"] = priorites
 
-    if tache.seance_etude_id:
-        seance = SeanceEtude.query.filter_by(id=tache.seance_etude_id, client_id=user_id).first()
-        if seance:
-            return tache
+    if "est_terminee" in args:
+        valeur = args["est_terminee"].lower()
+        if valeur not in ("true", "false", "1", "0"):
+            raise ValueError("est_terminee doit être true ou false")
+        filters["est_terminee"] = valeur in ("true", "1")
 
-    return None
+    for champ in ("date_fin_min", "date_fin_max"):
+        if args.get(champ):
+            filters[champ] = datetime.fromisoformat(args[champ].replace('Z', '+00:00'))
 
+    return filters
 
 
 @tache_bp.route('/taches', methods=['GET'])
@@ -43,8 +72,37 @@ def get_taches_by_user():
     if not user_id:
         return jsonify({"error": "user-id header is required"}), 400
 
-    taches = Tache.query.filter_by(client_id=user_id).all()
-    return jsonify([t.to_dict() for t in taches])
+    try:
+        filters = parse_tache_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Filtre invalide : {e}"}), 400
+
+    # ETag issu de la version des tâches du client : 304 sans lire les tâches si rien n'a changé
+    try:
+        etag = VersionDAO.etag(user_id, TACHE, query_variant())
+    except ValueError:
+        return jsonify({"error": "user-id invalide"}), 400
+
+    # Pagination par curseur si limit ou cursor est fourni, sinon liste complète
+    if "limit" in request.args or "cursor" in request.args:
+        try:
+            limit = parse_page_size(request.args.get("limit"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        def page():
+            taches, next_cursor = TacheDAO.search_page(user_id, request.args.get("cursor"), limit, **filters)
+            response = jsonify(taches)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return response
+
+        try:
+            return conditional(etag, page)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    return conditional(etag, lambda: json_list_response(TacheDAO.search_query(user_id, **filters), Tache.to_json_row))
 
 
 
@@ -63,7 +121,10 @@ def add_tache_route():
     if not client_id or not titre:
         return jsonify({"error": "client_id et titre sont requis"}), 400
 
-    result = TacheDAO.add(data)
+    try:
+        result = TacheDAO.add(data)
+    except ClientSupprime as e:
+        return jsonify({"error": str(e)}), 404
 
     if "error" in result:
         return jsonify({"error": result["error"]}), 500
@@ -86,8 +147,7 @@ def list_taches_route(seance_etude_id):
     if not authorize_user_for_seance(seance_etude_id, user_id):
         return jsonify({"error": "Séance d'étude introuvable ou accès refusé"}), 403
 
-    taches = TacheDAO.get_by_seance_id(seance_etude_id)
-    return jsonify(taches), 200
+    return json_list_response(TacheDAO.seance_query(seance_etude_id), Tache.to_json_row)
 
 
 @tache_bp.route('/<uuid:tache_id>', methods=['GET'])
@@ -96,14 +156,12 @@ def get_tache_route(tache_id):
     if not user_id:
         return jsonify({"error": "user-id (header) est requis"}), 400
 
-    # Autorisation
-    if not authorize_user_for_tache(tache_id, user_id):
+    # Autorisation et chargement en une seule requête
+    tache = authorize_user_for_tache(tache_id, user_id)
+    if not tache:
         return jsonify({"error": "Tâche introuvable ou accès refusé"}), 403
 
-    tache = TacheDAO.get_by_id(tache_id)
-    if tache:
-        return jsonify(tache), 200
-    return jsonify({"error": "Tâche introuvable"}), 404
+    return jsonify(tache.to_dict()), 200
 
 
 @tache_bp.route('/update/<uuid:tache_id>', methods=['PUT'])
@@ -115,11 +173,12 @@ def update_tache_route(tache_id):
     if not user_id or not data:
         return jsonify({"error": "user-id (header) et des données sont requis"}), 400
 
-    # Autorisation
-    if not authorize_user_for_tache(tache_id, user_id):
+    # Autorisation et chargement en une seule requête
+    tache = authorize_user_for_tache(tache_id, user_id, for_update=True)
+    if not tache:
         return jsonify({"error": "Tâche introuvable ou accès refusé"}), 403
 
-    tache_mise_a_jour = TacheDAO.update(tache_id, data) # ON APPELE METHODE UPDATE DANS TACHE_DAO ET ON STOCK REPONSE DANS 'TACHE_MISE_A_JOUR'
+    tache_mise_a_jour = TacheDAO.update_entity(tache, data) # ON APPELE METHODE UPDATE DANS TACHE_DAO ET ON STOCK REPONSE DANS 'TACHE_MISE_A_JOUR'
 
     # RENVOI LA REPONSE A TACHE_SERVICE (DAO_CLIENT)
     if tache_mise_a_jour:
@@ -136,11 +195,96 @@ def delete_tache_route(tache_id):
     if not user_id:
         return jsonify({"error": "user-id (header) est requis"}), 400
 
-    # Autorisation
-    if not authorize_user_for_tache(tache_id, user_id):
+    # Autorisation et chargement en une seule requête
+    tache = authorize_user_for_tache(tache_id, user_id, for_update=True)
+    if not tache:
         return jsonify({"error": "Tâche introuvable ou accès refusé"}), 403
 
-    success = TacheDAO.delete(tache_id)
+    success = TacheDAO.delete_entity(tache)
     if success:
         return jsonify({"message": "Tâche supprimée avec succès"}), 200
-    return jsonify({"error": "Tâche introuvable"}), 404
\ No newline at end of file
+    return jsonify({"error": "Tâche introuvable"}), 404
+
+
+# --- Opérations par lot ---
+def _lire_lot(cle):
+    """Retourne (user_id, éléments) ou (None, réponse d'erreur) pour une route de lot."""
+    user_id = request.headers.get("user-id")
+    data = request.get_json(silent=True) or {}
+    elements = data.get(cle) if isinstance(data, dict) else None
+
+    if not user_id or not isinstance(elements, list) or not elements:
+        return None, (jsonify({"error": f"user-id (header) et une liste '{cle}' non vide sont requis"}), 400)
+    if len(elements) > Config.BATCH_MAX_SIZE:
+        return None, (jsonify({"error": f"Lot limité à {Config.BATCH_MAX_SIZE} éléments"}), 413)
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        return None, (jsonify({"error": "user-id invalide"}), 400)
+    return user_id, elements
+
+
+def _reponse_lot(message, resultats):
+    reussis = sum(1 for r in resultats if r["status"] < 400)
+    return jsonify({
+        "message": message,
+        "reussis": reussis,
+        "echecs": len(resultats) - reussis,
+        "resultats": resultats
+    }), 200
+
+
+@tache_bp.route('/batch', methods=['POST'])
+def add_taches_batch_route():
+    user_id, elements = _lire_lot("taches")
+    if user_id is None:
+        return elements
+    try:
+        resultats = TacheDAO.add_many(user_id, elements)
+    except ClientSupprime as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return _reponse_lot("Tâches ajoutées", resultats)
+
+
+@tache_bp.route('/batch', methods=['PUT'])
+def update_taches_batch_route():
+    user_id, elements = _lire_lot("taches")
+    if user_id is None:
+        return elements
+    try:
+        resultats = TacheDAO.update_many(user_id, elements)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return _reponse_lot("Tâches mises à jour", resultats)
+
+
+@tache_bp.route('/batch', methods=['DELETE'])
+def delete_taches_batch_route():
+    user_id, elements = _lire_lot("ids")
+    if user_id is None:
+        return elements
+    try:
+        resultats = TacheDAO.delete_many(user_id, elements)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return _reponse_lot("Tâches supprimées", resultats)
+
+
+@tache_bp.route('/batch/get', methods=['POST'])
+def get_taches_batch_route():
+    # Plusieurs tâches par id en une seule requête ; les tâches d'autrui sont « introuvables »
+    user_id = request.headers.get("user-id")
+    if not user_id:
+        return jsonify({"error": "user-id (header) est requis"}), 400
+    try:
+        ids, invalides = ids_demandes(request.get_json(silent=True), Config.BATCH_MAX_SIZE)
+        user_id = uuid.UUID(user_id)
+    except LotTropGrand as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    taches = TacheDAO.get_many_for_user(ids, user_id)
+    return jsonify(reponse_lot("taches", ids, taches, invalides, Tache.to_dict)), 200
@@ -0,0 +1,78 @@
+# streaming.py
+"""
+Réponses JSON des listes : encodage rapide (orjson si installé) et envoi
+incrémental des lignes lues par lots sur un curseur côté serveur.
+
+Les dao_client qui le demandent reçoivent la liste en MessagePack
+(common/wire.py), d'un seul bloc : les gateways lisent le corps entier.
+"""
+import json
+import uuid
+from datetime import date, datetime
+
+from flask import Response, stream_with_context
+
+from config import Config
+from common.tracing import span
+from common.wire import msgpack_response, wants_msgpack
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le module json standard
+    orjson = None
+
+
+def _default(value):
+    # Types non gérés nativement par le module json standard
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable en JSON : {type(value).__name__}")
+
+
+def dumps(obj):
+    # Sérialise en bytes ; UUID et datetime sont encodés nativement par orjson
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _generate_array(rows, serialize, batch_size):
+    # Produit "[", puis les lignes encodées par paquets de batch_size, puis "]"
+    yield b"["
+    paquet = []
+    premier = True
+    for row in rows:
+        paquet.append(dumps(serialize(row)))
+        if len(paquet) >= batch_size:
+            yield (b"" if premier else b",") + b",".join(paquet)
+            premier = False
+            paquet = []
+    if paquet:
+        yield (b"" if premier else b",") + b",".join(paquet)
+    yield b"]"
+
+
+def json_list_response(query, serialize, status=200, headers=None):
+    """
+    Réponse JSON (tableau) pour une requête ORM, chaque ligne passant par serialize.
+
+    En mode streaming (STREAM_LIST_RESPONSES), les lignes sont lues par lots de
+    STREAM_BATCH_SIZE avec un curseur côté serveur (yield_per) et envoyées au fil
+    de l'eau : la mémoire reste constante quelle que soit la taille de l'historique.
+    Une erreur survenant après le début de l'envoi ne peut plus changer le statut.
+    """
+    batch_size = Config.STREAM_BATCH_SIZE
+    if wants_msgpack():
+        rows = [serialize(row) for row in query.yield_per(batch_size)]
+        with span("serial"):
+            return msgpack_response(rows, status, headers)
+    if Config.STREAM_LIST_RESPONSES:
+        rows = query.yield_per(batch_size)
+        body = stream_with_context(_generate_array(rows, serialize, batch_size))
+    else:
+        rows = [serialize(row) for row in query]
+        with span("serial"):
+            body = dumps(rows)
+    return Response(body, status=status, headers=headers, mimetype="application/json")
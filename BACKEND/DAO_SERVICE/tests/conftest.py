@@ -0,0 +1,60 @@
+import os
+import uuid
+
+import pytest
+from flask import Flask
+
+from database import db
+import models.client, models.donnees_version, models.journal_etude, models.note_etude  # noqa: F401
+import models.notification, models.pomodoro_parametre, models.preference, models.revocation  # noqa: F401
+import models.seance_etude, models.statistique, models.statistique_compteur  # noqa: F401
+import models.suppression_compte, models.tache  # noqa: F401
+from models.client import Client
+from models.seance_etude import SeanceEtude
+from routes.auth_routes import auth_bp
+from routes.tache_route import tache_bp
+
+
+@pytest.fixture(scope="session")
+def pg_app():
+    """
+    Application reliée à une base PostgreSQL jetable (TEST_DATABASE_URL) : le
+    schéma est créé au début de la session et supprimé à la fin. Sans
+    TEST_DATABASE_URL, les tests qui en dépendent sont ignorés.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL non défini : tests PostgreSQL ignorés")
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, TESTING=True)
+    db.init_app(app)
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(tache_bp, url_prefix="/tache")
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def pg(pg_app):
+    # Contexte d'application ouvert pour le test ; la session est fermée à la fin
+    with pg_app.app_context():
+        yield db.session
+        db.session.remove()
+
+
+def creer_client(session, **champs):
+    client = Client(id=uuid.uuid4(), email=f"{uuid.uuid4().hex}@test", nom="test", **champs)
+    session.add(client)
+    session.commit()
+    return client.id
+
+
+def creer_seance(session, client_id, **champs):
+    seance = SeanceEtude(id=uuid.uuid4(), client_id=client_id, nom="séance", **champs)
+    session.add(seance)
+    session.commit()
+    return seance.id
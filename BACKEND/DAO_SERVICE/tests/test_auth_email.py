@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from dao.auth_dao import AuthDAO, EmailDejaUtilise, _conflit_email
+
+
+def integrity_error(constraint_name):
+    orig = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint_name))
+    return IntegrityError("INSERT", {}, orig)
+
+
+def test_only_the_email_index_counts_as_a_conflict():
+    assert _conflit_email(integrity_error("ux_client_email_lower"))
+    assert not _conflit_email(integrity_error("client_pkey"))
+    assert not _conflit_email(IntegrityError("INSERT", {}, Exception()))
+
+
+def test_register_rejects_an_email_differing_only_by_case(pg):
+    assert AuthDAO.register("Dup@Test.io", "secret", "n", "p") is not None
+    assert AuthDAO.register("dup@test.IO", "secret", "n", "p") is None
+
+
+def test_update_profile_reports_a_taken_email(pg, pg_app):
+    AuthDAO.register("pris@test.io", "secret", "n", "p")
+    client = AuthDAO.register("libre@test.io", "secret", "n", "p")
+
+    with pytest.raises(EmailDejaUtilise):
+        AuthDAO.update_profile(client.id, email="PRIS@test.io")
+
+    response = pg_app.test_client().patch(
+        "/auth/update-profile", json={"id": str(client.id), "email": "pris@test.io"}
+    )
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Email déjà utilisé"}
+    assert AuthDAO.update_profile(client.id, nom="nouveau").nom == "nouveau"
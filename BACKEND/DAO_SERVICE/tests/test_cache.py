@@ -0,0 +1,89 @@
+from cache import TTLCache, client_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=30, clock=clock)
+    cache.put("a", {"id": "a"})
+
+    assert cache.get("a") == {"id": "a"}
+    clock.now = 31
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=30, clock=FakeClock())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_or_load_reads_through_and_skips_missing_clients():
+    cache = TTLCache(maxsize=10, ttl=30, clock=FakeClock())
+    appels = []
+
+    def loader():
+        appels.append(1)
+        return {"id": "a"}
+
+    cache.get_or_load("a", loader)
+    cache.get_or_load("a", loader)
+    cache.get_or_load("absent", lambda: None)
+
+    assert len(appels) == 1
+    assert cache.stats()["taille"] == 1
+
+
+def test_get_many_or_load_loads_only_missing_keys_in_one_call():
+    cache = TTLCache(maxsize=10, ttl=30, clock=FakeClock())
+    cache.put("a", {"id": "a"})
+    appels = []
+
+    def loader(cles):
+        appels.append(cles)
+        return {cle: {"id": cle} for cle in cles if cle != "absent"}
+
+    trouves = cache.get_many_or_load(["a", "b", "absent"], loader)
+
+    assert appels == [["b", "absent"]]
+    assert trouves == {"a": {"id": "a"}, "b": {"id": "b"}}
+    assert cache.get("b") == {"id": "b"}
+
+
+def test_invalidation_during_load_prevents_stale_write():
+    cache = TTLCache(maxsize=10, ttl=30, clock=FakeClock())
+
+    def loader():
+        # Une écriture concurrente invalide le profil pendant la lecture en base
+        cache.invalidate("a")
+        return {"nom": "ancien"}
+
+    assert cache.get_or_load("a", loader) == {"nom": "ancien"}
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_always_loads():
+    cache = TTLCache(maxsize=0, ttl=30)
+
+    assert cache.get_or_load("a", lambda: 1) == 1
+    assert cache.stats()["taille"] == 0
+
+
+def test_client_key_normalizes_uuid():
+    assert client_key("6F9619FF-8B86-D011-B42D-00CF4FC964FF") == "6f9619ff-8b86-d011-b42d-00cf4fc964ff"
+    assert client_key("pas-un-uuid") == "pas-un-uuid"
@@ -0,0 +1,116 @@
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from dao.compteur_dao import CompteurDAO, _serie, etat_tache
+from dao.seance_dao import SeanceDAO
+from dao.tache_dao import TacheDAO
+from models.tache import Tache
+from tests.conftest import creer_client
+
+
+def test_serie_counts_consecutive_days_from_most_recent():
+    jours = [date(2024, 5, 1), date(2024, 5, 3), date(2024, 5, 4), date(2024, 5, 5)]
+
+    assert _serie(jours) == 3
+    assert _serie([date(2024, 5, 1)]) == 1
+    assert _serie([]) == 0
+
+
+def test_etat_tache_groups_status_like_aggregates():
+    creee = datetime(2024, 5, 1)
+
+    assert etat_tache(SimpleNamespace(est_terminee=None, statut="En Cours", date_creation=creee)) == {
+        "est_terminee": False, "statut": "en cours", "date_creation": creee,
+    }
+    assert etat_tache(SimpleNamespace(est_terminee=True, statut="", date_creation=creee))["statut"] == "Autre"
+
+
+# --- Deltas appliqués par les écritures (PostgreSQL, voir conftest.pg_app) ---
+
+CHAMPS_COMPTEUR = (
+    "nbre_taches_total", "nbre_taches_completees", "taches_par_statut", "premiere_date_tache",
+    "nbre_seances", "nbre_seances_completees", "nbre_pomodoros", "jours_actifs",
+    "serie_jours_actifs", "derniere_date_active", "seances_par_jour_semaine",
+)
+
+
+def assert_compteur_exact(pg, client_id):
+    # La ligne maintenue par deltas égale le recalcul complet depuis les tables
+    from models.statistique_compteur import StatistiqueCompteur
+
+    pg.expire_all()
+    ligne = pg.get(StatistiqueCompteur, client_id)
+    attendu = CompteurDAO.calculer(client_id)
+    assert {c: getattr(ligne, c) for c in CHAMPS_COMPTEUR} == {c: attendu[c] for c in CHAMPS_COMPTEUR}
+    return ligne
+
+
+def test_task_writes_apply_exact_deltas(pg):
+    client_id = creer_client(pg)
+    # Première écriture : ligne reconstruite, les suivantes appliquent leur delta
+    premiere = TacheDAO.add({"client_id": str(client_id), "titre": "a", "statut": "A faire"})
+    seconde = TacheDAO.add({"client_id": str(client_id), "titre": "b", "statut": "A faire"})
+    ligne = assert_compteur_exact(pg, client_id)
+    assert (ligne.nbre_taches_total, ligne.taches_par_statut) == (2, {"a faire": 2})
+
+    TacheDAO.update_entity(TacheDAO.get_for_user(seconde["id"], client_id, for_update=True), {"est_terminee": True})
+    assert assert_compteur_exact(pg, client_id).nbre_taches_completees == 1
+
+    TacheDAO.update_entity(TacheDAO.get_for_user(seconde["id"], client_id, for_update=True), {"statut": "En cours"})
+    assert assert_compteur_exact(pg, client_id).taches_par_statut == {"a faire": 1, "en cours": 1}
+
+    TacheDAO.delete_entity(TacheDAO.get_for_user(premiere["id"], client_id, for_update=True))
+    ligne = assert_compteur_exact(pg, client_id)
+    assert (ligne.nbre_taches_total, ligne.premiere_date_tache) == (1, pg.get(Tache, uuid.UUID(seconde["id"])).date_creation)
+
+
+def test_batch_task_writes_apply_exact_deltas(pg):
+    client_id = creer_client(pg)
+    TacheDAO.add({"client_id": str(client_id), "titre": "init"})
+    ids = [r["tache"]["id"] for r in TacheDAO.add_many(client_id, [{"titre": t, "statut": "A faire"} for t in "abc"])]
+    assert_compteur_exact(pg, client_id)
+
+    TacheDAO.update_many(client_id, [{"id": ids[0], "est_terminee": True}, {"id": ids[1], "statut": "Fini"}])
+    assert assert_compteur_exact(pg, client_id).nbre_taches_completees == 1
+
+    TacheDAO.delete_many(client_id, ids[:2])
+    assert assert_compteur_exact(pg, client_id).nbre_taches_total == 2
+
+
+def test_session_writes_apply_exact_deltas(pg):
+    client_id = creer_client(pg)
+    debut = datetime(2024, 5, 1, 9)
+    seances = [
+        SeanceDAO.creer_seance({
+            "client_id": str(client_id), "type_seance": "pomodoro", "nom": "s",
+            "date_debut": (debut + timedelta(days=jour)).isoformat(), "nbre_pomodoro_effectues": 1,
+        }).id
+        for jour in (0, 1, 1)
+    ]
+    ligne = assert_compteur_exact(pg, client_id)
+    assert (ligne.nbre_seances, ligne.serie_jours_actifs) == (3, 2)
+
+    SeanceDAO.terminer_seance(seances[0], {"nbre_pomodoro_effectues": 4})
+    SeanceDAO.changer_statut(seances[1], "terminee")
+    ligne = assert_compteur_exact(pg, client_id)
+    assert (ligne.nbre_seances_completees, ligne.nbre_pomodoros) == (2, 6)
+
+
+def test_task_loaded_for_update_is_locked_until_commit(pg):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    from database import db
+
+    client_id = creer_client(pg)
+    tache = TacheDAO.add({"client_id": str(client_id), "titre": "a"})
+    TacheDAO.get_for_user(tache["id"], client_id, for_update=True)
+
+    # Une écriture concurrente attend la fin de la transaction au lieu de lire un état périmé
+    with db.engine.connect() as autre:
+        with pytest.raises(OperationalError):
+            autre.execute(text("SELECT id FROM tache WHERE id = :id FOR UPDATE NOWAIT"), {"id": tache["id"]})
+    pg.rollback()
@@ -0,0 +1,42 @@
+import threading
+
+import bcrypt
+import pytest
+
+from hashing import HashPoolSature, PasswordHasher, hash_rounds
+
+
+def test_hash_uses_configured_rounds_and_verifies():
+    hasher = PasswordHasher(workers=2, rounds=4, queue_max=4)
+    stored = hasher.hash("secret")
+
+    assert hash_rounds(stored) == 4
+    assert hasher.verify(stored, "secret")
+    assert not hasher.verify(stored, "autre")
+    assert hasher.stats()["termines"] == 3
+
+
+def test_needs_rehash_when_cost_differs():
+    hasher = PasswordHasher(workers=1, rounds=5, queue_max=0)
+    ancien = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode()
+
+    assert hasher.needs_rehash(ancien)
+    assert not hasher.needs_rehash(hasher.hash("secret"))
+    assert hash_rounds("pas un hash") is None
+
+
+def test_full_queue_is_rejected_instead_of_waiting():
+    hasher = PasswordHasher(workers=1, rounds=4, queue_max=0)
+    libere = threading.Event()
+    occupe = threading.Thread(target=hasher._run, args=(libere.wait,))
+    occupe.start()
+    while hasher.stats()["en_cours"] == 0:
+        libere.wait(0.01)
+
+    with pytest.raises(HashPoolSature):
+        hasher.hash("secret")
+    assert hasher.stats()["rejets"] == 1
+
+    libere.set()
+    occupe.join()
+    assert hasher.verify(hasher.hash("secret"), "secret")
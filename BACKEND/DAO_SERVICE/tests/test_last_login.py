@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime
+
+from flask import Flask
+
+from last_login import LastLoginRecorder
+
+
+def make_recorder(ecritures, max_pending=100):
+    recorder = LastLoginRecorder(interval=0, max_pending=max_pending)
+    recorder.app = Flask(__name__)
+    recorder._write = ecritures.append
+    return recorder
+
+
+def test_latest_login_per_client_is_written_in_one_batch():
+    ecritures = []
+    recorder = make_recorder(ecritures)
+    a, b = uuid.uuid4(), uuid.uuid4()
+
+    recorder.record(a, datetime(2025, 7, 1, 9, 0))
+    recorder.record(a, datetime(2025, 7, 1, 8, 0))
+    recorder.record(b, datetime(2025, 7, 1, 10, 0))
+
+    assert recorder.flush() == 2
+    assert ecritures == [{a: datetime(2025, 7, 1, 9, 0), b: datetime(2025, 7, 1, 10, 0)}]
+    assert recorder.flush() == 0
+    assert recorder.stats()["lots"] == 1
+
+
+def test_failed_batch_is_kept_for_next_flush():
+    recorder = make_recorder([])
+    client = uuid.uuid4()
+
+    def panne(lot):
+        raise RuntimeError("base indisponible")
+
+    recorder._write = panne
+    recorder.record(client, datetime(2025, 7, 1, 9, 0))
+    assert recorder.flush() == 0
+    assert recorder.stats()["erreurs"] == 1
+
+    ecritures = []
+    recorder._write = ecritures.append
+    assert recorder.flush() == 1
+    assert ecritures == [{client: datetime(2025, 7, 1, 9, 0)}]
+
+
+def test_size_threshold_wakes_the_writer():
+    recorder = make_recorder([], max_pending=2)
+    recorder.record(uuid.uuid4())
+    assert not recorder._wake.is_set()
+    recorder.record(uuid.uuid4())
+    assert recorder._wake.is_set()
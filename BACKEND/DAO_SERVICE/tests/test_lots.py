@@ -0,0 +1,36 @@
+import uuid
+
+import pytest
+
+from dao.lots import LotTropGrand, ids_demandes, reponse_lot
+
+
+def test_ids_demandes_keeps_order_and_drops_duplicates():
+    a, b = uuid.uuid4(), uuid.uuid4()
+
+    ids, invalides = ids_demandes({"ids": [str(b), "zz", str(a), str(b).upper()]}, max_size=10)
+
+    assert ids == [b, a]
+    assert invalides == ["zz"]
+
+
+@pytest.mark.parametrize("data", [None, {}, {"ids": []}, {"ids": "abc"}])
+def test_ids_demandes_requires_a_list(data):
+    with pytest.raises(ValueError):
+        ids_demandes(data, max_size=10)
+
+
+def test_ids_demandes_limits_batch_size():
+    with pytest.raises(LotTropGrand):
+        ids_demandes({"ids": [str(uuid.uuid4()) for _ in range(3)]}, max_size=2)
+
+
+def test_reponse_lot_lists_found_then_missing_in_request_order():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    trouves = {c: {"titre": "c"}, a: {"titre": "a"}}
+
+    assert reponse_lot("taches", [a, b, c], trouves, ["zz"], lambda t: t["titre"]) == {
+        "taches": ["a", "c"],
+        "introuvables": [str(b)],
+        "invalides": ["zz"],
+    }
@@ -0,0 +1,15 @@
+import migrations
+
+
+def test_discover_sorted_and_unique():
+    found = migrations.discover()
+    versions = [m.version for m in found]
+
+    assert versions == sorted(versions)
+    assert len(versions) == len(set(versions))
+
+
+def test_every_migration_is_reversible():
+    for m in migrations.discover():
+        assert callable(getattr(m.module, "upgrade", None)), m.name
+        assert callable(getattr(m.module, "downgrade", None)), m.name
@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from config import Config
+from dao.pagination import encode_cursor, decode_cursor, keyset_page, parse_page_size
+from dao.tache_dao import TacheDAO
+from models.tache import Tache
+from tests.conftest import creer_client
+
+
+# -------------------------------
+# encode_cursor / decode_cursor
+# -------------------------------
+def test_cursor_round_trip():
+    date_value = datetime(2025, 7, 1, 14, 30, 15, 123456)
+    row_id = uuid.uuid4()
+
+    cursor = encode_cursor(date_value, row_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (date_value, row_id)
+
+
+def test_cursor_round_trip_without_date():
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(None, row_id)) == (None, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "pas-un-curseur", "W10", "WyJ4IiwieSJd"])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+# -------------------------------
+# parse_page_size
+# -------------------------------
+def test_parse_page_size_default():
+    assert parse_page_size(None) == Config.PAGE_SIZE_DEFAULT
+
+
+def test_parse_page_size_capped():
+    assert parse_page_size(str(Config.PAGE_SIZE_MAX + 1)) == Config.PAGE_SIZE_MAX
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "abc"])
+def test_parse_page_size_invalid(value):
+    with pytest.raises(ValueError):
+        parse_page_size(value)
+
+
+# -------------------------------
+# keyset_page (PostgreSQL, voir conftest.pg_app)
+# -------------------------------
+def test_keyset_page_returns_undated_rows_last(pg):
+    client_id = creer_client(pg)
+    datees = [Tache(id=uuid.uuid4(), client_id=client_id, titre=f"d{i}", date_creation=datetime(2025, 1, 1 + i))
+              for i in range(3)]
+    sans_date = [Tache(id=uuid.uuid4(), client_id=client_id, titre=f"n{i}") for i in range(4)]
+    pg.add_all(datees + sans_date)
+    pg.commit()
+
+    vues, cursor = [], None
+    while True:
+        taches, cursor = keyset_page(TacheDAO.search_query(client_id), Tache.date_creation, Tache.id,
+                                     cursor=cursor, limit=2)
+        vues += [t.id for t in taches]
+        if not cursor:
+            break
+
+    assert vues[:3] == [t.id for t in reversed(datees)]
+    assert vues[3:] == sorted((t.id for t in sans_date), reverse=True)
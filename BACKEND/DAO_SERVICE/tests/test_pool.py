@@ -0,0 +1,30 @@
+from sqlalchemy import create_engine
+
+from pool import InstrumentedQueuePool, PoolStats, pool_stats, pool_status, warm_up
+
+
+def test_pool_stats_snapshot():
+    stats = PoolStats()
+    stats.record_checkout(0.5, threshold_ms=1.0)
+    stats.record_checkout(3.5, threshold_ms=1.0)
+    stats.record_timeout()
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["checkouts"] == 2
+    assert snapshot["attentes"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["attente_moyenne_ms"] == 2.0
+    assert snapshot["attente_max_ms"] == 3.5
+
+
+def test_warm_up_returns_connections_to_pool():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=3)
+    avant = pool_stats.snapshot()["checkouts"]
+
+    assert warm_up(engine, 3) == 3
+
+    etat = pool_status(engine)
+    assert etat["utilisees"] == 0
+    assert etat["disponibles"] == 3
+    assert etat["checkouts"] - avant == 3
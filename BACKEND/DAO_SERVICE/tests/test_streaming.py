@@ -0,0 +1,33 @@
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+import streaming
+from streaming import _generate_array, dumps
+
+
+def test_dumps_native_types():
+    row_id = uuid.uuid4()
+    date_value = datetime(2025, 7, 1, 9, 30, 0, 250000)
+
+    data = json.loads(dumps({"id": row_id, "date": date_value, "titre": "Réviser"}))
+
+    assert data == {"id": str(row_id), "date": date_value.isoformat(), "titre": "Réviser"}
+
+
+def test_dumps_without_orjson(monkeypatch):
+    monkeypatch.setattr(streaming, "orjson", None)
+    row_id = uuid.uuid4()
+
+    assert json.loads(dumps([row_id])) == [str(row_id)]
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_generate_array_is_valid_json(count):
+    rows = [{"n": i} for i in range(count)]
+
+    body = b"".join(_generate_array(rows, lambda r: r, batch_size=3))
+
+    assert json.loads(body) == rows
@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text, update
+
+from account_deletion import AccountDeletionWorker
+from database import db
+from dao.auth_dao import AuthDAO
+from dao.suppression_dao import ETAPES, ECHEC, EN_COURS, TERMINEE, ClientSupprime, SuppressionDAO
+from dao.tache_dao import TacheDAO
+from dao.version_dao import VersionDAO, TACHE
+from models.client import Client
+from models.suppression_compte import SuppressionCompte
+from models.tache import Tache
+from tests.conftest import creer_client, creer_seance
+import models.client, models.journal_etude, models.note_etude, models.notification  # noqa: F401
+import models.preference, models.seance_etude, models.statistique, models.tache  # noqa: F401
+
+
+def test_steps_follow_foreign_key_order():
+    # Une table n'est vidée qu'après toutes les tables (de la liste) qui la référencent
+    ordre = [nom for nom, _ in ETAPES]
+    assert ordre[-1] == "client"
+    for nom in ordre:
+        table = db.metadata.tables[nom]
+        for fk in table.foreign_keys:
+            cible = fk.column.table.name
+            if cible in ordre and cible != nom:
+                assert ordre.index(nom) < ordre.index(cible), f"{nom} doit précéder {cible}"
+
+
+def test_every_table_owned_by_a_client_is_covered():
+    # Tables liées au client sans ON DELETE CASCADE : supprimées explicitement par une étape
+    ordre = {nom for nom, _ in ETAPES}
+    for table in db.metadata.tables.values():
+        for fk in table.foreign_keys:
+            if fk.column.table.name == "client" and fk.ondelete != "CASCADE":
+                assert table.name in ordre, table.name
+
+
+# --- Exécution (PostgreSQL, voir conftest.pg_app) ---
+
+def nouvelles_suppressions(pg, n):
+    # Suppressions précédentes réservées d'abord : seules les n nouvelles restent à réserver
+    while SuppressionDAO.reserver(300, 300) is not None:
+        pass
+    return [AuthDAO.delete_account(creer_client(pg)).id for _ in range(n)]
+
+
+def test_each_deletion_is_reserved_by_a_single_worker(pg):
+    a, b = nouvelles_suppressions(pg, 2)
+
+    assert SuppressionDAO.reserver(300, 300) == a
+    assert SuppressionDAO.reserver(300, 300) == b
+    assert SuppressionDAO.reserver(300, 300) is None
+    assert pg.get(SuppressionCompte, a).statut == EN_COURS
+
+    # Progression figée au-delà du bail : processus arrêté, la suppression est reprise
+    pg.execute(update(SuppressionCompte).where(SuppressionCompte.id == a)
+               .values(mis_a_jour_le=datetime.utcnow() - timedelta(seconds=600)))
+    pg.commit()
+    assert SuppressionDAO.reserver(300, 300) == a
+
+
+def test_reservation_skips_a_deletion_locked_by_another_worker(pg):
+    a, b = nouvelles_suppressions(pg, 2)
+
+    with db.engine.connect() as autre:
+        autre.execute(text("SELECT id FROM suppression_compte WHERE id = :id FOR UPDATE"), {"id": a})
+        assert SuppressionDAO.reserver(300, 300) == b
+        autre.rollback()
+    assert SuppressionDAO.reserver(300, 300) == a
+
+
+def test_deletion_detaches_other_clients_tasks_and_bumps_their_version(pg):
+    supprime, autre = creer_client(pg), creer_client(pg)
+    seance = creer_seance(pg, supprime)
+    tache = Tache(id=uuid.uuid4(), client_id=autre, seance_etude_id=seance, titre="partagée")
+    pg.add(tache)
+    pg.commit()
+    version = VersionDAO.get(autre, TACHE)
+
+    suppression_id = AuthDAO.delete_account(supprime).id
+    AccountDeletionWorker(chunk_size=10, pause=0, lease=300, poll=60, retry=300).run(suppression_id)
+
+    pg.expire_all()
+    assert pg.get(SuppressionCompte, suppression_id).statut == TERMINEE
+    assert pg.get(Client, supprime) is None
+    assert pg.get(Tache, tache.id).seance_etude_id is None
+    assert VersionDAO.get(autre, TACHE) > version
+
+
+def test_failed_deletion_is_retried_from_the_first_step_after_the_delay(pg):
+    (a,) = nouvelles_suppressions(pg, 1)
+    pg.execute(update(SuppressionCompte).where(SuppressionCompte.id == a)
+               .values(statut=ECHEC, etape="client", mis_a_jour_le=datetime.utcnow()))
+    pg.commit()
+    assert SuppressionDAO.reserver(300, 300) is None
+
+    pg.execute(update(SuppressionCompte).where(SuppressionCompte.id == a)
+               .values(mis_a_jour_le=datetime.utcnow() - timedelta(seconds=600)))
+    pg.commit()
+    assert SuppressionDAO.reserver(300, 300) == a
+    pg.expire_all()
+    assert pg.get(SuppressionCompte, a).statut == EN_COURS
+    assert pg.get(SuppressionCompte, a).etape is None
+
+
+def test_writes_are_refused_once_the_account_is_marked_deleted(pg):
+    client_id = creer_client(pg)
+    AuthDAO.delete_account(client_id)
+
+    with pytest.raises(ClientSupprime):
+        TacheDAO.add({"client_id": str(client_id), "titre": "t"})
+    with pytest.raises(ClientSupprime):
+        TacheDAO.add_many(client_id, [{"titre": "t"}])
+    assert pg.query(Tache).filter_by(client_id=client_id).count() == 0
+
+
+def test_task_inserted_after_its_step_is_deleted_by_rerunning_the_steps(pg):
+    client_id = creer_client(pg)
+    suppression_id = AuthDAO.delete_account(client_id).id
+    suppression = SuppressionDAO.get(suppression_id)
+    noms = [nom for nom, _ in ETAPES]
+    for etape in noms[:noms.index("seance_etude") + 1]:
+        SuppressionDAO.delete_chunk(suppression, etape, 10)
+
+    # Écriture commencée avant la marque, validée après le passage de l'étape « tache »
+    pg.add(Tache(id=uuid.uuid4(), client_id=client_id, titre="tardive"))
+    pg.commit()
+    AccountDeletionWorker(chunk_size=10, pause=0, lease=300, poll=60, retry=300).run(suppression_id)
+
+    pg.expire_all()
+    assert pg.get(SuppressionCompte, suppression_id).statut == TERMINEE
+    assert pg.get(Client, client_id) is None
+    assert pg.query(Tache).filter_by(client_id=client_id).count() == 0
@@ -0,0 +1,123 @@
+import uuid
+
+from flask import Flask
+
+from config import Config
+from dao.tache_dao import TacheDAO
+from models.tache import Tache
+from routes.tache_route import tache_bp
+from tests.conftest import creer_client, creer_seance
+
+
+def test_batch_routes_reject_oversized_batches_with_413(monkeypatch):
+    # Refus avant tout accès à la base
+    monkeypatch.setattr(Config, "BATCH_MAX_SIZE", 2)
+    app = Flask(__name__)
+    app.register_blueprint(tache_bp, url_prefix="/tache")
+    client = app.test_client()
+    headers = {"user-id": str(uuid.uuid4())}
+
+    assert client.post("/tache/batch", json={"taches": [{"titre": "t"}] * 3}, headers=headers).status_code == 413
+    assert client.put("/tache/batch", json={"taches": [{"id": "x"}] * 3}, headers=headers).status_code == 413
+    assert client.delete("/tache/batch", json={"ids": ["x"] * 3}, headers=headers).status_code == 413
+    assert client.post("/tache/batch", json={"taches": [{"titre": "t"}]}, headers={"user-id": "x"}).status_code == 400
+
+
+def test_add_many_returns_rows_in_request_order(pg):
+    client_id = creer_client(pg)
+
+    resultats = TacheDAO.add_many(client_id, [{"titre": f"t{i}"} for i in range(5)] + [{}])
+
+    assert [r["status"] for r in resultats] == [201] * 5 + [400]
+    assert [r["tache"]["titre"] for r in resultats[:5]] == [f"t{i}" for i in range(5)]
+    assert [r["index"] for r in resultats] == list(range(6))
+
+
+def test_add_many_rejects_foreign_or_malformed_sessions_per_item(pg):
+    client_id, autre = creer_client(pg), creer_client(pg)
+    seance, seance_autre = creer_seance(pg, client_id), creer_seance(pg, autre)
+
+    resultats = TacheDAO.add_many(client_id, [
+        {"titre": "a", "seance_etude_id": str(seance)},
+        {"titre": "b", "seance_etude_id": "pas-un-uuid"},
+        {"titre": "c", "seance_etude_id": str(seance_autre)},
+        {"titre": "d", "seance_etude_id": str(uuid.uuid4())},
+        {"titre": "e"},
+    ])
+
+    assert [r["status"] for r in resultats] == [201, 400, 404, 404, 201]
+    assert resultats[0]["tache"]["seance_etude_id"] == str(seance)
+    assert pg.query(Tache).filter_by(seance_etude_id=seance_autre).count() == 0
+    assert pg.query(Tache).filter_by(client_id=client_id).count() == 2
+
+
+def test_update_many_rejects_foreign_sessions_and_unknown_tasks(pg):
+    client_id, autre = creer_client(pg), creer_client(pg)
+    seance, seance_autre = creer_seance(pg, client_id), creer_seance(pg, autre)
+    a, b, c, d = (r["tache"]["id"] for r in TacheDAO.add_many(client_id, [{"titre": t} for t in "abcd"]))
+    tache_autre = TacheDAO.add_many(autre, [{"titre": "x"}])[0]["tache"]["id"]
+
+    resultats = TacheDAO.update_many(client_id, [
+        {"id": a, "seance_etude_id": str(seance), "statut": "en cours"},
+        {"id": b, "seance_etude_id": str(seance_autre)},
+        {"id": c, "seance_etude_id": "zz"},
+        {"id": tache_autre, "titre": "volé"},
+        {"id": "zz", "titre": "t"},
+        {"id": d, "titre": "d2"},
+    ])
+
+    assert [r["status"] for r in resultats] == [200, 404, 400, 404, 400, 200]
+    assert resultats[0]["tache"]["seance_etude_id"] == str(seance)
+    assert resultats[5]["tache"]["titre"] == "d2"
+    assert pg.get(Tache, uuid.UUID(b)).seance_etude_id is None
+    assert pg.get(Tache, uuid.UUID(tache_autre)).titre == "x"
+
+
+def test_delete_many_reports_each_id(pg):
+    client_id, autre = creer_client(pg), creer_client(pg)
+    a, b = (r["tache"]["id"] for r in TacheDAO.add_many(client_id, [{"titre": "a"}, {"titre": "b"}]))
+    tache_autre = TacheDAO.add_many(autre, [{"titre": "x"}])[0]["tache"]["id"]
+
+    resultats = TacheDAO.delete_many(client_id, [b, "zz", tache_autre, a])
+
+    assert [r["status"] for r in resultats] == [200, 400, 404, 200]
+    assert [resultats[0]["id"], resultats[3]["id"]] == [b, a]
+    assert pg.get(Tache, uuid.UUID(tache_autre)) is not None
+
+
+def test_add_many_rejects_wrongly_typed_fields_per_item(pg):
+    client_id = creer_client(pg)
+
+    resultats = TacheDAO.add_many(client_id, [
+        {"titre": "a", "importance": "3", "est_terminee": "true", "duree_estimee": 25.0},
+        {"titre": "b", "importance": "haute"},
+        {"titre": "c", "est_terminee": "oui"},
+        {"titre": "d", "duree_estimee": [1]},
+        {"titre": "e", "duree_reelle": 2 ** 40},
+        {"titre": "f", "description": {"x": 1}},
+        {"titre": "g", "importance": True},
+    ])
+
+    assert [r["status"] for r in resultats] == [201] + [400] * 6
+    assert [r["error"] for r in resultats[1:]] == [
+        "importance invalide", "est_terminee invalide", "duree_estimee invalide",
+        "duree_reelle invalide", "description invalide", "importance invalide",
+    ]
+    tache = resultats[0]["tache"]
+    assert (tache["importance"], tache["est_terminee"], tache["duree_estimee"]) == (3, True, 25)
+    assert pg.query(Tache).filter_by(client_id=client_id).count() == 1
+
+
+def test_update_many_rejects_wrongly_typed_fields_per_item(pg):
+    client_id = creer_client(pg)
+    a, b, c = (r["tache"]["id"] for r in TacheDAO.add_many(client_id, [{"titre": t} for t in "abc"]))
+
+    resultats = TacheDAO.update_many(client_id, [
+        {"id": a, "importance": 2, "est_terminee": 1},
+        {"id": b, "est_terminee": "oui"},
+        {"id": c, "duree_estimee": "vingt"},
+    ])
+
+    assert [r["status"] for r in resultats] == [200, 400, 400]
+    assert (resultats[0]["tache"]["importance"], resultats[0]["tache"]["est_terminee"]) == (2, True)
+    assert pg.get(Tache, uuid.UUID(b)).est_terminee is False
@@ -4,18 +4,34 @@ from flask_jwt_extended import (
     JWTManager, jwt_required, get_jwt_identity
 )
 from config import Config
+import dao_client
+from common.circuit_breaker import UPSTREAM_ERRORS, register_upstream_error_handlers
+from common.compression import init_compression
+from common.health import register_dao_health
+from common.tracing import init_tracing
+from common import revocation
+from common.conditional import forward_validators, relay_response
 from dao_client import (
     insert_seance,
     update_minuterie,
     update_seance_statut,
     get_seances_by_user,
+    get_seances_batch,
     end_seance
 )
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)
+CORS(app, supports_credentials=True, expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID", "Server-Timing"])
 app.config.from_object(Config)
 jwt = JWTManager(app)
+# DAO indisponible : 503 immédiat avec Retry-After (au lieu de bloquer le worker)
+register_upstream_error_handlers(app)
+# Corps JSON compressés (gzip/brotli) au-delà de COMPRESSION_MIN_SIZE
+init_compression(app)
+# X-Request-ID et Server-Timing (JWT, appels au DAO et étapes du DAO, sérialisation)
+init_tracing(app, "seance", jwt=jwt)
+# Jetons révoqués (comptes désactivés/supprimés, déconnexions) vérifiés en mémoire
+revocation.init_revocation(app, jwt, dao_client.dao)
 
 @app.route("/seances", methods=["POST"])
 @jwt_required()
@@ -51,8 +67,13 @@ def changer_statut(seance_id):
 @jwt_required()
 def historique():
     user_id = get_jwt_identity()
-    res = get_seances_by_user(user_id)
-    return jsonify(res.json()), res.status_code
+    # Pagination optionnelle : ?limit=...&cursor=... (curseur renvoyé dans X-Next-Cursor)
+    res = get_seances_by_user(
+        user_id, limit=request.args.get("limit"), cursor=request.args.get("cursor"),
+        validators=forward_validators()
+    )
+    # 304 relayé tel quel ; sinon corps, ETag et curseur de la page suivante
+    return relay_response(res, headers=("X-Next-Cursor",))
 
 @app.route("/seances/<seance_id>/terminer", methods=["PATCH"])
 @jwt_required()
@@ -68,9 +89,25 @@ def terminer_seance_endpoint(seance_id):
 
         res = end_seance(seance_id, data)
         return jsonify(res.json()), res.status_code
+    except UPSTREAM_ERRORS:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+# Lecture groupée : {"ids": [...]} -> {"seances": [...], "introuvables": [...], "invalides": [...]}
+@app.route("/seances/batch/get", methods=["POST"])
+@jwt_required()
+def seances_batch():
+    user_id = get_jwt_identity()
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    res = get_seances_batch(ids, user_id)
+    return jsonify(res.json()), res.status_code
+
+
+# État des appels vers DAO_SERVICE (voir common/health.py)
+register_dao_health(app, dao_client.dao, "seance")
+
 if __name__ == "__main__":
     app.run(debug=True, port=Config.SEANCE_SERVICE_PORT)
 
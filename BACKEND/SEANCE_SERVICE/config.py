@@ -1,10 +1,16 @@
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import timedelta
 
 load_dotenv()
 
-class Config:
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.settings import GatewayConfig
+
+class Config(GatewayConfig):
+    # Accès à DAO_SERVICE, disjoncteur, compression, traçage, révocations : voir common/settings.py
     DAO_URL = os.getenv("DAO_URL")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
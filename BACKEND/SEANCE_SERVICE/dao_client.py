@@ -1,23 +1,32 @@
-import requests
+# config ajoute le dossier BACKEND (paquet common partagé par les services) à sys.path
 from config import Config
+from common.http_client import create_dao_client
 
-DAO_URL = Config.DAO_URL
+# Session keep-alive, délais et nouvelles tentatives : voir common/http_client.py
+# (DAO_MODE=embedded : DAO_SERVICE appelé dans le processus, voir common/embedded.py)
+dao = create_dao_client(Config)
 
 def insert_seance(data):
-    return requests.post(f"{DAO_URL}/seance/seance", json=data)
+    return dao.post("/seance/seance", json=data)
 
 
 def update_minuterie(seance_id, payload):
-    return requests.patch(f"{DAO_URL}/seance/seance/{seance_id}/minuterie", json=payload)
+    return dao.patch(f"/seance/seance/{seance_id}/minuterie", json=payload)
 
 def update_seance_statut(seance_id, statut):
-    return requests.patch(f"{DAO_URL}/seance/seance/{seance_id}/statut", json={"statut": statut})
+    return dao.patch(f"/seance/seance/{seance_id}/statut", json={"statut": statut})
 
-def get_seances_by_user(user_id):
-    return requests.get(f"{DAO_URL}/seance/seance/utilisateur/{user_id}")
+def get_seances_by_user(user_id, limit=None, cursor=None, validators=None):
+    # validators : If-None-Match du navigateur, pour un 304 du DAO si l'historique n'a pas changé
+    params = {k: v for k, v in (("limit", limit), ("cursor", cursor)) if v}
+    return dao.get(f"/seance/seance/utilisateur/{user_id}", params=params, headers=validators)
 
 def end_seance(seance_id, data):
     """
     Sends a PATCH request to the DAO service to end a seance.
     """
-    return requests.patch(f"{DAO_URL}/seance/seance/{seance_id}/terminer", json=data)
\ No newline at end of file
+    return dao.patch(f"/seance/seance/{seance_id}/terminer", json=data)
+
+def get_seances_batch(ids, user_id):
+    # Lecture groupée : une seule requête côté DAO (id = ANY(...)), limitée aux séances de l'utilisateur
+    return dao.post("/seance/seance/batch/get", json={"ids": ids}, headers={"user-id": user_id})
@@ -2,14 +2,57 @@ from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 from config import Config
 from flask_cors import CORS
-from dao_client import get_seances, get_taches
 from statistique_logic import compute_statistiques
-from dao_client import get_seances, get_taches, save_snapshot
+from fanout import fan_out
+import dao_client
+from common.circuit_breaker import UPSTREAM_ERRORS, register_upstream_error_handlers
+from common.compression import init_compression
+from common.health import register_dao_health
+from common.tracing import init_tracing
+from common import revocation
+from dao_client import get_seances, get_taches, get_aggregats, save_snapshot
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)
+CORS(app, supports_credentials=True, expose_headers=["X-Request-ID", "Server-Timing"])
 app.config.from_object(Config)
 jwt = JWTManager(app)
+# DAO indisponible : 503 immédiat avec Retry-After (au lieu de bloquer le worker)
+register_upstream_error_handlers(app)
+# Corps JSON compressés (gzip/brotli) au-delà de COMPRESSION_MIN_SIZE
+init_compression(app)
+# X-Request-ID et Server-Timing (JWT, appels au DAO et étapes du DAO, sérialisation)
+init_tracing(app, "statistique", jwt=jwt)
+# Jetons révoqués (comptes désactivés/supprimés, déconnexions) vérifiés en mémoire
+revocation.init_revocation(app, jwt, dao_client.dao)
+
+def collect_statistiques(client_id):
+    """
+    Statistiques d'un client : agrégats calculés en SQL par le DAO si l'endpoint
+    est disponible, sinon calcul à partir des listes complètes de séances et de tâches.
+    Retourne None si le DAO n'a pas pu fournir les données.
+    """
+    aggregats_response = get_aggregats(client_id)
+    if aggregats_response.ok:
+        return compute_statistiques(None, None, aggregats=aggregats_response.json())
+
+    print(f"⚠️ Aggregats indisponibles ({aggregats_response.status_code}), calcul à partir des listes", flush=True)
+    # Séances et tâches sont indépendantes : les deux appels partent en même temps (fanout.py)
+    resultats = fan_out({
+        "seances": lambda: get_seances(client_id),
+        "taches": lambda: get_taches(client_id),
+    })
+    print(f"🎯 Seance: {resultats['seances'].describe()}", flush=True)
+    print(f"📝 Tache: {resultats['taches'].describe()}", flush=True)
+
+    for r in resultats.values():
+        # DAO indisponible (circuit ouvert, injoignable) : traité par register_upstream_error_handlers
+        if isinstance(r.error, UPSTREAM_ERRORS):
+            raise r.error
+    if not all(r.ok and r.value.ok for r in resultats.values()):
+        return None
+
+    return compute_statistiques(resultats["seances"].value.json(), resultats["taches"].value.json())
+
 
 @app.route("/statistique", methods=["GET"])
 @jwt_required()
@@ -18,24 +61,15 @@ def get_statistique():
     print(f"📌 client_id: {client_id}", flush=True)
 
     try:
-        seance_response = get_seances(client_id)
-        print(f"🎯 Seance status: {seance_response.status_code}", flush=True)
-        print(f"🎯 Seance response: {seance_response.text}", flush=True)
-
-        tache_response = get_taches(client_id)
-        print(f"📝 Tache status: {tache_response.status_code}", flush=True)
-        print(f"📝 Tache response: {tache_response.text}", flush=True)
-
-        if not seance_response.ok or not tache_response.ok:
+        stats = collect_statistiques(client_id)
+        if stats is None:
             return jsonify({"error": "Failed to fetch from DAO"}), 500
 
-        seances = seance_response.json()
-        taches = tache_response.json()
-
-        stats = compute_statistiques(seances, taches)
         stats["client_id"] = client_id
         return jsonify(stats), 200
 
+    except UPSTREAM_ERRORS:
+        raise
     except Exception as e:
         print(f"🔥 ERROR: {e}", flush=True)
         return jsonify({"error": str(e)}), 500
@@ -47,25 +81,24 @@ def save_statistique_snapshot():
     print(f"📌 Saving snapshot for client_id: {client_id}", flush=True)
 
     try:
-        seance_response = get_seances(client_id)
-        tache_response = get_taches(client_id)
-
-        if not seance_response.ok or not tache_response.ok:
+        stats = collect_statistiques(client_id)
+        if stats is None:
             return jsonify({"error": "Failed to fetch from DAO"}), 500
 
-        seances = seance_response.json()
-        taches = tache_response.json()
-
-        stats = compute_statistiques(seances, taches)
         stats["client_id"] = client_id
 
         save_snapshot(stats)
         return jsonify({"message": "Snapshot enregistré"}), 201
 
+    except UPSTREAM_ERRORS:
+        raise
     except Exception as e:
         print(f"🔥 ERROR: {e}", flush=True)
         return jsonify({"error": str(e)}), 500
 
 
+# État des appels vers DAO_SERVICE (voir common/health.py)
+register_dao_health(app, dao_client.dao, "statistique")
+
 if __name__ == "__main__":
     app.run(debug=True, port=Config.STATISTIQUE_SERVICE_PORT)
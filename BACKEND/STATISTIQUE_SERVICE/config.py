@@ -1,13 +1,23 @@
 from datetime import timedelta
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class Config:
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.settings import GatewayConfig
+
+class Config(GatewayConfig):
+    # Accès à DAO_SERVICE, disjoncteur, compression, traçage, révocations : voir common/settings.py
     DAO_URL = os.getenv("DAO_URL")
     STATISTIQUE_SERVICE_PORT = int(os.getenv("STATISTIQUE_SERVICE_PORT", 5012))
 
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
\ No newline at end of file
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+
+    # Appels simultanés vers DAO_SERVICE (voir fanout.py)
+    FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", 8))
+    FANOUT_DEADLINE_S = float(os.getenv("FANOUT_DEADLINE_S", 5))
@@ -1,16 +1,23 @@
-import requests
+# config ajoute le dossier BACKEND (paquet common partagé par les services) à sys.path
 from config import Config
+from common.http_client import create_dao_client
 
-DAO_URL = Config.DAO_URL
+# Session keep-alive, délais et nouvelles tentatives : voir common/http_client.py
+# (DAO_MODE=embedded : DAO_SERVICE appelé dans le processus, voir common/embedded.py)
+dao = create_dao_client(Config)
 
 def get_seances(client_id):
-    return requests.get(f"{DAO_URL}/seance/seance/utilisateur/{client_id}")
+    return dao.get(f"/seance/seance/utilisateur/{client_id}")
 
 def get_taches(client_id):
-    return requests.get(f"{DAO_URL}/tache/taches", headers={"user-id": client_id})
+    return dao.get("/tache/taches", headers={"user-id": client_id})
+
+def get_aggregats(client_id):
+    # Agrégats statistiques calculés en SQL par le DAO
+    return dao.get(f"/statistique/aggregats/{client_id}")
 
 def save_snapshot(stats):
-    response = requests.post(f"{DAO_URL}/statistique/snapshot", json=stats)
+    response = dao.post("/statistique/snapshot", json=stats)
     if not response.ok:
         print(f"⚠️ DAO responded with error: {response.status_code} - {response.text}", flush=True)
     else:
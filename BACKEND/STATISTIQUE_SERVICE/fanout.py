@@ -0,0 +1,74 @@
+# fanout.py
+"""
+Exécution simultanée d'appels indépendants vers DAO_SERVICE.
+
+Les appels sont soumis à un pool de threads borné (partagé par toutes les
+requêtes du service) et attendus jusqu'à une échéance globale : le coût d'un
+fan-out est celui de l'appel le plus lent, pas la somme des appels. Chaque
+appel a son propre résultat : un échec ou un dépassement n'annule pas les autres.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from config import Config
+
+_executor = ThreadPoolExecutor(max_workers=Config.FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+
+
+class FanoutResult:
+    """Résultat d'un appel : valeur, exception ou dépassement de l'échéance."""
+
+    def __init__(self, value=None, error=None, timed_out=False, duree_ms=None):
+        self.value = value
+        self.error = error
+        self.timed_out = timed_out
+        self.duree_ms = duree_ms
+
+    @property
+    def ok(self):
+        return self.error is None and not self.timed_out
+
+    def describe(self):
+        if self.timed_out:
+            return "échéance dépassée"
+        if self.error is not None:
+            return f"erreur : {self.error!r}"
+        status = getattr(self.value, "status_code", None)
+        return f"{status if status is not None else 'ok'} en {self.duree_ms:.1f} ms"
+
+
+def _timed(fn):
+    debut = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - debut) * 1000
+
+
+def fan_out(calls, deadline=None):
+    """
+    Exécute simultanément les appels de `calls` ({nom: fonction sans argument})
+    et retourne {nom: FanoutResult} une fois tous terminés ou l'échéance atteinte
+    (`deadline` en secondes, FANOUT_DEADLINE_S par défaut).
+
+    Les appels non terminés à l'échéance sont abandonnés : leur thread se libère
+    au plus tard au délai de lecture du client HTTP (DAO_READ_TIMEOUT).
+    """
+    deadline = Config.FANOUT_DEADLINE_S if deadline is None else deadline
+    # Chaque appel s'exécute dans une copie du contexte courant (contextvars : traces, etc.)
+    futures = {
+        nom: _executor.submit(contextvars.copy_context().run, _timed, fn)
+        for nom, fn in calls.items()
+    }
+    wait(futures.values(), timeout=deadline)
+
+    resultats = {}
+    for nom, future in futures.items():
+        if not future.done():
+            future.cancel()   # sans effet si l'appel a déjà démarré
+            resultats[nom] = FanoutResult(timed_out=True)
+        elif future.exception() is not None:
+            resultats[nom] = FanoutResult(error=future.exception())
+        else:
+            value, duree_ms = future.result()
+            resultats[nom] = FanoutResult(value=value, duree_ms=duree_ms)
+    return resultats
@@ -3,8 +3,12 @@ from datetime import datetime, timedelta
 import calendar
 
 
-def compute_statistiques(seances, taches):
-    now = datetime.utcnow()
+def aggregate(seances, taches, now=None):
+    """
+    Calcule en Python, à partir des listes complètes, les mêmes agrégats
+    que l'endpoint DAO /statistique/aggregats/<client_id>.
+    """
+    now = now or datetime.utcnow()
     jours_actifs = set()
     total_pomodoros = 0
 
@@ -14,16 +18,11 @@ def compute_statistiques(seances, taches):
     overdue_tasks = sum(
         1 for t in taches if not t.get("est_terminee") and t.get("date_fin") and t["date_fin"] < now.isoformat()
     )
-    taux_completion = completed_tasks / total_tasks if total_tasks else 0
-
-    if taches:
-        first_task_date = min(
-            datetime.fromisoformat(t["date_creation"]) for t in taches if t.get("date_creation")
-        )
-        days_range = max(1, (now - first_task_date).days)
-        taches_par_jour = total_tasks / days_range
-    else:
-        taches_par_jour = 0
+    first_task_date = min(
+        (t["date_creation"] for t in taches if t.get("date_creation")),
+        key=datetime.fromisoformat,
+        default=None
+    )
 
     # --- Task status breakdown ---
     tasks_by_status = defaultdict(int)
@@ -49,20 +48,49 @@ def compute_statistiques(seances, taches):
         else:
             break
 
-    # --- Activity per weekday ---
+    # --- Activity per weekday (clés ISO : "1" = lundi ... "7" = dimanche) ---
     weekday_counts = defaultdict(int)
     for s in seances:
         if s.get("date_debut"):
             dt = datetime.fromisoformat(s["date_debut"])
-            weekday = calendar.day_name[dt.weekday()]
-            weekday_counts[weekday] += 1
+            weekday_counts[str(dt.isoweekday())] += 1
+
+    return {
+        "total_taches": total_tasks,
+        "taches_completees": completed_tasks,
+        "taches_retard": overdue_tasks,
+        "premiere_date_tache": first_task_date,
+        "taches_par_statut": dict(tasks_by_status),
+        "total_pomodoros": total_pomodoros,
+        "derniere_date_active": max((s["date_debut"] for s in seances if s.get("date_debut")), default=None),
+        "jours_actifs": len(jours_actifs),
+        "serie_jours_actifs": streak,
+        "seances_par_jour_semaine": dict(weekday_counts),
+    }
+
 
+def compute_statistiques_from_aggregats(aggregats, now=None):
+    # Construit les statistiques finales à partir des agrégats (calculés par le DAO ou par aggregate())
+    now = now or datetime.utcnow()
+
+    total_tasks = aggregats["total_taches"]
+    completed_tasks = aggregats["taches_completees"]
+    total_pomodoros = aggregats["total_pomodoros"]
+    taux_completion = completed_tasks / total_tasks if total_tasks else 0
+
+    if total_tasks:
+        first_task_date = aggregats.get("premiere_date_tache")
+        days_range = max(1, (now - datetime.fromisoformat(first_task_date)).days) if first_task_date else 1
+        taches_par_jour = total_tasks / days_range
+    else:
+        taches_par_jour = 0
+
+    weekday_counts = aggregats.get("seances_par_jour_semaine") or {}
     activite_par_jour = {
-        day: round(weekday_counts.get(day, 0) / max(1, len(jours_actifs)), 2)
-        for day in calendar.day_name
+        day: round(weekday_counts.get(str(index + 1), 0) / max(1, aggregats["jours_actifs"]), 2)
+        for index, day in enumerate(calendar.day_name)
     }
     meilleur_jour = max(activite_par_jour.items(), key=lambda x: x[1])[0] if activite_par_jour else None
-    derniere_date = max((s["date_debut"] for s in seances if s.get("date_debut")), default=None)
 
     # --- Focus score logic (normalized to 0–100) ---
     if completed_tasks > 0 and total_tasks > 0:
@@ -79,13 +107,24 @@ def compute_statistiques(seances, taches):
         "nbre_taches_completees": completed_tasks,
         "taux_completion_taches": round(taux_completion, 2),
         "nbre_taches_par_jour": round(taches_par_jour, 2),
-        "nbre_taches_retard": overdue_tasks,
-        "nbre_jours_consecutifs_actifs": streak,
-        "derniere_date_active": derniere_date,
+        "nbre_taches_retard": aggregats["taches_retard"],
+        "nbre_jours_consecutifs_actifs": aggregats["serie_jours_actifs"],
+        "derniere_date_active": aggregats.get("derniere_date_active"),
         "focus_score": normalized_focus_score,
         "meilleur_jour": meilleur_jour,
         "activite_par_jour_semaine": activite_par_jour,
         "date_mise_a_jour": now.isoformat(),
-        "tasks_by_status": dict(tasks_by_status),
+        "tasks_by_status": dict(aggregats.get("taches_par_statut") or {}),
         "total_tasks": total_tasks,
     }
+
+
+def compute_statistiques(seances, taches, aggregats=None):
+    """
+    Statistiques d'un client. Si les agrégats SQL du DAO sont fournis, ils sont
+    utilisés directement ; sinon ils sont recalculés à partir des listes complètes.
+    """
+    now = datetime.utcnow()
+    if aggregats is None:
+        aggregats = aggregate(seances, taches, now)
+    return compute_statistiques_from_aggregats(aggregats, now)
@@ -0,0 +1,46 @@
+import contextvars
+import time
+
+from fanout import fan_out
+
+requete = contextvars.ContextVar("requete", default=None)
+
+
+def test_calls_run_concurrently():
+    debut = time.perf_counter()
+    resultats = fan_out({
+        "seances": lambda: time.sleep(0.2) or "s",
+        "taches": lambda: time.sleep(0.2) or "t",
+    }, deadline=2)
+
+    assert time.perf_counter() - debut < 0.35
+    assert resultats["seances"].value == "s"
+    assert resultats["taches"].value == "t"
+
+
+def test_partial_failure_keeps_other_results():
+    def echec():
+        raise ConnectionError("DAO injoignable")
+
+    resultats = fan_out({"seances": echec, "taches": lambda: "t"}, deadline=2)
+
+    assert not resultats["seances"].ok
+    assert isinstance(resultats["seances"].error, ConnectionError)
+    assert resultats["taches"].ok
+
+
+def test_deadline_bounds_total_wait():
+    debut = time.perf_counter()
+    resultats = fan_out({"lent": lambda: time.sleep(1), "rapide": lambda: "r"}, deadline=0.1)
+
+    assert time.perf_counter() - debut < 0.5
+    assert resultats["lent"].timed_out
+    assert resultats["rapide"].value == "r"
+
+
+def test_context_is_propagated_to_workers():
+    requete.set("abc")
+
+    resultats = fan_out({"a": requete.get}, deadline=2)
+
+    assert resultats["a"].value == "abc"
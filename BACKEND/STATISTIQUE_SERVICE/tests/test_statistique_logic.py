@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from statistique_logic import aggregate, compute_statistiques
+
+
+NOW = datetime(2025, 7, 10, 12, 0, 0)
+
+SEANCES = [
+    {"date_debut": "2025-07-10T09:00:00", "nbre_pomodoro_effectues": 2},
+    {"date_debut": "2025-07-10T15:00:00", "nbre_pomodoro_effectues": 1},
+    {"date_debut": "2025-07-09T09:00:00", "nbre_pomodoro_effectues": 3},
+    {"date_debut": "2025-07-06T09:00:00", "nbre_pomodoro_effectues": 0},
+]
+
+TACHES = [
+    {"est_terminee": True, "date_fin": None, "date_creation": "2025-07-01T08:00:00", "statut": "Fait"},
+    {"est_terminee": False, "date_fin": "2025-07-09T00:00:00", "date_creation": "2025-07-05T08:00:00", "statut": "En cours"},
+    {"est_terminee": None, "date_fin": "2025-07-20T00:00:00", "date_creation": "2025-07-06T08:00:00", "statut": None},
+]
+
+
+def test_aggregate():
+    aggregats = aggregate(SEANCES, TACHES, NOW)
+
+    assert aggregats["total_taches"] == 3
+    assert aggregats["taches_completees"] == 1
+    assert aggregats["taches_retard"] == 1
+    assert aggregats["premiere_date_tache"] == "2025-07-01T08:00:00"
+    assert aggregats["taches_par_statut"] == {"fait": 1, "en cours": 1, "Autre": 1}
+    assert aggregats["total_pomodoros"] == 6
+    assert aggregats["jours_actifs"] == 3
+    assert aggregats["serie_jours_actifs"] == 2
+    assert aggregats["seances_par_jour_semaine"] == {"4": 2, "3": 1, "7": 1}
+    assert aggregats["derniere_date_active"] == "2025-07-10T15:00:00"
+
+
+def test_compute_statistiques_same_result_from_aggregats():
+    depuis_listes = compute_statistiques(SEANCES, TACHES)
+    depuis_aggregats = compute_statistiques(None, None, aggregats=aggregate(SEANCES, TACHES))
+
+    depuis_listes.pop("date_mise_a_jour")
+    depuis_aggregats.pop("date_mise_a_jour")
+    assert depuis_listes == depuis_aggregats
+    assert depuis_listes["meilleur_jour"] == "Thursday"
+
+
+def test_compute_statistiques_empty():
+    stats = compute_statistiques([], [])
+
+    assert stats["total_tasks"] == 0
+    assert stats["nbre_jours_consecutifs_actifs"] == 0
+    assert stats["focus_score"] == 0
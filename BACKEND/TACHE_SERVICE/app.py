@@ -4,18 +4,36 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 from config import Config
 import dao_client
+from common.circuit_breaker import register_upstream_error_handlers
+from common.compression import init_compression
+from common.health import register_dao_health
+from common.tracing import init_tracing
+from common import revocation
+from common.conditional import forward_validators, relay_response
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID", "Server-Timing"])
 app.config.from_object(Config)
 jwt = JWTManager(app)
+# DAO indisponible : 503 immédiat avec Retry-After (au lieu de bloquer le worker)
+register_upstream_error_handlers(app)
+# Corps JSON compressés (gzip/brotli) au-delà de COMPRESSION_MIN_SIZE
+init_compression(app)
+# X-Request-ID et Server-Timing (JWT, appels au DAO et étapes du DAO, sérialisation)
+init_tracing(app, "tache", jwt=jwt)
+# Jetons révoqués (comptes désactivés/supprimés, déconnexions) vérifiés en mémoire
+revocation.init_revocation(app, jwt, dao_client.dao)
 
 @app.route("/taches", methods=["GET"])
 @jwt_required()
 def get_taches():
     user_id = get_jwt_identity()
-    result = dao_client.get_all_taches(user_id)
-    return jsonify(result.json()), result.status_code
+    # Filtres et pagination (limit, cursor) sont transmis tels quels au DAO, ainsi que If-None-Match
+    result = dao_client.get_all_taches(
+        user_id, filters=list(request.args.items(multi=True)), validators=forward_validators()
+    )
+    # 304 relayé tel quel ; sinon corps, ETag et curseur de la page suivante
+    return relay_response(result, headers=("X-Next-Cursor",))
 
 
 @app.route('/taches/seance/<seance_id>', methods=['GET'])
@@ -73,5 +91,43 @@ def delete_tache(tache_id):
     result = dao_client.delete_tache(tache_id, user_id)
     return jsonify(result.json()), result.status_code
 
+# --- Opérations par lot : {"taches": [...]} ou {"ids": [...]}, un résultat par élément ---
+@app.route("/taches/batch", methods=["POST"])
+@jwt_required()
+def add_taches_batch():
+    user_id = get_jwt_identity()
+    taches = (request.get_json(silent=True) or {}).get("taches")
+    result = dao_client.add_taches_batch(taches, user_id)
+    return jsonify(result.json()), result.status_code
+
+@app.route("/taches/batch", methods=["PUT"])
+@jwt_required()
+def update_taches_batch():
+    user_id = get_jwt_identity()
+    taches = (request.get_json(silent=True) or {}).get("taches")
+    result = dao_client.update_taches_batch(taches, user_id)
+    return jsonify(result.json()), result.status_code
+
+@app.route("/taches/batch", methods=["DELETE"])
+@jwt_required()
+def delete_taches_batch():
+    user_id = get_jwt_identity()
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    result = dao_client.delete_taches_batch(ids, user_id)
+    return jsonify(result.json()), result.status_code
+
+
+# --- Lecture groupée : {"ids": [...]} -> {"taches": [...], "introuvables": [...], "invalides": [...]} ---
+@app.route("/taches/batch/get", methods=["POST"])
+@jwt_required()
+def get_taches_batch():
+    user_id = get_jwt_identity()
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    result = dao_client.get_taches_batch(ids, user_id)
+    return jsonify(result.json()), result.status_code
+
+# État des appels vers DAO_SERVICE (voir common/health.py)
+register_dao_health(app, dao_client.dao, "tache")
+
 if __name__ == "__main__":
     app.run(port=int(os.getenv("PORT")), debug=True)
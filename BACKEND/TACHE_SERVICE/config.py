@@ -1,9 +1,15 @@
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class Config:
+# Le paquet BACKEND/common est partagé par les services, lancés chacun depuis leur dossier
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.settings import GatewayConfig
+
+class Config(GatewayConfig):
+    # Accès à DAO_SERVICE, disjoncteur, compression, traçage, révocations : voir common/settings.py
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     DAO_URL = os.getenv("DAO_URL")
     PORT = int(os.getenv("PORT", 5003))
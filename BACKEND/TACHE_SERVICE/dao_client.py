@@ -1,31 +1,53 @@
-import requests
+# config ajoute le dossier BACKEND (paquet common partagé par les services) à sys.path
 from config import Config
+from common.http_client import create_dao_client
 
-DAO_URL = Config.DAO_URL
+# Session keep-alive, délais et nouvelles tentatives : voir common/http_client.py
+# (DAO_MODE=embedded : DAO_SERVICE appelé dans le processus, voir common/embedded.py)
+dao = create_dao_client(Config)
 
-def get_all_taches(user_id):
-    return requests.get(f"{DAO_URL}/tache/taches", headers={"user-id": user_id})
+def get_all_taches(user_id, filters=None, validators=None):
+    # Les filtres (statut, est_terminee, priorite, date_fin_min/max...) sont appliqués en SQL par le DAO
+    # validators : If-None-Match du navigateur, pour un 304 du DAO si la liste n'a pas changé
+    return dao.get("/tache/taches", params=filters, headers={"user-id": user_id, **(validators or {})})
 
 
 def get_taches_by_seance(user_id, seance_id):
-    response = requests.get(f"{DAO_URL}/tache/taches", headers={"user-id": user_id})
+    response = dao.get(
+        "/tache/taches",
+        params={"seance_etude_id": seance_id},
+        headers={"user-id": user_id}
+    )
 
     if response.status_code != 200:
         return {"error": "Unable to fetch tasks", "details": response.json()}, response.status_code
 
-    all_taches = response.json()
-    taches_for_seance = [t for t in all_taches if t.get("seance_etude_id") == seance_id]
-    return taches_for_seance
+    return response.json()
 
 
 def get_tache_by_id(tache_id, user_id):
-    return requests.get(f"{DAO_URL}/tache/{tache_id}", headers={"user-id": user_id})
+    return dao.get(f"/tache/{tache_id}", headers={"user-id": user_id})
 
 def add_tache(tache_data, user_id):
-    return requests.post(f"{DAO_URL}/tache/add", json=tache_data, headers={"user-id": user_id})
+    return dao.post("/tache/add", json=tache_data, headers={"user-id": user_id})
 
 def update_tache(tache_id, tache_data, user_id):
-    return requests.put(f"{DAO_URL}/tache/update/{tache_id}", json=tache_data, headers={"user-id": user_id}) # APPELER LA ROUTE UPDATE DANS DAO_SERVICE ET RETOURNER REPONSE A APP.PY
+    return dao.put(f"/tache/update/{tache_id}", json=tache_data, headers={"user-id": user_id}) # APPELER LA ROUTE UPDATE DANS DAO_SERVICE ET RETOURNER REPONSE A APP.PY
 
 def delete_tache(tache_id, user_id):
-    return requests.delete(f"{DAO_URL}/tache/delete/{tache_id}", headers={"user-id": user_id}) # APPELER LA ROUTE DELETE DANS DAO_SERVICE ET RETOURNER REPONSE A APP.PY
+    return dao.delete(f"/tache/delete/{tache_id}", headers={"user-id": user_id}) # APPELER LA ROUTE DELETE DANS DAO_SERVICE ET RETOURNER REPONSE A APP.PY
+
+
+# --- Opérations par lot (une seule transaction côté DAO) ---
+def add_taches_batch(taches, user_id):
+    return dao.post("/tache/batch", json={"taches": taches}, headers={"user-id": user_id})
+
+def update_taches_batch(taches, user_id):
+    return dao.put("/tache/batch", json={"taches": taches}, headers={"user-id": user_id})
+
+def delete_taches_batch(ids, user_id):
+    return dao.delete("/tache/batch", json={"ids": ids}, headers={"user-id": user_id})
+
+def get_taches_batch(ids, user_id):
+    # Lecture groupée : une seule requête côté DAO (id = ANY(...)), propriété vérifiée dans la même requête
+    return dao.post("/tache/batch/get", json={"ids": ids}, headers={"user-id": user_id})
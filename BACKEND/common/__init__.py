@@ -0,0 +1 @@
+"""Modules partagés par les services du BACKEND (client HTTP interne vers DAO_SERVICE, ...)."""
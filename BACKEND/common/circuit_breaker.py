@@ -0,0 +1,172 @@
+# common/circuit_breaker.py
+"""
+Disjoncteur (circuit breaker) par service amont, utilisé par DaoHttpClient.
+
+- fermé : les appels passent ; le taux d'échec est mesuré sur les `window`
+  derniers appels (au moins `min_calls`)
+- ouvert : au-delà de `failure_rate`, les appels échouent immédiatement
+  (CircuitOpenError) pendant `open_seconds`, sans occuper de thread
+- semi-ouvert : passé ce délai, `half_open_calls` appels de sonde sont
+  autorisés ; un succès referme le circuit, un échec le rouvre. Seul le
+  résultat d'une sonde compte : before_call retourne un jeton de sonde à
+  repasser à record_success/record_failure, et un appel lent émis avant
+  l'ouverture ne referme pas le circuit en se terminant
+
+Les gateways traduisent CircuitOpenError en 503 avec Retry-After
+(register_upstream_error_handlers).
+"""
+import math
+import threading
+import time
+from collections import deque
+
+import requests
+from flask import jsonify
+
+CLOSED = "ferme"
+OPEN = "ouvert"
+HALF_OPEN = "semi-ouvert"
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé sans être émis : le circuit vers le service amont est ouvert."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuit {name} ouvert, nouvel essai dans {retry_after} s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+# Service amont indisponible : circuit ouvert, connexion impossible ou délai dépassé
+UPSTREAM_ERRORS = (CircuitOpenError, requests.ConnectionError, requests.Timeout)
+
+
+class CircuitBreaker:
+    def __init__(self, name="dao", failure_rate=0.5, min_calls=10, window=20,
+                 open_seconds=15.0, half_open_calls=1, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)   # True = échec
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = set()                    # jetons des sondes en cours (semi-ouvert)
+        self._probe_started_at = 0.0
+        self.rejected = 0
+        self.openings = 0
+
+    @classmethod
+    def from_config(cls, config, name="dao"):
+        return cls(
+            name,
+            failure_rate=getattr(config, "DAO_BREAKER_FAILURE_RATE", 0.5),
+            min_calls=getattr(config, "DAO_BREAKER_MIN_CALLS", 10),
+            window=getattr(config, "DAO_BREAKER_WINDOW", 20),
+            open_seconds=getattr(config, "DAO_BREAKER_OPEN_S", 15.0),
+            half_open_calls=getattr(config, "DAO_BREAKER_HALF_OPEN_CALLS", 1),
+        )
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        # Ouvert depuis plus de open_seconds : on passe en semi-ouvert
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes.clear()
+        return self._state
+
+    def _retry_after(self):
+        restant = self.open_seconds - (self._clock() - self._opened_at)
+        return max(1, math.ceil(restant))
+
+    def before_call(self):
+        # Lève CircuitOpenError si l'appel doit échouer immédiatement ; retourne le jeton de sonde
+        # (semi-ouvert) ou None, à repasser à record_success/record_failure
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return None
+            if state == HALF_OPEN:
+                # Une sonde restée sans résultat au-delà de open_seconds ne bloque pas le circuit
+                if len(self._probes) >= self.half_open_calls and self._clock() - self._probe_started_at >= self.open_seconds:
+                    self._probes.clear()
+                if len(self._probes) < self.half_open_calls:
+                    probe = object()
+                    self._probes.add(probe)
+                    self._probe_started_at = self._clock()
+                    return probe
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self._retry_after() if state == OPEN else 1)
+
+    def record_success(self, probe=None):
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN:
+                # Sonde réussie : le service amont répond de nouveau (autre appel en retard : ignoré)
+                if probe in self._probes:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    self._probes.clear()
+                return
+            if state == OPEN or probe is not None:
+                return
+            self._outcomes.append(False)
+
+    def record_failure(self, probe=None):
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN:
+                if probe in self._probes:
+                    self._probes.clear()
+                    self._open()
+                return
+            if state == OPEN or probe is not None:
+                return
+            self._outcomes.append(True)
+            if len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self.openings += 1
+
+    def snapshot(self):
+        with self._lock:
+            state = self._current_state()
+            return {
+                "etat": state,
+                "appels_fenetre": len(self._outcomes),
+                "echecs_fenetre": sum(self._outcomes),
+                "refus": self.rejected,
+                "ouvertures": self.openings,
+                "retry_after_s": self._retry_after() if state == OPEN else 0,
+            }
+
+
+def register_upstream_error_handlers(app):
+    # Service amont indisponible : réponse immédiate 503 (504 si délai dépassé) au lieu d'une erreur 500
+    @app.errorhandler(CircuitOpenError)
+    def _circuit_open(e):
+        response = jsonify({"error": "Service temporairement indisponible"})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 503
+
+    @app.errorhandler(requests.Timeout)
+    def _upstream_timeout(e):
+        return jsonify({"error": "Le service de données ne répond pas"}), 504
+
+    @app.errorhandler(requests.ConnectionError)
+    def _upstream_unreachable(e):
+        response = jsonify({"error": "Service de données injoignable"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
@@ -0,0 +1,143 @@
+# common/compression.py
+"""
+Compression des réponses HTTP selon Accept-Encoding (brotli si disponible, sinon gzip).
+
+init_compression(app) est appelé par les cinq applications Flask. Les réponses
+en mémoire sous COMPRESSION_MIN_SIZE octets ne sont pas compressées (le gain
+ne couvre pas le coût). Les réponses en streaming sont compressées au fil de
+l'eau, paquet par paquet, sans être mises en mémoire.
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seul
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-msgpack", "application/javascript")
+
+
+def supported_encodings():
+    # Encodages proposés, par ordre de préférence
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accept_encoding_header():
+    # Valeur d'Accept-Encoding envoyée par les clients internes (dao_client)
+    return ", ".join(supported_encodings())
+
+
+def choose_encoding(accept_encoding):
+    """Meilleur encodage accepté par le client (q > 0), ou None."""
+    if not accept_encoding:
+        return None
+    qualites = {}
+    for element in accept_encoding.split(","):
+        nom, _, params = element.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualites[nom.strip().lower()] = q
+    meilleur = None
+    for encodage in supported_encodings():
+        q = qualites.get(encodage, qualites.get("*", 0.0))
+        if q > 0 and (meilleur is None or q > meilleur[1]):
+            meilleur = (encodage, q)
+    return meilleur[0] if meilleur else None
+
+
+class _Compressor:
+    """Interface commune gzip / brotli pour la compression incrémentale."""
+
+    def __init__(self, encoding, gzip_level, brotli_quality):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 : en-tête et somme de contrôle gzip
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        # Compresse un paquet et le rend immédiatement disponible au client (streaming)
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush(zlib.Z_FINISH)
+
+    def compress(self, data):
+        # Corps complet en une fois
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.finish()
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH)
+
+
+def _compress_stream(chunks, compressor):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                data = compressor.chunk(chunk)
+                if data:
+                    yield data
+        yield compressor.finish()
+    finally:
+        # Libère le générateur d'origine (curseur serveur, contexte de requête) même si le client coupe
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def init_compression(app):
+    """Enregistre la compression des réponses sur l'application (paramètres COMPRESSION_* de Config)."""
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    min_size = app.config.get("COMPRESSION_MIN_SIZE", 1024)
+    gzip_level = app.config.get("COMPRESSION_GZIP_LEVEL", 6)
+    brotli_quality = app.config.get("COMPRESSION_BROTLI_QUALITY", 4)
+
+    @app.after_request
+    def _compress(response):
+        if not _compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        compressor = _Compressor(encoding, gzip_level, brotli_quality)
+        if response.is_streamed:
+            # Taille inconnue : toujours compressé, paquet par paquet
+            response.response = _compress_stream(response.response, compressor)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compressor.compress(data))
+
+        response.headers["Content-Encoding"] = encoding
+        # Représentation différente : l'ETag ne doit pas être confondu avec celui du corps non compressé
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
@@ -0,0 +1,92 @@
+# common/conditional.py
+"""
+GET conditionnels (ETag / If-None-Match) pour le DAO et les gateways.
+
+Le DAO calcule l'ETag d'une liste à partir de la version des données du client
+(dao/version_dao.py) et répond 304 sans lire les lignes si le client possède
+déjà cette version. Les gateways transmettent If-None-Match au DAO et relaient
+l'ETag ou le 304 au navigateur.
+"""
+from flask import Response, jsonify, request
+from werkzeug.http import unquote_etag
+
+from common.wire import wants_msgpack
+
+# Réponse propre à l'utilisateur : conservée par le navigateur, revalidée à chaque usage
+CACHE_CONTROL = "private, no-cache"
+
+# Suffixes ajoutés à l'ETag par common/compression.py selon l'encodage
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def strip_encoding_suffix(etag):
+    for suffix in ENCODING_SUFFIXES:
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)]
+    return etag
+
+
+def etag_matches(etag):
+    # If-None-Match contient-il cet ETag (quel que soit l'encodage de la copie du client) ?
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    return any(strip_encoding_suffix(tag) == etag for tag in if_none_match.as_set(include_weak=True))
+
+
+def query_variant():
+    # Paramètres de la requête (filtres, page) sous forme canonique et format négocié, pour distinguer les représentations
+    variant = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    return f"{variant};msgpack" if wants_msgpack() else variant
+
+
+def not_modified(etag):
+    response = Response(status=304)
+    if etag:
+        response.set_etag(etag)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def conditional(etag, build):
+    """304 si le client a déjà la représentation `etag`, sinon la réponse construite par build()."""
+    if etag_matches(etag):
+        return not_modified(etag)
+    return with_etag(build(), etag)
+
+
+# --- Côté gateway ---
+
+def forward_validators():
+    # En-têtes de validation du navigateur à transmettre au DAO
+    if_none_match = request.headers.get("If-None-Match")
+    return {"If-None-Match": if_none_match} if if_none_match else {}
+
+
+def relay_response(dao_response, headers=()):
+    """
+    Réponse du gateway à partir d'une réponse DAO : 304 relayé tel quel, sinon
+    corps JSON réencodé avec l'ETag du DAO (sans suffixe d'encodage : la
+    compression du gateway ajoute le sien) et les en-têtes listés dans `headers`.
+    """
+    etag, _ = unquote_etag(dao_response.headers.get("ETag"))
+    etag = strip_encoding_suffix(etag) if etag else None
+    if dao_response.status_code == 304:
+        return not_modified(etag)
+
+    response = jsonify(dao_response.json())
+    response.status_code = dao_response.status_code
+    if etag and dao_response.ok:
+        with_etag(response, etag)
+    for name in headers:
+        if dao_response.headers.get(name):
+            response.headers[name] = dao_response.headers[name]
+    return response
@@ -0,0 +1,192 @@
+# common/embedded.py
+"""
+Mode embarqué : les gateways et DAO_SERVICE dans un seul processus.
+
+Avec DAO_MODE=embedded, le `dao` des dao_client est un EmbeddedDaoClient : même
+interface que DaoHttpClient (get/post/..., stats, disjoncteur), mais chaque
+appel est transmis directement à l'application Flask de DAO_SERVICE chargée
+dans le processus (routes, AuthDAO/TacheDAO/SeanceDAO/StatistiqueDAO, un seul
+pool de connexions), sans socket ni requête HTTP sur la boucle locale.
+
+Chaque service est écrit pour être lancé depuis son dossier (modules de premier
+niveau `config`, `app`, `routes`...). load_service() importe un service en
+isolant ces modules de ceux des autres services. run_embedded.py s'en sert pour
+servir toute l'API depuis un seul processus.
+"""
+import os
+import sys
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import RequestRedirect
+
+from common.circuit_breaker import CircuitBreaker
+from common.http_client import DaoHttpClient
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAO_SERVICE_DIR = os.path.join(BACKEND_DIR, "DAO_SERVICE")
+
+_import_lock = threading.RLock()
+_dao_apps = {}
+
+
+# --- Chargement isolé d'un service ---
+
+class LoadedService:
+    """Module principal d'un service et modules de premier niveau qu'il a importés."""
+
+    def __init__(self, directory, module, modules):
+        self.directory = directory
+        self.module = module
+        self.modules = modules
+
+    @property
+    def app(self):
+        return self.module.app
+
+
+def _local_names(directory):
+    # Modules et paquets de premier niveau du dossier du service (config, app, routes, dao...)
+    names = set()
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry.endswith(".py"):
+            names.add(entry[:-3])
+        elif os.path.isdir(path) and entry.isidentifier() and not entry.startswith("__"):
+            names.add(entry)
+    return names
+
+
+def _owned(name, names):
+    return name.split(".", 1)[0] in names
+
+
+def load_service(directory, module_name="app"):
+    """
+    Importe `module_name` depuis `directory` comme si le service était lancé depuis
+    son dossier, puis retire ses modules de sys.modules (en restaurant ceux qu'il
+    masquait) : le service suivant importe ainsi son propre `config`.
+    """
+    directory = os.path.abspath(directory)
+    names = _local_names(directory)
+    with _import_lock:
+        masques = {name: sys.modules.pop(name) for name in list(sys.modules) if _owned(name, names)}
+        sys.path.insert(0, directory)
+        try:
+            module = __import__(module_name)
+        finally:
+            sys.path.remove(directory)
+            charges = {name: sys.modules.pop(name) for name in list(sys.modules) if _owned(name, names)}
+            sys.modules.update(masques)
+    return LoadedService(directory, module, charges)
+
+
+def embedded_dao_app(directory=None):
+    """Application Flask de DAO_SERVICE, chargée une seule fois par processus."""
+    directory = os.path.abspath(directory or DAO_SERVICE_DIR)
+    with _import_lock:
+        app = _dao_apps.get(directory)
+        if app is None:
+            app = load_service(directory).app
+            # Une erreur dans une route DAO devient une réponse 500, comme en HTTP
+            app.config["PROPAGATE_EXCEPTIONS"] = False
+            _dao_apps[directory] = app
+        return app
+
+
+# --- Client ---
+
+def _query_string(params):
+    # Même traitement que requests : paramètres à None ignorés, listes de paires acceptées
+    if params is None or isinstance(params, (str, bytes)):
+        return params
+    items = params.items() if hasattr(params, "items") else params
+    return MultiDict([(k, v) for k, v in items if v is not None])
+
+
+def _as_requests_response(response, url):
+    # Réponse Flask déjà lue en entier, présentée comme une requests.Response aux dao_client
+    result = requests.Response()
+    result.status_code = response.status_code
+    result.reason = response.status.partition(" ")[2]
+    result.headers = CaseInsensitiveDict(response.headers.items())
+    result.url = url
+    result.encoding = response.mimetype_params.get("charset", "utf-8")
+    result._content = response.get_data()
+    return result
+
+
+class EmbeddedDaoClient(DaoHttpClient):
+    """
+    DaoHttpClient dont les appels sont servis par l'application DAO du processus.
+    Pas de nouvelle tentative ni de délai réseau ; statistiques et disjoncteur inchangés.
+    """
+
+    def __init__(self, dao_app, name="dao", breaker=None, wire_format="json", single_flight=True):
+        super().__init__("", retries=0, name=name, breaker=breaker, wire_format=wire_format,
+                         single_flight=single_flight)
+        self.dao_app = dao_app
+
+    @classmethod
+    def from_config(cls, config, name="dao"):
+        dao_app = embedded_dao_app(getattr(config, "DAO_SERVICE_DIR", None))
+        return cls(
+            dao_app, name=name, breaker=CircuitBreaker.from_config(config, name),
+            wire_format=getattr(config, "DAO_WIRE_FORMAT", "json"),
+            single_flight=getattr(config, "DAO_SINGLE_FLIGHT", True),
+        )
+
+    def _create_session(self, pool_maxsize):
+        return None
+
+    def _target(self):
+        return f"embedded:{id(self.dao_app)}"
+
+    def _send(self, method, url, timeout, params=None, json=None, data=None, headers=None):
+        client = self.dao_app.test_client(use_cookies=False)
+        # buffered : corps lu (et flux DAO fermé) avant de rendre la main au gateway
+        response = client.open(
+            url, method=method, query_string=_query_string(params),
+            json=json, data=data, headers=headers, buffered=True,
+        )
+        try:
+            return _as_requests_response(response, url)
+        finally:
+            response.close()
+
+
+# --- Serveur unique ---
+
+class ServiceDispatcher:
+    """
+    Application WSGI qui transmet chaque requête au premier service possédant une
+    route pour ce chemin. Les gateways n'ont pas de chemins en commun, hormis
+    /health/dao (servi ici par le premier) : chacun répond aussi sur
+    /health/dao/<service> (voir common/health.py).
+    """
+
+    def __init__(self, apps):
+        self.apps = list(apps)
+
+    def _select(self, environ):
+        methode_refusee = None
+        for app in self.apps:
+            adapter = app.url_map.bind_to_environ(environ)
+            try:
+                adapter.match()
+            except RequestRedirect:
+                return app
+            except MethodNotAllowed:
+                methode_refusee = methode_refusee or app
+            except NotFound:
+                continue
+            else:
+                return app
+        # Aucune route : 405 du service qui connaît le chemin, sinon 404
+        return methode_refusee or self.apps[0]
+
+    def __call__(self, environ, start_response):
+        return self._select(environ)(environ, start_response)
@@ -0,0 +1,39 @@
+# common/health.py
+"""
+Vue /health/dao des gateways : état de leurs appels vers DAO_SERVICE.
+
+register_dao_health(app, dao, service) l'enregistre une seule fois pour les
+quatre gateways ; un gateway y ajoute ses propres statistiques par `extra`
+(ex. les refus des limiteurs d'AUTH_SERVICE). La vue répond aussi sur
+/health/dao/<service>, seul chemin qui distingue les gateways lorsqu'ils
+partagent un serveur (run_embedded.py).
+"""
+from flask import jsonify
+
+from common import revocation
+
+
+def register_dao_health(app, dao, service, extra=None):
+    """
+    Enregistre GET /health/dao et /health/dao/<service> : disjoncteur, latence
+    et erreurs des appels par endpoint, lectures partagées par le single-flight
+    et état de la liste des révocations.
+    extra : {clé: fonction retournant des statistiques du service}.
+    """
+    extra = dict(extra or {})
+
+    @app.route("/health/dao", methods=["GET"])
+    @app.route(f"/health/dao/{service}", methods=["GET"])
+    def dao_health():
+        single_flight = dao.single_flight
+        etat = {
+            "service": service,
+            "circuit": dao.breaker.snapshot(),
+            "endpoints": dao.stats(),
+            "single_flight": single_flight.stats() if single_flight else None,
+            "revocation": revocation.stats(),
+        }
+        etat.update({cle: stats() for cle, stats in extra.items()})
+        return jsonify(etat), 200
+
+    return dao_health
@@ -0,0 +1,337 @@
+# common/http_client.py
+"""
+Client HTTP interne partagé par les dao_client des services (AUTH, TACHE,
+SEANCE, STATISTIQUE) pour appeler DAO_SERVICE.
+
+- une requests.Session par service : connexions keep-alive réutilisées (pool)
+- délais de connexion et de lecture sur chaque appel
+- nouvelles tentatives bornées, avec attente exponentielle et gigue, pour les
+  méthodes idempotentes uniquement (une création n'est jamais rejouée) ; PUT et
+  DELETE seulement si le DAO n'a pas pu recevoir ou traiter la requête
+- latence et erreurs comptées par endpoint (chemin normalisé)
+- disjoncteur : échec immédiat quand le DAO est en panne (circuit_breaker.py)
+- réponses compressées demandées au DAO (compression.py)
+- échanges en MessagePack plutôt qu'en JSON si DAO_WIRE_FORMAT=msgpack (wire.py)
+- GET identiques simultanés regroupés en un seul appel (single_flight.py)
+- X-Request-ID transmis au DAO, étapes du DAO reprises dans la trace (tracing.py)
+
+create_dao_client(Config) choisit le transport selon DAO_MODE : HTTP (par
+défaut) ou DAO_SERVICE chargé dans le processus (embedded.py).
+"""
+import random
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+
+from common.circuit_breaker import CircuitBreaker
+from common.compression import accept_encoding_header
+from common import wire
+from common.single_flight import dao_reads
+from common.tracing import REQUEST_ID_HEADER, current_request_id, merge_upstream_timing, span
+
+# Méthodes pouvant être rejouées sans effet de bord supplémentaire
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Lectures : rejouées après toute erreur réseau ou réponse RETRY_STATUS. PUT et DELETE ne le sont
+# qu'après un échec de connexion ou un 503 : après un délai de lecture dépassé, une connexion
+# coupée ou un 502/504, le DAO a peut-être déjà exécuté la requête (un DELETE /tache/batch
+# rejoué signalerait 404 pour les lignes supprimées par la première tentative)
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Réponses d'un DAO momentanément indisponible : une nouvelle tentative a du sens.
+# Ce sont aussi les seules réponses comptées comme échecs par le disjoncteur : un autre 5xx
+# (bogue d'une route, donnée invalide) ne dit rien de la disponibilité du DAO
+RETRY_STATUS = frozenset({502, 503, 504})
+
+# Bornes (ms) de l'histogramme de latence, utilisé pour estimer les percentiles
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12})$"
+)
+
+
+def endpoint_key(method, path):
+    # "GET /tache/1b4e...": les identifiants sont remplacés par ":id" pour regrouper les appels
+    path = path.split("?", 1)[0]
+    segments = [":id" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def non_traitee(erreur):
+    # Erreur réseau survenue avant que le DAO ne reçoive la requête : connexion refusée ou délai de
+    # connexion dépassé (ConnectTimeout), pas un délai de lecture ni une connexion coupée en cours d'échange
+    if isinstance(erreur, requests.ConnectTimeout):
+        return True
+    if isinstance(erreur, requests.Timeout):
+        return False
+    cause = erreur.args[0] if erreur.args else None
+    return not isinstance(cause, ProtocolError)
+
+
+def indisponible(response):
+    # Échec pour le disjoncteur : 502/503/504, sauf le délestage volontaire du DAO
+    # (503 + Retry-After, ex. pool de hachage plein) qui n'est pas une panne
+    if response.status_code == 503 and "Retry-After" in response.headers:
+        return False
+    return response.status_code in RETRY_STATUS
+
+
+class EndpointStats:
+    """Compteurs d'un endpoint : appels, erreurs, latence moyenne/max et histogramme."""
+
+    def __init__(self):
+        self.appels = 0
+        self.erreurs = 0          # exceptions réseau et réponses 5xx
+        self.tentatives = 0       # nouvelles tentatives effectuées
+        self.partages = 0         # GET servis par un appel identique déjà en cours
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, duree_ms, erreur):
+        self.appels += 1
+        self.erreurs += 1 if erreur else 0
+        self.total_ms += duree_ms
+        self.max_ms = max(self.max_ms, duree_ms)
+        for i, borne in enumerate(LATENCY_BUCKETS_MS):
+            if duree_ms <= borne:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, p):
+        # Borne supérieure du bucket contenant le p-ième percentile (estimation)
+        if not self.appels:
+            return 0.0
+        rang = p / 100 * self.appels
+        cumul = 0
+        for i, n in enumerate(self.buckets):
+            cumul += n
+            if cumul >= rang:
+                if i < len(LATENCY_BUCKETS_MS):
+                    return round(min(float(LATENCY_BUCKETS_MS[i]), self.max_ms), 3)
+                return round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def snapshot(self):
+        return {
+            "appels": self.appels,
+            "erreurs": self.erreurs,
+            "tentatives": self.tentatives,
+            "partages": self.partages,
+            "latence_moyenne_ms": round(self.total_ms / self.appels, 3) if self.appels else 0.0,
+            "latence_max_ms": round(self.max_ms, 3),
+            "latence_p50_ms": self.percentile(50),
+            "latence_p95_ms": self.percentile(95),
+            "latence_p99_ms": self.percentile(99),
+        }
+
+
+class DaoHttpClient:
+    """Session HTTP partagée vers DAO_SERVICE (thread-safe pour les appels concurrents)."""
+
+    def __init__(self, base_url, connect_timeout=3.05, read_timeout=10.0, retries=2,
+                 backoff=0.1, backoff_max=2.0, pool_maxsize=20, name="dao", breaker=None,
+                 wire_format="json", single_flight=True):
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        # MessagePack demandé au DAO seulement si la bibliothèque est installée
+        self.msgpack = wire_format == "msgpack" and wire.available()
+        # Corps de requête en MessagePack une fois que le DAO a montré qu'il le comprend
+        self._dao_msgpack = False
+        # GET identiques simultanés regroupés en un seul appel (groupe commun au processus)
+        self.single_flight = dao_reads if single_flight else None
+
+        self.session = self._create_session(pool_maxsize)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @classmethod
+    def from_config(cls, config, name="dao"):
+        # Paramètres lus dans la classe Config du service (valeurs par défaut si absents)
+        return cls(
+            config.DAO_URL,
+            connect_timeout=getattr(config, "DAO_CONNECT_TIMEOUT", 3.05),
+            read_timeout=getattr(config, "DAO_READ_TIMEOUT", 10.0),
+            retries=getattr(config, "DAO_RETRIES", 2),
+            backoff=getattr(config, "DAO_RETRY_BACKOFF", 0.1),
+            pool_maxsize=getattr(config, "DAO_POOL_MAXSIZE", 20),
+            name=name,
+            breaker=CircuitBreaker.from_config(config, name),
+            wire_format=getattr(config, "DAO_WIRE_FORMAT", "json"),
+            single_flight=getattr(config, "DAO_SINGLE_FLIGHT", True),
+        )
+
+    def _create_session(self, pool_maxsize):
+        session = requests.Session()
+        # Les tentatives sont gérées ici (et comptées) : pas de rejeu caché dans urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Corps compressés par le DAO (décompressés de façon transparente par requests)
+        session.headers["Accept-Encoding"] = accept_encoding_header()
+        return session
+
+    # --- Appels ---
+
+    def request(self, method, path, timeout=None, **kwargs):
+        """
+        Appelle DAO_SERVICE et retourne la requests.Response.
+        Lève requests.RequestException si toutes les tentatives échouent au niveau réseau,
+        CircuitOpenError si le circuit est ouvert (aucun appel émis).
+        """
+        method = method.upper()
+        stats = self._endpoint(endpoint_key(method, path))
+        if self.msgpack:
+            kwargs = self._msgpack_kwargs(kwargs)
+
+        with span(self.name):
+            cle = self._flight_key(method, path, kwargs)
+            if cle is None:
+                return self._call(method, path, stats, timeout, kwargs)
+            # Lecture identique déjà en cours (même gateway ou autre gateway du processus) : résultat partagé
+            response, partage = self.single_flight.do(cle, lambda: self._call(method, path, stats, timeout, kwargs))
+            if partage:
+                with self._lock:
+                    stats.partages += 1
+            return response
+
+    def _call(self, method, path, stats, timeout, kwargs):
+        url = f"{self.base_url}{path}"
+        request_id = current_request_id()
+        if request_id:
+            # Hors clé single-flight : ajouté seulement à l'appel réellement émis
+            kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), REQUEST_ID_HEADER: request_id}}
+        tentatives = 1 + (self.retries if method in IDEMPOTENT_METHODS else 0)
+
+        for tentative in range(tentatives):
+            derniere = tentative == tentatives - 1
+            probe = self.breaker.before_call()
+            debut = time.perf_counter()
+            try:
+                response = self._send(method, url, timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(stats, debut, erreur=True)
+                self.breaker.record_failure(probe)
+                if derniere or (method not in SAFE_METHODS and not non_traitee(e)):
+                    raise
+            else:
+                self._record(stats, debut, erreur=response.status_code >= 500)
+                if indisponible(response):
+                    self.breaker.record_failure(probe)
+                else:
+                    self.breaker.record_success(probe)
+                rejouable = response.status_code in RETRY_STATUS and (
+                    method in SAFE_METHODS or response.status_code == 503
+                )
+                if derniere or not rejouable:
+                    if isinstance(response, requests.Response):
+                        merge_upstream_timing(self.name, response.headers.get("Server-Timing"))
+                    return self._wrap(response)
+                response.close()
+            with self._lock:
+                stats.tentatives += 1
+            time.sleep(self._delai(tentative))
+
+    def _target(self):
+        # Identifie le DAO appelé dans la clé single-flight
+        return self.base_url
+
+    def _flight_key(self, method, path, kwargs):
+        # Clé des GET regroupables : DAO, chemin, paramètres et en-têtes (user-id, If-None-Match, Accept)
+        if self.single_flight is None or method != "GET" or set(kwargs) - {"params", "headers"}:
+            return None
+        params = kwargs.get("params") or ()
+        if isinstance(params, (str, bytes)):
+            params = (("", params),)
+        elif hasattr(params, "items"):
+            params = params.items()
+        headers = kwargs.get("headers") or {}
+        return (
+            self._target(),
+            path,
+            tuple(sorted((str(k), str(v)) for k, v in params if v is not None)),
+            tuple(sorted((k.lower(), str(v)) for k, v in headers.items())),
+        )
+
+    def _msgpack_kwargs(self, kwargs):
+        # Accept: MessagePack ; corps JSON encodé en MessagePack si le DAO le gère
+        kwargs = dict(kwargs)
+        headers = {"Accept": wire.ACCEPT_MSGPACK, **(kwargs.get("headers") or {})}
+        if self._dao_msgpack and kwargs.get("json") is not None:
+            kwargs["data"] = wire.packb(kwargs.pop("json"))
+            headers["Content-Type"] = wire.MSGPACK_MIMETYPE
+        kwargs["headers"] = headers
+        return kwargs
+
+    def _wrap(self, response):
+        response = wire.wrap_response(response)
+        if isinstance(response, wire.MsgpackResponse):
+            self._dao_msgpack = True
+        return response
+
+    def _send(self, method, url, timeout, **kwargs):
+        return self.session.request(method, url, timeout=timeout, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def _delai(self, tentative):
+        # Attente exponentielle plafonnée avec gigue complète (évite les rafales synchronisées)
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** tentative)))
+
+    # --- Statistiques ---
+
+    def _endpoint(self, key):
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            return stats
+
+    def _record(self, stats, debut, erreur):
+        duree_ms = (time.perf_counter() - debut) * 1000
+        with self._lock:
+            stats.record(duree_ms, erreur)
+
+    def stats(self):
+        with self._lock:
+            return {key: s.snapshot() for key, s in sorted(self._stats.items())}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def create_dao_client(config, name="dao"):
+    """Client vers DAO_SERVICE selon Config.DAO_MODE : "http" (défaut) ou "embedded"."""
+    mode = getattr(config, "DAO_MODE", "http")
+    if mode == "embedded":
+        from common.embedded import EmbeddedDaoClient
+        return EmbeddedDaoClient.from_config(config, name)
+    if mode != "http":
+        raise ValueError(f"DAO_MODE inconnu : {mode!r} (attendu : http ou embedded)")
+    return DaoHttpClient.from_config(config, name)
@@ -0,0 +1,211 @@
+# common/rate_limit.py
+"""
+Contrôle d'admission des routes de connexion et d'inscription.
+
+Chaque appel à /auth/login ou /auth/register coûte un hachage bcrypt : une
+rafale (bourrage d'identifiants, client qui boucle sur ses nouvelles
+tentatives) suffit à occuper le CPU de DAO_SERVICE. Les demandes en excès
+sont refusées en 429 avec Retry-After avant toute lecture en base ou tout
+hachage, par des limiteurs en mémoire du processus :
+
+- seau à jetons par adresse source : rafale courte autorisée, débit moyen borné
+- seau à jetons par email : un compte ciblé depuis de nombreuses adresses
+- fenêtre glissante par adresse : plafond sur une longue période
+- mémoire bornée : au-delà de RATE_LIMIT_MAX_KEYS clés, les moins récemment
+  utilisées sont oubliées (une clé oubliée repart d'un seau plein)
+
+Les limites sont propres à chaque processus : avec N workers, le débit admis
+par clé est au plus N fois la limite configurée.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+
+FORWARDED_FOR_HEADER = "X-Forwarded-For"
+
+
+class _LRU:
+    """État par clé borné à max_keys entrées (les moins récemment utilisées sont oubliées)."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._data = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key):
+        state = self._data.get(key)
+        if state is not None:
+            self._data.move_to_end(key)
+        return state
+
+    def put(self, key, state):
+        self._data[key] = state
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TokenBucket:
+    """Seau à jetons par clé : `burst` demandes d'affilée, puis `rate` par seconde (thread-safe)."""
+
+    def __init__(self, rate, burst, max_keys=10000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys = _LRU(max_keys)
+        self.refus = 0
+
+    def acquire(self, key):
+        # Retourne 0 si la demande est admise, sinon le délai (s) avant le prochain jeton
+        now = self._clock()
+        with self._lock:
+            state = self._keys.get(key)
+            jetons, dernier = state if state is not None else (self.burst, now)
+            jetons = min(self.burst, jetons + (now - dernier) * self.rate)
+            if jetons >= 1:
+                self._keys.put(key, (jetons - 1, now))
+                return 0
+            self._keys.put(key, (jetons, now))
+            self.refus += 1
+            return (1 - jetons) / self.rate
+
+    def stats(self):
+        with self._lock:
+            return {"cles": len(self._keys), "evictions": self._keys.evictions, "refus": self.refus}
+
+
+class SlidingWindow:
+    """
+    Au plus `limit` demandes par clé sur `window` secondes glissantes (thread-safe).
+    Approximation à deux fenêtres fixes : la précédente est pondérée par la part
+    encore couverte par la fenêtre glissante.
+    """
+
+    def __init__(self, limit, window, max_keys=10000, clock=time.monotonic):
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys = _LRU(max_keys)
+        self.refus = 0
+
+    def acquire(self, key):
+        # Retourne 0 si la demande est admise, sinon une borne supérieure du délai (s) avant admission
+        now = self._clock()
+        index, ecoule = divmod(now, self.window)
+        with self._lock:
+            state = self._keys.get(key)
+            precedente, courante = 0, 0
+            if state is not None:
+                fenetre, n_prec, n_cour = state
+                if fenetre == index:
+                    precedente, courante = n_prec, n_cour
+                elif fenetre == index - 1:
+                    precedente = n_cour
+            estimation = precedente * (1 - ecoule / self.window) + courante
+            if estimation + 1 <= self.limit:
+                self._keys.put(key, (index, precedente, courante + 1))
+                return 0
+            self._keys.put(key, (index, precedente, courante))
+            self.refus += 1
+            # Fenêtre précédente entièrement sortie à la fin de la fenêtre courante (ou de la suivante si pleine)
+            return self.window - ecoule + (self.window if courante + 1 > self.limit else 0)
+
+    def stats(self):
+        with self._lock:
+            return {"cles": len(self._keys), "evictions": self._keys.evictions, "refus": self.refus}
+
+
+class AdmissionControl:
+    """Limiteurs d'une application, partagés par les routes protégées (clés préfixées par route)."""
+
+    def __init__(self, par_adresse, par_email, fenetre_adresse, trusted_proxies=0, enabled=True):
+        self.par_adresse = par_adresse
+        self.par_email = par_email
+        self.fenetre_adresse = fenetre_adresse
+        self.trusted_proxies = trusted_proxies
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, config):
+        max_keys = getattr(config, "RATE_LIMIT_MAX_KEYS", 10000)
+        return cls(
+            TokenBucket(
+                getattr(config, "RATE_LIMIT_IP_PER_MIN", 30) / 60,
+                getattr(config, "RATE_LIMIT_IP_BURST", 20),
+                max_keys,
+            ),
+            TokenBucket(
+                getattr(config, "RATE_LIMIT_EMAIL_PER_MIN", 5) / 60,
+                getattr(config, "RATE_LIMIT_EMAIL_BURST", 5),
+                max_keys,
+            ),
+            SlidingWindow(
+                getattr(config, "RATE_LIMIT_IP_WINDOW_MAX", 300),
+                getattr(config, "RATE_LIMIT_IP_WINDOW_S", 3600),
+                max_keys,
+            ),
+            trusted_proxies=getattr(config, "RATE_LIMIT_TRUSTED_PROXIES", 0),
+            enabled=getattr(config, "RATE_LIMIT_ENABLED", True),
+        )
+
+    def check(self, route, adresse, email=None):
+        # 0 si la demande est admise, sinon le délai d'attente (s) ; s'arrête au premier refus
+        for limiteur, cle in (
+            (self.par_adresse, adresse),
+            (self.par_email, email),
+            (self.fenetre_adresse, adresse),
+        ):
+            if cle is None:
+                continue
+            attente = limiteur.acquire(f"{route}:{cle}")
+            if attente:
+                return attente
+        return 0
+
+    def limit(self, route):
+        """Décorateur de vue : 429 avec Retry-After avant d'exécuter la vue si une limite est atteinte."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.enabled:
+                    email = (request.get_json(silent=True) or {}).get("email")
+                    email = email.strip().lower() if isinstance(email, str) and email.strip() else None
+                    attente = self.check(route, client_address(self.trusted_proxies), email)
+                    if attente:
+                        response = jsonify({"error": "Trop de tentatives, réessayez plus tard"})
+                        response.headers["Retry-After"] = str(max(1, math.ceil(attente)))
+                        return response, 429
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        return {
+            "par_adresse": self.par_adresse.stats(),
+            "par_email": self.par_email.stats(),
+            "fenetre_adresse": self.fenetre_adresse.stats(),
+        }
+
+
+def client_address(trusted_proxies=0):
+    # Adresse du client : ajoutée à X-Forwarded-For par le trusted_proxies-ième mandataire de confiance
+    if trusted_proxies:
+        chaine = [a.strip() for a in request.headers.get(FORWARDED_FOR_HEADER, "").split(",") if a.strip()]
+        if len(chaine) >= trusted_proxies:
+            return chaine[-trusted_proxies]
+    return request.remote_addr or "inconnue"
+
+
+def forwarded_for(trusted_proxies=0):
+    # En-tête transmis au DAO par un gateway : l'adresse du client telle qu'il l'a déterminée
+    return {FORWARDED_FOR_HEADER: client_address(trusted_proxies)}
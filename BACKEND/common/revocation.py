@@ -0,0 +1,170 @@
+# common/revocation.py
+"""
+Révocation des JWT vérifiée en mémoire par les gateways.
+
+DAO_SERVICE publie les révocations (compte désactivé ou supprimé : tous les
+jetons du client émis jusque-là ; déconnexion : un jti). Chaque processus
+garde une copie en mémoire, mise à jour en arrière-plan toutes les
+REVOCATION_SYNC_S secondes par delta (entrées postérieures au dernier seq
+reçu), et le token_in_blocklist_loader de JWTManager la consulte : aucune
+requête SQL ni HTTP par requête.
+
+- ensembles exacts (dict) plutôt qu'un filtre de Bloom : la liste ne contient
+  que les révocations encore utiles (purgées à l'expiration des jetons), elle
+  reste petite et un faux positif déconnecterait un utilisateur légitime
+- relecture complète toutes les REVOCATION_FULL_SYNC_S secondes : une
+  révocation validée après une autre de seq plus grand n'est pas perdue
+- DAO indisponible : la dernière liste connue reste appliquée (âge dans stats())
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLIENT = "client"
+JETON = "jeton"
+
+
+class RevocationList:
+    """Révocations connues du processus (thread-safe)."""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._clients = {}   # client_id -> (révoqué le, expire le) : jetons émis avant révoqué le
+        self._jetons = {}    # jti -> expire le
+        self.seq = 0
+        self.derniere_synchro = None
+        self.rejets = 0
+
+    def apply(self, entrees, seq):
+        # Ajoute des entrées du DAO ({"type", "valeur", "revoque_le", "expire_le"}) et avance seq
+        with self._lock:
+            for entree in entrees:
+                if entree["type"] == CLIENT:
+                    courante = self._clients.get(entree["valeur"])
+                    if courante is None or courante[0] < entree["revoque_le"]:
+                        self._clients[entree["valeur"]] = (entree["revoque_le"], entree["expire_le"])
+                elif entree["type"] == JETON:
+                    self._jetons[entree["valeur"]] = entree["expire_le"]
+            self.seq = max(self.seq, seq)
+            self.derniere_synchro = self._clock()
+
+    def revoke_token(self, jti, exp):
+        # Révocation locale immédiate (déconnexion traitée par ce processus), en attendant la synchronisation
+        with self._lock:
+            self._jetons[jti] = exp
+
+    def revoke_client(self, client_id, expire_le):
+        # Révocation locale immédiate des jetons déjà émis pour le client
+        with self._lock:
+            self._clients[str(client_id)] = (self._clock(), expire_le)
+
+    def prune(self):
+        # Retire les entrées dont tous les jetons concernés ont expiré
+        now = self._clock()
+        with self._lock:
+            self._clients = {k: v for k, v in self._clients.items() if v[1] > now}
+            self._jetons = {k: v for k, v in self._jetons.items() if v > now}
+
+    def is_revoked(self, jwt_payload):
+        jti = jwt_payload.get("jti")
+        client = self._clients.get(str(jwt_payload.get("sub")))
+        revoque = (jti is not None and jti in self._jetons) or (
+            client is not None and jwt_payload.get("iat", 0) <= client[0]
+        )
+        if revoque:
+            with self._lock:
+                self.rejets += 1
+        return revoque
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "jetons": len(self._jetons),
+                "seq": self.seq,
+                "age_s": round(self._clock() - self.derniere_synchro, 1) if self.derniere_synchro else None,
+                "rejets": self.rejets,
+            }
+
+
+class RevocationSync:
+    """Thread de synchronisation de la liste avec DAO_SERVICE (démarré à la première requête)."""
+
+    def __init__(self, revocations, interval=5.0, full_interval=300.0):
+        self.revocations = revocations
+        self.interval = interval
+        self.full_interval = full_interval
+        self.dao = None
+        self.erreurs = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._derniere_complete = 0.0
+
+    def start(self, dao):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.dao = dao
+            self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception:
+                self.erreurs += 1
+                logger.warning("Synchronisation des révocations impossible", exc_info=True)
+            time.sleep(self.interval)
+
+    def sync(self):
+        complete = time.monotonic() - self._derniere_complete >= self.full_interval
+        depuis = 0 if complete else self.revocations.seq
+        entrees = []
+        while True:
+            response = self.dao.get("/auth/revocations", params={"depuis": depuis})
+            response.raise_for_status()
+            data = response.json()
+            entrees.extend(data["revocations"])
+            depuis = data["seq"]
+            if not data.get("suite"):
+                break
+        # Les révocations ne sont jamais annulées : une resynchronisation complète fusionne simplement
+        self.revocations.apply(entrees, depuis)
+        if complete:
+            self._derniere_complete = time.monotonic()
+        self.revocations.prune()
+
+
+# Liste commune aux gateways du processus (mode embarqué compris) : une déconnexion
+# enregistrée par AUTH_SERVICE y est visible immédiatement
+revocations = RevocationList()
+_sync = RevocationSync(revocations)
+
+
+def stats():
+    return {**revocations.stats(), "erreurs_synchro": _sync.erreurs}
+
+
+def init_revocation(app, jwt, dao):
+    """
+    Branche la liste des révocations sur le token_in_blocklist_loader du JWTManager.
+    Paramètres REVOCATION_ENABLED, REVOCATION_SYNC_S et REVOCATION_FULL_SYNC_S de Config.
+    """
+    if not app.config.get("REVOCATION_ENABLED", True):
+        return
+    _sync.interval = app.config.get("REVOCATION_SYNC_S", 5.0)
+    _sync.full_interval = app.config.get("REVOCATION_FULL_SYNC_S", 300.0)
+
+    @app.before_request
+    def _start_sync():
+        _sync.start(dao)
+
+    @jwt.token_in_blocklist_loader
+    def _is_revoked(jwt_header, jwt_payload):
+        return revocations.is_revoked(jwt_payload)
@@ -0,0 +1,56 @@
+# common/settings.py
+"""
+Paramètres partagés par les classes Config des services, lus dans
+l'environnement à l'import : le service appelle load_dotenv() avant
+d'importer ce module.
+
+- CompressionConfig, TracingConfig : les cinq applications Flask
+- GatewayConfig : en plus, l'accès des gateways à DAO_SERVICE (transport,
+  client HTTP, disjoncteur) et la liste des jetons révoqués
+"""
+import os
+
+
+class CompressionConfig:
+    # Compression des réponses selon Accept-Encoding (voir common/compression.py)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))  # octets
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+
+class TracingConfig:
+    # Traçage : X-Request-ID, en-tête Server-Timing, journal local optionnel (voir common/tracing.py)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACING_SERVER_TIMING = os.getenv("TRACING_SERVER_TIMING", "true").lower() == "true"
+    TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH")  # fichier JSON lines ; absent = pas de journal
+    TRACE_LOG_MIN_MS = float(os.getenv("TRACE_LOG_MIN_MS", 0))  # ne journalise que les requêtes plus lentes
+
+
+class GatewayConfig(CompressionConfig, TracingConfig):
+    # Accès à DAO_SERVICE : "http" ou "embedded" (DAO chargé dans le processus, voir common/embedded.py)
+    DAO_MODE = os.getenv("DAO_MODE", "http").lower()
+    DAO_SERVICE_DIR = os.getenv("DAO_SERVICE_DIR")  # dossier DAO_SERVICE en mode embarqué (défaut : ../DAO_SERVICE)
+    # Format des échanges avec le DAO : "msgpack" (si installé) ou "json" (voir common/wire.py)
+    DAO_WIRE_FORMAT = os.getenv("DAO_WIRE_FORMAT", "msgpack").lower()
+    # GET identiques simultanés vers le DAO regroupés en un seul appel (voir common/single_flight.py)
+    DAO_SINGLE_FLIGHT = os.getenv("DAO_SINGLE_FLIGHT", "true").lower() == "true"
+
+    # Client HTTP vers DAO_SERVICE (voir common/http_client.py)
+    DAO_CONNECT_TIMEOUT = float(os.getenv("DAO_CONNECT_TIMEOUT", 3.05))
+    DAO_READ_TIMEOUT = float(os.getenv("DAO_READ_TIMEOUT", 10))
+    DAO_RETRIES = int(os.getenv("DAO_RETRIES", 2))
+    DAO_RETRY_BACKOFF = float(os.getenv("DAO_RETRY_BACKOFF", 0.1))
+    DAO_POOL_MAXSIZE = int(os.getenv("DAO_POOL_MAXSIZE", 20))
+
+    # Disjoncteur vers DAO_SERVICE (voir common/circuit_breaker.py)
+    DAO_BREAKER_FAILURE_RATE = float(os.getenv("DAO_BREAKER_FAILURE_RATE", 0.5))
+    DAO_BREAKER_MIN_CALLS = int(os.getenv("DAO_BREAKER_MIN_CALLS", 10))
+    DAO_BREAKER_WINDOW = int(os.getenv("DAO_BREAKER_WINDOW", 20))
+    DAO_BREAKER_OPEN_S = float(os.getenv("DAO_BREAKER_OPEN_S", 15))
+    DAO_BREAKER_HALF_OPEN_CALLS = int(os.getenv("DAO_BREAKER_HALF_OPEN_CALLS", 1))
+
+    # Liste des jetons révoqués synchronisée avec DAO_SERVICE (voir common/revocation.py)
+    REVOCATION_ENABLED = os.getenv("REVOCATION_ENABLED", "true").lower() == "true"
+    REVOCATION_SYNC_S = float(os.getenv("REVOCATION_SYNC_S", 5))  # intervalle des synchronisations par delta
+    REVOCATION_FULL_SYNC_S = float(os.getenv("REVOCATION_FULL_SYNC_S", 300))  # relecture complète de la liste
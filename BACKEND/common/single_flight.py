@@ -0,0 +1,78 @@
+# common/single_flight.py
+"""
+Regroupement des lectures identiques simultanées (single-flight).
+
+Quand plusieurs requêtes du frontend arrivent ensemble (tableau de bord :
+/taches, /taches/seance/<id>, /statistique), les gateways demandent souvent au
+DAO la même liste pour le même utilisateur. Un seul appel part vers le DAO :
+les appels identiques arrivés pendant qu'il est en cours attendent son
+résultat (ou son exception) et le partagent. Rien n'est conservé une fois
+l'appel terminé : ce n'est pas un cache.
+"""
+import threading
+
+
+class _Appel:
+    __slots__ = ("fini", "resultat", "erreur", "partages")
+
+    def __init__(self):
+        self.fini = threading.Event()
+        self.resultat = None
+        self.erreur = None
+        self.partages = 0
+
+
+class SingleFlight:
+    """Groupe d'appels en cours, indexés par clé (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_cours = {}
+        self.appels = 0      # appels réellement exécutés
+        self.partages = 0    # appels servis par un appel déjà en cours
+
+    def do(self, key, fn):
+        """
+        Exécute fn() pour `key`, ou attend l'appel identique déjà en cours.
+        Retourne (résultat, partagé) ; l'exception de fn() est levée chez tous les appelants.
+        """
+        with self._lock:
+            appel = self._en_cours.get(key)
+            partage = appel is not None
+            if partage:
+                appel.partages += 1
+                self.partages += 1
+            else:
+                appel = self._en_cours[key] = _Appel()
+                self.appels += 1
+
+        if partage:
+            appel.fini.wait()
+            if appel.erreur is not None:
+                raise appel.erreur
+            return appel.resultat, True
+
+        try:
+            appel.resultat = fn()
+        except BaseException as e:
+            appel.erreur = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_cours[key]
+            appel.fini.set()
+        return appel.resultat, False
+
+    def stats(self):
+        with self._lock:
+            total = self.appels + self.partages
+            return {
+                "appels": self.appels,
+                "partages": self.partages,
+                "en_cours": len(self._en_cours),
+                "taux_partage": round(self.partages / total, 4) if total else 0.0,
+            }
+
+
+# Groupe commun à tous les clients DAO du processus (gateways réunis en mode embarqué compris)
+dao_reads = SingleFlight()
@@ -0,0 +1,107 @@
+import pytest
+import requests
+from flask import Flask
+
+from common.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, register_upstream_error_handlers
+)
+from common.http_client import DaoHttpClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def breaker(clock):
+    return CircuitBreaker("dao", failure_rate=0.5, min_calls=4, window=4, open_seconds=10, clock=clock)
+
+
+def test_opens_when_failure_rate_is_reached():
+    b = breaker(FakeClock())
+    for echec in (False, True, False):
+        b.record_failure() if echec else b.record_success()
+    assert b.state == CLOSED
+
+    b.record_failure()
+
+    assert b.state == OPEN
+    with pytest.raises(CircuitOpenError) as e:
+        b.before_call()
+    assert e.value.retry_after == 10
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    b = breaker(clock)
+    for _ in range(4):
+        b.record_failure()
+
+    clock.now += 10
+    assert b.state == HALF_OPEN
+    sonde = b.before_call()              # sonde autorisée
+    assert sonde is not None
+    with pytest.raises(CircuitOpenError):
+        b.before_call()                  # une seule sonde à la fois
+    b.record_failure(sonde)
+    assert b.state == OPEN
+
+    clock.now += 10
+    b.record_success(b.before_call())
+    assert b.state == CLOSED
+
+
+def test_only_the_probe_outcome_closes_or_reopens_the_half_open_circuit():
+    clock = FakeClock()
+    b = breaker(clock)
+    lent = b.before_call()               # appel lent émis circuit fermé
+    for _ in range(4):
+        b.record_failure()
+    clock.now += 10
+    sonde = b.before_call()
+
+    # L'appel lent se termine pendant la sonde : ni fermeture ni réouverture
+    b.record_success(lent)
+    assert b.state == HALF_OPEN
+    b.record_failure(lent)
+    assert b.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        b.before_call()
+
+    b.record_failure(sonde)
+    assert b.state == OPEN
+
+
+def test_open_circuit_fails_fast_without_network_call(monkeypatch):
+    client = DaoHttpClient("http://dao", retries=0, breaker=breaker(FakeClock()))
+    appels = []
+
+    def fake_request(*args, **kwargs):
+        appels.append(1)
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    for _ in range(4):
+        with pytest.raises(requests.ConnectionError):
+            client.get("/tache/taches")
+
+    with pytest.raises(CircuitOpenError):
+        client.get("/tache/taches")
+    assert len(appels) == 4
+
+
+def test_gateway_returns_503_with_retry_after():
+    app = Flask(__name__)
+    register_upstream_error_handlers(app)
+
+    @app.route("/taches")
+    def taches():
+        raise CircuitOpenError("dao", 7)
+
+    response = app.test_client().get("/taches")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
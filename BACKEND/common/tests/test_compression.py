@@ -0,0 +1,66 @@
+import gzip
+import json
+
+from flask import Flask, Response, jsonify
+
+from common.compression import choose_encoding, init_compression
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["COMPRESSION_MIN_SIZE"] = 100
+    init_compression(app)
+
+    @app.route("/petit")
+    def petit():
+        return jsonify({"ok": True})
+
+    @app.route("/liste")
+    def liste():
+        response = jsonify([{"titre": f"tâche {i}"} for i in range(200)])
+        response.set_etag("v1")
+        return response
+
+    @app.route("/flux")
+    def flux():
+        def generate():
+            yield b"["
+            yield b",".join(json.dumps({"id": i}).encode() for i in range(500))
+            yield b"]"
+        return Response(generate(), mimetype="application/json")
+
+    return app.test_client()
+
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("identity") is None
+    assert choose_encoding(None) is None
+
+
+def test_small_responses_are_not_compressed():
+    response = make_app().get("/petit", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_large_response_is_gzipped_with_distinct_etag():
+    client = make_app()
+    response = client.get("/liste", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data))[199] == {"titre": "tâche 199"}
+    assert response.headers["ETag"] == '"v1-gzip"'
+    assert "Content-Encoding" not in client.get("/liste").headers
+
+
+def test_streamed_response_is_compressed_incrementally():
+    response = make_app().get("/flux", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert len(json.loads(gzip.decompress(response.data))) == 500
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+from flask import Flask, jsonify
+
+from common.compression import init_compression
+from common.conditional import conditional, relay_response
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["COMPRESSION_MIN_SIZE"] = 10
+    init_compression(app)
+
+    @app.route("/liste")
+    def liste():
+        return conditional("v42", lambda: jsonify([{"titre": f"tâche {i}"} for i in range(50)]))
+
+    return app
+
+
+def dao_response(status, etag=None, body=None):
+    response = MagicMock()
+    response.status_code = status
+    response.ok = status < 400
+    response.headers = {"ETag": etag} if etag else {}
+    response.json.return_value = body
+    return response
+
+
+def test_conditional_returns_304_for_matching_etag():
+    client = make_app().test_client()
+    first = client.get("/liste")
+    assert first.status_code == 200
+    assert first.headers["ETag"] == '"v42"'
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    second = client.get("/liste", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_conditional_ignores_encoding_suffix_and_weak_tags():
+    client = make_app().test_client()
+    compressed = client.get("/liste", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["ETag"] == '"v42-gzip"'
+
+    assert client.get("/liste", headers={"If-None-Match": '"v42-gzip"'}).status_code == 304
+    assert client.get("/liste", headers={"If-None-Match": 'W/"v42"'}).status_code == 304
+    assert client.get("/liste", headers={"If-None-Match": '"v41"'}).status_code == 200
+
+
+def test_relay_response_forwards_304_and_strips_suffix():
+    app = make_app()
+    with app.test_request_context("/taches"):
+        relayed = relay_response(dao_response(304, '"v7-br"'))
+        assert relayed.status_code == 304
+        assert relayed.headers["ETag"] == '"v7"'
+
+        relayed = relay_response(dao_response(200, '"v7-gzip"', [{"id": 1}]))
+        assert relayed.status_code == 200
+        assert relayed.headers["ETag"] == '"v7"'
+        assert relayed.get_json() == [{"id": 1}]
+
+
+def test_relay_response_without_etag_on_error():
+    app = make_app()
+    with app.test_request_context("/taches"):
+        relayed = relay_response(dao_response(400, None, {"error": "user-id invalide"}))
+        assert relayed.status_code == 400
+        assert "ETag" not in relayed.headers
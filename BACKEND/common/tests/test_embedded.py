@@ -0,0 +1,137 @@
+import sys
+import textwrap
+
+import pytest
+from flask import Flask, Response, jsonify, request
+from werkzeug.test import Client
+
+from common.embedded import EmbeddedDaoClient, ServiceDispatcher, load_service
+from common.health import register_dao_health
+from common.http_client import create_dao_client
+
+
+def make_dao_app():
+    app = Flask(__name__)
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+
+    @app.route("/tache/taches")
+    def taches():
+        return jsonify({
+            "user": request.headers.get("user-id"),
+            "statut": request.args.getlist("statut"),
+            "limit": request.args.get("limit"),
+        })
+
+    @app.route("/tache/add", methods=["POST"])
+    def add():
+        return jsonify({"recu": request.get_json()}), 201
+
+    @app.route("/flux")
+    def flux():
+        def generate():
+            yield "["
+            yield ",".join(str(i) for i in range(100))
+            yield "]"
+        return Response(generate(), mimetype="application/json")
+
+    @app.route("/panne")
+    def panne():
+        raise RuntimeError("base indisponible")
+
+    return app
+
+
+def test_embedded_client_forwards_params_headers_and_json():
+    dao = EmbeddedDaoClient(make_dao_app())
+
+    response = dao.get("/tache/taches", params=[("statut", "a faire"), ("statut", "en cours")],
+                       headers={"user-id": "u1"})
+    assert response.ok
+    assert response.json() == {"user": "u1", "statut": ["a faire", "en cours"], "limit": None}
+
+    # Comme requests : un paramètre à None n'est pas envoyé
+    assert dao.get("/tache/taches", params={"limit": None}).json()["limit"] is None
+
+    response = dao.post("/tache/add", json={"titre": "t"})
+    assert response.status_code == 201
+    assert response.json() == {"recu": {"titre": "t"}}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_embedded_client_buffers_streams_and_reports_errors():
+    dao = EmbeddedDaoClient(make_dao_app())
+    assert dao.get("/flux").json() == list(range(100))
+
+    response = dao.get("/panne")
+    assert response.status_code == 500
+    assert dao.stats()["GET /panne"]["erreurs"] == 1
+    # 500 d'une route : erreur de l'endpoint, pas une indisponibilité du DAO pour le disjoncteur
+    assert dao.breaker.snapshot()["echecs_fenetre"] == 0
+
+
+def test_create_dao_client_rejects_unknown_mode():
+    class Config:
+        DAO_URL = "http://dao"
+        DAO_MODE = "grpc"
+
+    with pytest.raises(ValueError):
+        create_dao_client(Config)
+
+    Config.DAO_MODE = "http"
+    assert create_dao_client(Config).base_url == "http://dao"
+
+
+def write_service(directory, valeur):
+    directory.mkdir()
+    (directory / "config.py").write_text(f"VALEUR = {valeur!r}\n")
+    (directory / "app.py").write_text(textwrap.dedent("""
+        from flask import Flask, jsonify
+        import config
+
+        app = Flask(__name__)
+
+        @app.route("/valeur")
+        def valeur():
+            return jsonify(config.VALEUR)
+    """))
+
+
+def test_load_service_isolates_top_level_modules(tmp_path):
+    write_service(tmp_path / "premier", "un")
+    write_service(tmp_path / "second", "deux")
+
+    premier = load_service(tmp_path / "premier")
+    second = load_service(tmp_path / "second")
+
+    assert premier.modules["config"].VALEUR == "un"
+    assert second.modules["config"].VALEUR == "deux"
+    assert "config" not in sys.modules
+    assert premier.app.test_client().get("/valeur").get_json() == "un"
+    assert second.app.test_client().get("/valeur").get_json() == "deux"
+
+
+def test_dispatcher_routes_by_path():
+    auth, taches = Flask("auth"), Flask("taches")
+    auth.add_url_rule("/auth/login", "login", lambda: "auth", methods=["POST"])
+    taches.add_url_rule("/taches", "taches", lambda: "taches")
+
+    client = Client(ServiceDispatcher([auth, taches]))
+    assert client.post("/auth/login").get_data() == b"auth"
+    assert client.get("/taches").get_data() == b"taches"
+    assert client.get("/auth/login").status_code == 405
+    assert client.get("/inconnu").status_code == 404
+
+
+def test_dispatcher_reaches_each_gateway_health_view():
+    dao = EmbeddedDaoClient(Flask("dao"), single_flight=False)
+    services = ("auth", "tache", "seance", "statistique")
+    apps = []
+    for service in services:
+        app = Flask(service)
+        register_dao_health(app, dao, service)
+        apps.append(app)
+
+    client = Client(ServiceDispatcher(apps))
+    for service in services:
+        assert client.get(f"/health/dao/{service}").get_json()["service"] == service
+    assert client.get("/health/dao/inconnu").status_code == 404
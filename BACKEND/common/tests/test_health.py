@@ -0,0 +1,27 @@
+from flask import Flask, jsonify
+
+from common.embedded import EmbeddedDaoClient
+from common.health import register_dao_health
+
+
+def test_dao_health_reports_calls_and_service_extras():
+    dao_app = Flask("dao")
+
+    @dao_app.route("/tache/<tache_id>")
+    def tache(tache_id):
+        return jsonify({"id": tache_id}), 200
+
+    dao = EmbeddedDaoClient(dao_app, single_flight=False)
+    dao.get("/tache/1")
+    app = Flask(__name__)
+    register_dao_health(app, dao, "auth", extra={"admission": lambda: {"refus": 0}})
+
+    etat = app.test_client().get("/health/dao").get_json()
+
+    assert etat["service"] == "auth"
+    assert app.test_client().get("/health/dao/auth").get_json()["service"] == "auth"
+    assert etat["circuit"]["etat"] == "ferme"
+    assert etat["endpoints"]["GET /tache/:id"]["appels"] == 1
+    assert etat["single_flight"] is None
+    assert etat["admission"] == {"refus": 0}
+    assert "revocation" in etat
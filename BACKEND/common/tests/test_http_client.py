@@ -0,0 +1,129 @@
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError
+
+from common import http_client
+from common.circuit_breaker import CLOSED
+from common.http_client import DaoHttpClient, endpoint_key
+
+
+class FakeResp:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    return DaoHttpClient("http://dao:5001/", retries=2)
+
+
+def scripted(client, monkeypatch, *outcomes):
+    # Remplace l'appel réseau : chaque tentative consomme un résultat (réponse ou exception)
+    appels = []
+    outcomes = list(outcomes)
+
+    def fake_request(method, url, **kwargs):
+        appels.append((method, url, kwargs))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    return appels
+
+
+def test_endpoint_key_groups_ids():
+    assert endpoint_key("GET", "/tache/3f1c2a9e-5b7d-4c1e-9a0b-1234567890ab") == "GET /tache/:id"
+    assert endpoint_key("PATCH", "/seance/seance/42/statut?x=1") == "PATCH /seance/seance/:id/statut"
+    assert endpoint_key("GET", "/tache/taches") == "GET /tache/taches"
+
+
+def test_get_is_retried_on_unavailable_dao(client, monkeypatch):
+    appels = scripted(client, monkeypatch, requests.ConnectionError(), FakeResp(503), FakeResp(200))
+
+    response = client.get("/tache/taches", headers={"user-id": "u"})
+
+    assert response.status_code == 200
+    assert len(appels) == 3
+    assert appels[0][1] == "http://dao:5001/tache/taches"
+    assert appels[0][2]["timeout"] == client.timeout
+    stats = client.stats()["GET /tache/taches"]
+    assert stats["appels"] == 3
+    assert stats["erreurs"] == 2
+    assert stats["tentatives"] == 2
+
+
+def test_post_is_never_retried(client, monkeypatch):
+    appels = scripted(client, monkeypatch, requests.Timeout(), FakeResp(201))
+
+    with pytest.raises(requests.Timeout):
+        client.post("/tache/add", json={})
+    assert len(appels) == 1
+
+
+@pytest.mark.parametrize("erreur", [requests.ReadTimeout(), requests.ConnectionError(ProtocolError("Connection aborted."))])
+def test_delete_is_not_retried_once_the_dao_may_have_received_it(client, monkeypatch, erreur):
+    # Première tentative peut-être exécutée : la rejouer signalerait 404 pour les lignes déjà supprimées
+    appels = scripted(client, monkeypatch, erreur, FakeResp(200))
+
+    with pytest.raises(type(erreur)):
+        client.delete("/tache/batch", json={"ids": ["1"]})
+    assert len(appels) == 1
+
+
+def test_put_is_retried_only_when_the_dao_did_not_process_it(client, monkeypatch):
+    appels = scripted(client, monkeypatch, requests.ConnectTimeout(), FakeResp(503), FakeResp(504), FakeResp(200))
+
+    assert client.put("/tache/batch", json={"taches": []}).status_code == 504
+    assert len(appels) == 3
+
+
+def test_last_error_is_raised_when_retries_are_exhausted(client, monkeypatch):
+    scripted(client, monkeypatch, *[requests.ConnectionError()] * 3)
+
+    with pytest.raises(requests.ConnectionError):
+        client.delete("/tache/delete/1")
+    assert client.stats()["DELETE /tache/delete/:id"]["erreurs"] == 3
+
+
+def test_last_5xx_response_is_returned(client, monkeypatch):
+    scripted(client, monkeypatch, FakeResp(503), FakeResp(503), FakeResp(503))
+
+    assert client.get("/statistique/aggregats/1").status_code == 503
+
+
+def test_backoff_is_bounded(client):
+    client.backoff_max = 0.5
+    assert all(0 <= client._delai(tentative) <= 0.5 for tentative in range(10))
+
+
+def test_load_shedding_503_does_not_open_the_breaker(client, monkeypatch):
+    scripted(client, monkeypatch, *[FakeResp(503, {"Retry-After": "1"})] * 10)
+
+    for _ in range(10):
+        assert client.post("/auth/login", json={}).status_code == 503
+    assert client.breaker.state == CLOSED
+
+
+def test_only_unavailability_statuses_count_as_breaker_failures(client, monkeypatch):
+    client.breaker.min_calls = 3
+    scripted(client, monkeypatch, *[FakeResp(500)] * 5)
+
+    # 500 d'une route : erreur de l'endpoint, mais le DAO répond, le circuit reste fermé
+    for _ in range(5):
+        assert client.get("/tache/1").status_code == 500
+    assert client.breaker.state == CLOSED
+    assert client.stats()["GET /tache/:id"]["erreurs"] == 5
+
+    # 502 : passerelle sans DAO derrière, le circuit s'ouvre
+    indisponible = DaoHttpClient("http://dao:5001/", retries=2)
+    indisponible.breaker.min_calls = 3
+    scripted(indisponible, monkeypatch, *[FakeResp(502)] * 3)
+    assert indisponible.get("/tache/1").status_code == 502
+    assert indisponible.breaker.state != CLOSED
@@ -0,0 +1,95 @@
+from flask import Flask, jsonify
+
+from common.rate_limit import AdmissionControl, SlidingWindow, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, burst=3, clock=clock)
+
+    assert [bucket.acquire("ip") for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire("ip") == 2.0
+    assert bucket.acquire("autre-ip") == 0
+
+    clock.now = 2.0
+    assert bucket.acquire("ip") == 0
+    assert bucket.stats()["refus"] == 1
+
+
+def test_idle_keys_are_evicted_beyond_max_keys():
+    bucket = TokenBucket(rate=1, burst=1, max_keys=2, clock=FakeClock())
+    for cle in ("a", "b", "c"):
+        bucket.acquire(cle)
+
+    assert bucket.stats() == {"cles": 2, "evictions": 1, "refus": 0}
+    # "a" oubliée : seau de nouveau plein
+    assert bucket.acquire("a") == 0
+
+
+def test_sliding_window_weights_previous_window():
+    clock = FakeClock()
+    fenetre = SlidingWindow(limit=4, window=10, clock=clock)
+
+    assert [fenetre.acquire("ip") for _ in range(4)] == [0, 0, 0, 0]
+    assert fenetre.acquire("ip") > 0
+
+    # Milieu de la fenêtre suivante : 4 * 0.5 = 2 demandes encore comptées
+    clock.now = 15
+    assert [fenetre.acquire("ip") for _ in range(2)] == [0, 0]
+    assert 0 < fenetre.acquire("ip") <= 5
+
+
+def make_app(control):
+    app = Flask(__name__)
+    appels = []
+
+    @app.route("/auth/login", methods=["POST"])
+    @control.limit("login")
+    def login():
+        appels.append(1)
+        return jsonify({"ok": True}), 200
+
+    return app, appels
+
+
+def test_limited_route_answers_429_before_the_view_runs():
+    control = AdmissionControl(
+        TokenBucket(rate=1, burst=100, clock=FakeClock()),
+        TokenBucket(rate=0.1, burst=2, clock=FakeClock()),
+        SlidingWindow(limit=100, window=3600, clock=FakeClock()),
+    )
+    app, appels = make_app(control)
+    client = app.test_client()
+
+    for _ in range(2):
+        assert client.post("/auth/login", json={"email": "A@b.c"}).status_code == 200
+    response = client.post("/auth/login", json={"email": "a@B.c "})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+    assert len(appels) == 2
+
+    # Autre compte : admis
+    assert client.post("/auth/login", json={"email": "x@b.c"}).status_code == 200
+
+
+def test_client_address_comes_from_trusted_proxy():
+    control = AdmissionControl(
+        TokenBucket(rate=0.1, burst=1, clock=FakeClock()),
+        TokenBucket(rate=1, burst=100, clock=FakeClock()),
+        SlidingWindow(limit=100, window=3600, clock=FakeClock()),
+        trusted_proxies=1,
+    )
+    app, _ = make_app(control)
+    client = app.test_client()
+
+    assert client.post("/auth/login", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+    assert client.post("/auth/login", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+    assert client.post("/auth/login", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
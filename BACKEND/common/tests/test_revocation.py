@@ -0,0 +1,101 @@
+from flask import Flask, jsonify, request
+from flask_jwt_extended import JWTManager, create_access_token, decode_token, jwt_required
+
+from common import revocation
+from common.embedded import EmbeddedDaoClient
+from common.revocation import RevocationList, RevocationSync
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_client_revocation_only_applies_to_older_tokens():
+    liste = RevocationList(clock=FakeClock())
+    liste.apply([{"type": "client", "valeur": "c1", "revoque_le": 1000.0, "expire_le": 2000.0}], seq=1)
+
+    assert liste.is_revoked({"sub": "c1", "iat": 900, "jti": "a"})
+    assert not liste.is_revoked({"sub": "c1", "iat": 1100, "jti": "b"})
+    assert not liste.is_revoked({"sub": "c2", "iat": 900, "jti": "c"})
+    assert liste.stats()["rejets"] == 1
+    assert liste.seq == 1
+
+
+def test_token_revocation_and_pruning():
+    clock = FakeClock()
+    liste = RevocationList(clock=clock)
+    liste.revoke_token("jti-1", exp=1500.0)
+    liste.revoke_client("c1", expire_le=3000.0)
+
+    assert liste.is_revoked({"sub": "autre", "iat": 900, "jti": "jti-1"})
+    clock.now = 2000.0
+    liste.prune()
+    assert liste.stats()["jetons"] == 0
+    assert liste.stats()["clients"] == 1
+
+
+def make_dao_app(entrees, page=2):
+    app = Flask(__name__)
+    demandes = []
+
+    @app.route("/auth/revocations")
+    def revocations():
+        depuis = request.args.get("depuis", 0, type=int)
+        demandes.append(depuis)
+        suivantes = [e for e in entrees if e["seq"] > depuis][:page]
+        return jsonify({
+            "revocations": suivantes,
+            "seq": suivantes[-1]["seq"] if suivantes else depuis,
+            "suite": len(suivantes) == page,
+        })
+
+    return app, demandes
+
+
+def test_sync_pages_through_deltas_then_asks_only_for_new_entries():
+    entrees = [
+        {"seq": i, "type": "jeton", "valeur": f"jti-{i}", "revoque_le": 0, "expire_le": 4e9}
+        for i in range(1, 6)
+    ]
+    app, demandes = make_dao_app(entrees)
+    liste = RevocationList()
+    sync = RevocationSync(liste, full_interval=3600)
+    sync.dao = EmbeddedDaoClient(app, single_flight=False)
+
+    sync.sync()
+    assert liste.stats()["jetons"] == 5
+    assert demandes == [0, 2, 4]
+
+    demandes.clear()
+    sync.sync()
+    assert demandes == [5]
+
+
+def test_revoked_token_is_rejected_by_jwt_manager(monkeypatch):
+    liste = RevocationList()
+    monkeypatch.setattr(revocation, "revocations", liste)
+    monkeypatch.setattr(revocation._sync, "start", lambda dao: None)
+
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "cle-de-test-suffisamment-longue-32o"
+    jwt = JWTManager(app)
+    revocation.init_revocation(app, jwt, dao=None)
+
+    @app.route("/taches")
+    @jwt_required()
+    def taches():
+        return jsonify([])
+
+    with app.app_context():
+        jeton = create_access_token(identity="c1")
+        claims = decode_token(jeton)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {jeton}"}
+
+    assert client.get("/taches", headers=headers).status_code == 200
+    liste.revoke_token(claims["jti"], claims["exp"])
+    assert client.get("/taches", headers=headers).status_code == 401
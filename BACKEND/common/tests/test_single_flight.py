@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+from flask import Flask, jsonify, request
+
+from common.embedded import EmbeddedDaoClient
+from common.single_flight import SingleFlight
+
+
+def run_concurrently(n, fn):
+    barriere = threading.Barrier(n)
+    resultats = [None] * n
+
+    def worker(i):
+        barriere.wait()
+        resultats[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return resultats
+
+
+def test_concurrent_calls_share_one_execution():
+    groupe = SingleFlight()
+    executions = []
+
+    def lent():
+        executions.append(1)
+        time.sleep(0.1)
+        return "liste"
+
+    resultats = run_concurrently(5, lambda: groupe.do("taches:u1", lent))
+
+    assert len(executions) == 1
+    assert all(valeur == "liste" for valeur, _ in resultats)
+    assert sorted(partage for _, partage in resultats) == [False, True, True, True, True]
+    assert groupe.stats() == {"appels": 1, "partages": 4, "en_cours": 0, "taux_partage": 0.8}
+
+
+def test_error_is_raised_for_every_waiter_and_not_kept():
+    groupe = SingleFlight()
+
+    def panne():
+        time.sleep(0.05)
+        raise RuntimeError("DAO indisponible")
+
+    def appel():
+        with pytest.raises(RuntimeError):
+            groupe.do("k", panne)
+        return True
+
+    assert all(run_concurrently(3, appel))
+    # Rien n'est conservé : l'appel suivant est exécuté
+    assert groupe.do("k", lambda: "ok") == ("ok", False)
+
+
+def test_dao_client_coalesces_identical_gets_only():
+    app = Flask(__name__)
+    appels = []
+
+    @app.route("/tache/taches")
+    def taches():
+        appels.append(request.headers.get("user-id"))
+        time.sleep(0.1)
+        return jsonify([{"titre": "t"}])
+
+    dao = EmbeddedDaoClient(app)
+    dao.single_flight = SingleFlight()
+
+    reponses = run_concurrently(4, lambda: dao.get("/tache/taches", headers={"user-id": "u1"}))
+    assert appels == ["u1"]
+    assert all(r.json() == [{"titre": "t"}] for r in reponses)
+    assert dao.stats()["GET /tache/taches"]["partages"] == 3
+
+    # Utilisateurs différents : appels distincts
+    appels.clear()
+    run_concurrently(2, lambda: dao.get("/tache/taches", headers={"user-id": f"u{threading.get_ident()}"}))
+    assert len(appels) == 2
@@ -0,0 +1,69 @@
+from flask import Flask, jsonify, request
+
+from common.embedded import EmbeddedDaoClient
+from common.tracing import REQUEST_ID_HEADER, init_tracing, parse_server_timing, span
+
+
+def make_dao_app():
+    app = Flask(__name__)
+    init_tracing(app, "dao")
+
+    @app.route("/tache/taches")
+    def taches():
+        with span("db"):
+            pass
+        with span("db"):
+            pass
+        return jsonify({"request_id": request.headers.get(REQUEST_ID_HEADER)})
+
+    return app
+
+
+def make_gateway_app():
+    app = Flask(__name__)
+    init_tracing(app, "tache")
+    dao = EmbeddedDaoClient(make_dao_app(), single_flight=False)
+
+    @app.route("/taches")
+    def taches():
+        return jsonify(dao.get("/tache/taches").json())
+
+    return app
+
+
+def test_parse_server_timing():
+    header = 'db;dur=3.2;desc="x4", cache;desc="hit", total;dur=5'
+    assert parse_server_timing(header) == [("db", 3.2, 4), ("total", 5.0, 1)]
+    assert parse_server_timing(None) == []
+
+
+def test_request_id_is_generated_or_kept():
+    client = make_dao_app().test_client()
+
+    response = client.get("/tache/taches")
+    assert len(response.headers[REQUEST_ID_HEADER]) == 32
+
+    response = client.get("/tache/taches", headers={REQUEST_ID_HEADER: "front-42"})
+    assert response.headers[REQUEST_ID_HEADER] == "front-42"
+
+    # Valeur non conforme : remplacée
+    response = client.get("/tache/taches", headers={REQUEST_ID_HEADER: "a b\"c"})
+    assert response.headers[REQUEST_ID_HEADER] != "a b\"c"
+
+
+def test_server_timing_counts_spans():
+    response = make_dao_app().test_client().get("/tache/taches")
+    etapes = {nom: (duree, n) for nom, duree, n in parse_server_timing(response.headers["Server-Timing"])}
+    assert etapes["db"][1] == 2
+    assert {"serial", "total"} <= set(etapes)
+
+
+def test_gateway_propagates_id_and_merges_dao_timing():
+    response = make_gateway_app().test_client().get("/taches", headers={REQUEST_ID_HEADER: "req-1"})
+
+    # Le DAO a reçu le même identifiant
+    assert response.get_json() == {"request_id": "req-1"}
+    assert response.headers[REQUEST_ID_HEADER] == "req-1"
+
+    noms = [nom for nom, _, _ in parse_server_timing(response.headers["Server-Timing"])]
+    assert {"dao", "dao-db", "dao-serial", "dao-total", "total"} <= set(noms)
@@ -0,0 +1,77 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from flask import Flask, jsonify, request
+
+from common import wire
+from common.embedded import EmbeddedDaoClient
+
+pytestmark = pytest.mark.skipif(not wire.available(), reason="msgpack non installé")
+
+
+def test_native_types_round_trip():
+    row = {
+        "id": uuid.uuid4(),
+        "naive": datetime(2025, 7, 1, 9, 30, 0, 250000),
+        "aware": datetime(2025, 7, 1, 9, 30, tzinfo=timezone(timedelta(hours=-4))),
+        "jour": date(2025, 7, 1),
+        "titre": "Réviser",
+    }
+    assert wire.unpackb(wire.packb(row), native=True) == row
+
+
+def test_default_decoding_matches_json_rendering():
+    row_id = uuid.uuid4()
+    moment = datetime(2025, 7, 1, 9, 30)
+    data = wire.unpackb(wire.packb({"id": row_id, "date": moment, "jour": moment.date()}))
+    assert data == {"id": str(row_id), "date": moment.isoformat(), "jour": "2025-07-01"}
+
+    # Un UUID occupe 16 octets (+ en-tête d'extension) au lieu d'une chaîne de 36 caractères
+    assert len(wire.packb(row_id)) < len(wire.packb(str(row_id)))
+
+
+def make_dao_app():
+    app = Flask(__name__)
+    wire.init_wire(app)
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify({"recu": request.get_json(), "type": request.mimetype}), 201
+
+    return app
+
+
+def test_dao_negotiates_by_accept_header():
+    client = make_dao_app().test_client()
+
+    response = client.post("/echo", json={"a": 1})
+    assert response.mimetype == "application/json"
+    assert "Accept" in response.vary
+
+    response = client.post("/echo", json={"a": 1}, headers={"Accept": wire.ACCEPT_MSGPACK})
+    assert response.mimetype == wire.MSGPACK_MIMETYPE
+    assert wire.unpackb(response.data) == {"recu": {"a": 1}, "type": "application/json"}
+
+    response = client.post("/echo", data=b"\xc1", content_type=wire.MSGPACK_MIMETYPE)
+    assert response.status_code == 400
+
+
+def test_client_decodes_and_switches_request_bodies_to_msgpack():
+    dao = EmbeddedDaoClient(make_dao_app(), wire_format="msgpack")
+
+    premiere = dao.post("/echo", json={"titre": "t"})
+    assert isinstance(premiere, wire.MsgpackResponse)
+    # Tant que le DAO n'a pas répondu en MessagePack, le corps part en JSON
+    assert premiere.json() == {"recu": {"titre": "t"}, "type": "application/json"}
+    assert '"titre": "t"' in premiere.text
+
+    seconde = dao.post("/echo", json={"titre": "t"})
+    assert seconde.json() == {"recu": {"titre": "t"}, "type": wire.MSGPACK_MIMETYPE}
+
+
+def test_client_keeps_json_when_not_requested():
+    dao = EmbeddedDaoClient(make_dao_app())
+    response = dao.post("/echo", json={"titre": "t"})
+    assert not isinstance(response, wire.MsgpackResponse)
+    assert response.json()["type"] == "application/json"
@@ -0,0 +1,259 @@
+# common/tracing.py
+"""
+Traçage des requêtes entre services : identifiant de requête et Server-Timing.
+
+- chaque requête reçoit un X-Request-ID (celui du client s'il est valide),
+  transmis par DaoHttpClient à DAO_SERVICE : un même identifiant suit la
+  requête du gateway jusqu'à PostgreSQL
+- chaque service mesure ses étapes (spans) : vérification du JWT, appels au
+  DAO, requêtes SQL, attente du pool, sérialisation
+- la répartition est renvoyée dans l'en-tête Server-Timing ; le gateway y
+  ajoute celle du DAO préfixée par « dao- » (ex. dao-db : temps SQL vu par le DAO)
+- TRACE_LOG_PATH : une ligne JSON par requête dans un fichier local, y compris
+  les étapes des réponses en streaming (terminées après l'envoi des en-têtes)
+
+La trace est rangée dans flask.g : les threads du fan-out (copie du contexte)
+et les générateurs stream_with_context écrivent dans la même trace.
+"""
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_SERVER_TIMING_ENTRY = re.compile(r'^\s*([!#$%&\'*+.^_`|~0-9A-Za-z-]+)(.*)$')
+
+trace_logger = logging.getLogger("thrive.trace")
+
+
+class Trace:
+    """Étapes mesurées d'une requête : {nom: [durée totale ms, nombre]} (thread-safe)."""
+
+    def __init__(self, service, request_id):
+        self.service = service
+        self.request_id = request_id
+        self.debut = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = {}
+        self._ouverts = {}
+
+    def add(self, nom, duree_ms, n=1):
+        with self._lock:
+            span = self.spans.setdefault(nom, [0.0, 0])
+            span[0] += duree_ms
+            span[1] += n
+
+    def start(self, nom):
+        # Étape commencée et terminée dans deux fonctions différentes (ex. callbacks JWT)
+        with self._lock:
+            self._ouverts[nom] = time.perf_counter()
+
+    def stop(self, nom):
+        with self._lock:
+            debut = self._ouverts.pop(nom, None)
+        if debut is not None:
+            self.add(nom, (time.perf_counter() - debut) * 1000)
+
+    def stop_all(self):
+        for nom in list(self._ouverts):
+            self.stop(nom)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.debut) * 1000
+
+    def server_timing(self, total_ms):
+        with self._lock:
+            entrees = [
+                f'{nom};dur={duree:.1f}' + (f';desc="x{n}"' if n > 1 else "")
+                for nom, (duree, n) in self.spans.items()
+            ]
+        entrees.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(entrees)
+
+    def snapshot(self):
+        with self._lock:
+            return {nom: {"ms": round(duree, 3), "n": n} for nom, (duree, n) in self.spans.items()}
+
+
+def current_trace():
+    if not has_app_context():
+        return None
+    return g.get("trace")
+
+
+def current_request_id():
+    trace = current_trace()
+    return trace.request_id if trace is not None else None
+
+
+def record_span(nom, duree_ms, n=1):
+    trace = current_trace()
+    if trace is not None:
+        trace.add(nom, duree_ms, n)
+
+
+@contextmanager
+def span(nom):
+    """Mesure le bloc dans l'étape `nom` de la trace courante (sans effet hors requête)."""
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(nom, (time.perf_counter() - debut) * 1000)
+
+
+def parse_server_timing(header):
+    # "db;dur=3.2;desc="x4", total;dur=5" -> [("db", 3.2, 4), ("total", 5.0, 1)]
+    entrees = []
+    for element in (header or "").split(","):
+        match = _SERVER_TIMING_ENTRY.match(element)
+        if not match:
+            continue
+        duree, n = None, 1
+        for param in match.group(2).split(";"):
+            cle, _, valeur = param.strip().partition("=")
+            valeur = valeur.strip('"')
+            try:
+                if cle == "dur":
+                    duree = float(valeur)
+                elif cle == "desc" and valeur.startswith("x"):
+                    n = int(valeur[1:])
+            except ValueError:
+                continue
+        if duree is not None:
+            entrees.append((match.group(1), duree, n))
+    return entrees
+
+
+def merge_upstream_timing(prefixe, header):
+    # Ajoute à la trace courante les étapes annoncées par le service amont (Server-Timing)
+    trace = current_trace()
+    if trace is None:
+        return
+    for nom, duree, n in parse_server_timing(header):
+        trace.add(f"{prefixe}-{nom}", duree, n)
+
+
+# --- Intégrations ---
+
+def _trace_jwt(jwt):
+    # Vérification du JWT : du choix de la clé de décodage à la fin des vérifications (blocklist comprise)
+    from flask_jwt_extended.default_callbacks import (
+        default_decode_key_callback, default_token_verification_callback,
+    )
+
+    @jwt.decode_key_loader
+    def _decode_key(jwt_header, jwt_data):
+        trace = current_trace()
+        if trace is not None:
+            trace.start("jwt")
+        return default_decode_key_callback(jwt_header, jwt_data)
+
+    @jwt.token_verification_loader
+    def _token_verified(jwt_header, jwt_data):
+        trace = current_trace()
+        if trace is not None:
+            trace.stop("jwt")
+        return default_token_verification_callback(jwt_header, jwt_data)
+
+
+def _trace_serialization(app):
+    # Encodage des réponses jsonify() (JSON ou MessagePack selon le fournisseur de l'application)
+    response = app.json.response
+
+    def timed_response(*args, **kwargs):
+        with span("serial"):
+            return response(*args, **kwargs)
+
+    app.json.response = timed_response
+
+
+def instrument_sqlalchemy(engine):
+    """Étape « db » : durée de chaque requête SQL exécutée pendant une requête HTTP."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_debuts", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        debuts = conn.info.get("trace_debuts")
+        if debuts:
+            record_span("db", (time.perf_counter() - debuts.pop()) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        debuts = context.connection.info.get("trace_debuts") if context.connection is not None else None
+        if debuts:
+            record_span("db", (time.perf_counter() - debuts.pop()) * 1000)
+
+
+def init_tracing(app, service, jwt=None):
+    """
+    Active le traçage sur l'application (paramètres TRACING_* et TRACE_LOG_PATH de Config).
+    À appeler après les autres extensions qui remplacent app.json (init_wire).
+    """
+    if not app.config.get("TRACING_ENABLED", True):
+        return
+    server_timing = app.config.get("TRACING_SERVER_TIMING", True)
+    log_path = app.config.get("TRACE_LOG_PATH")
+    log_min_ms = app.config.get("TRACE_LOG_MIN_MS", 0)
+    if log_path and not trace_logger.handlers:
+        handler = logging.FileHandler(log_path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        trace_logger.addHandler(handler)
+        trace_logger.setLevel(logging.INFO)
+        trace_logger.propagate = False
+
+    if jwt is not None:
+        _trace_jwt(jwt)
+    _trace_serialization(app)
+
+    @app.before_request
+    def _start_trace():
+        request_id = request.headers.get(REQUEST_ID_HEADER, "")
+        if not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        g.trace = Trace(service, request_id)
+
+    @app.after_request
+    def _trace_headers(response):
+        trace = g.get("trace")
+        if trace is None:
+            return response
+        trace.stop_all()
+        response.headers[REQUEST_ID_HEADER] = trace.request_id
+        if server_timing:
+            response.headers["Server-Timing"] = trace.server_timing(trace.elapsed_ms())
+        g.trace_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _log_trace(exc):
+        # Après la fin du streaming éventuel : la trace est complète
+        trace = g.pop("trace", None)
+        if trace is None or not log_path:
+            return
+        duree_ms = trace.elapsed_ms()
+        if duree_ms < log_min_ms:
+            return
+        trace_logger.info(json.dumps({
+            "service": trace.service,
+            "request_id": trace.request_id,
+            "methode": request.method,
+            "chemin": request.path,
+            "status": g.get("trace_status", 500),
+            "duree_ms": round(duree_ms, 3),
+            "etapes": trace.snapshot(),
+        }, ensure_ascii=False))
@@ -0,0 +1,179 @@
+# common/wire.py
+"""
+Format binaire (MessagePack) des échanges internes gateways <-> DAO_SERVICE.
+
+Le navigateur reçoit toujours du JSON. Entre un gateway et le DAO, le format
+est négocié par type de contenu : un dao_client qui envoie
+`Accept: application/x-msgpack` reçoit les réponses du DAO en MessagePack
+(init_wire côté DAO, wrap_response côté client). Les UUID et dates sont
+transmis en types natifs (extensions MessagePack : 16 octets pour un UUID)
+au lieu de chaînes, puis restitués par .json() sous la forme qu'aurait
+produite le JSON (chaîne, isoformat) : le code des gateways est inchangé.
+
+msgpack est optionnel : sans lui, tout reste en JSON.
+"""
+import json
+import struct
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import requests
+from flask import Request, Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest
+
+try:
+    import msgpack
+except ImportError:  # msgpack est optionnel : échanges en JSON
+    msgpack = None
+
+MSGPACK_MIMETYPE = "application/x-msgpack"
+JSON_MIMETYPE = "application/json"
+
+# En-tête Accept des dao_client : MessagePack de préférence, JSON accepté
+ACCEPT_MSGPACK = f"{MSGPACK_MIMETYPE}, {JSON_MIMETYPE};q=0.5"
+
+_EXT_UUID = 1
+_EXT_DATETIME = 2
+_EXT_DATE = 3
+
+_EPOCH = datetime(1970, 1, 1)
+_DATETIME = struct.Struct(">qIh")   # secondes, microsecondes, décalage UTC en minutes
+_NAIVE = -32768                      # décalage absent : datetime sans fuseau
+
+
+def available():
+    return msgpack is not None
+
+
+# --- Encodage ---
+
+def _pack_datetime(value):
+    offset = value.utcoffset()
+    delta = value.replace(tzinfo=None) - _EPOCH
+    minutes = _NAIVE if offset is None else int(offset.total_seconds() // 60)
+    return _DATETIME.pack(delta.days * 86400 + delta.seconds, delta.microseconds, minutes)
+
+
+def _default(value):
+    # Types non gérés nativement par MessagePack
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, _pack_datetime(value))
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, struct.pack(">i", value.toordinal()))
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type non sérialisable en MessagePack : {type(value).__name__}")
+
+
+def packb(obj):
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+# --- Décodage ---
+
+def _unpack_datetime(data):
+    secondes, microsecondes, minutes = _DATETIME.unpack(data)
+    value = _EPOCH + timedelta(seconds=secondes, microseconds=microsecondes)
+    if minutes != _NAIVE:
+        value = value.replace(tzinfo=timezone(timedelta(minutes=minutes)))
+    return value
+
+
+def _native_ext(code, data):
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == _EXT_DATETIME:
+        return _unpack_datetime(data)
+    if code == _EXT_DATE:
+        return date.fromordinal(struct.unpack(">i", data)[0])
+    return msgpack.ExtType(code, data)
+
+
+def _json_ext(code, data):
+    # Même rendu que le JSON du DAO (streaming.py) : UUID en chaîne, dates en isoformat
+    value = _native_ext(code, data)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def unpackb(data, native=False):
+    """Décode un corps MessagePack ; native=True garde les UUID et dates en objets Python."""
+    return msgpack.unpackb(data, raw=False, ext_hook=_native_ext if native else _json_ext)
+
+
+# --- Côté DAO ---
+
+def wants_msgpack():
+    # Le client (dao_client) préfère-t-il MessagePack au JSON ?
+    if msgpack is None or not current_app.config.get("MSGPACK_ENABLED", True):
+        return False
+    return request.accept_mimetypes.best_match((JSON_MIMETYPE, MSGPACK_MIMETYPE)) == MSGPACK_MIMETYPE
+
+
+def msgpack_response(obj, status=200, headers=None):
+    response = Response(packb(obj), status=status, headers=headers, mimetype=MSGPACK_MIMETYPE)
+    response.vary.add("Accept")
+    return response
+
+
+class WireJSONProvider(DefaultJSONProvider):
+    """jsonify() répond en MessagePack aux clients qui le demandent, en JSON sinon."""
+
+    def response(self, *args, **kwargs):
+        if not wants_msgpack():
+            response = super().response(*args, **kwargs)
+            response.vary.add("Accept")
+            return response
+        return msgpack_response(self._prepare_response_obj(args, kwargs))
+
+
+class WireRequest(Request):
+    """get_json() accepte aussi un corps MessagePack (Content-Type application/x-msgpack)."""
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if msgpack is None or self.mimetype != MSGPACK_MIMETYPE:
+            return super().get_json(force=force, silent=silent, cache=cache)
+        try:
+            return unpackb(self.get_data(cache=cache))
+        except (ValueError, struct.error):
+            if silent:
+                return None
+            raise BadRequest("Corps MessagePack invalide")
+
+
+def init_wire(app):
+    """Négociation JSON / MessagePack pour toutes les réponses jsonify() et les corps de requête."""
+    if msgpack is None or not app.config.get("MSGPACK_ENABLED", True):
+        return
+    app.json = WireJSONProvider(app)
+    app.request_class = WireRequest
+
+
+# --- Côté client ---
+
+class MsgpackResponse(requests.Response):
+    """Réponse du DAO en MessagePack : .json() et .text restent utilisables par les gateways."""
+
+    def json(self, **kwargs):
+        return unpackb(self.content)
+
+    @property
+    def text(self):
+        # Journaux et messages d'erreur : rendu JSON du contenu
+        return json.dumps(self.json(), ensure_ascii=False)
+
+
+def wrap_response(response):
+    # Réponse MessagePack du DAO : .json() décode le binaire (réponses JSON inchangées)
+    if isinstance(response, requests.Response):
+        content_type = response.headers.get("Content-Type", "")
+        if content_type.split(";", 1)[0].strip() == MSGPACK_MIMETYPE:
+            response.__class__ = MsgpackResponse
+    return response
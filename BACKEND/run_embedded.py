@@ -0,0 +1,43 @@
+# run_embedded.py
+"""
+Lance toute l'API (AUTH, TACHE, SEANCE, STATISTIQUE et DAO_SERVICE) dans un seul
+processus, pour les petits déploiements :
+
+    python run_embedded.py
+
+Les gateways appellent AuthDAO, TacheDAO, SeanceDAO et StatistiqueDAO dans le
+processus (DAO_MODE=embedded, voir common/embedded.py) : un seul pool de
+connexions à la base, aucune requête HTTP interne. Le frontend pointe tous ses
+services (VITE_*_PORT) vers EMBEDDED_PORT. L'état des appels vers le DAO de
+chaque gateway est servi sur /health/dao/<auth|tache|seance|statistique>.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Avant le chargement des Config des gateways
+os.environ["DAO_MODE"] = "embedded"
+sys.path.insert(0, BACKEND_DIR)
+
+from werkzeug.serving import run_simple
+
+from common.embedded import ServiceDispatcher, embedded_dao_app, load_service
+
+GATEWAYS = ("AUTH_SERVICE", "TACHE_SERVICE", "SEANCE_SERVICE", "STATISTIQUE_SERVICE")
+
+
+def create_app():
+    # DAO chargé en premier : les dao_client des gateways le réutilisent
+    embedded_dao_app()
+    apps = [load_service(os.path.join(BACKEND_DIR, nom)).app for nom in GATEWAYS]
+    return ServiceDispatcher(apps)
+
+
+if __name__ == "__main__":
+    run_simple(
+        os.getenv("EMBEDDED_HOST", "127.0.0.1"),
+        int(os.getenv("EMBEDDED_PORT", 5000)),
+        create_app(),
+        threaded=True,
+    )